@@ -0,0 +1,79 @@
+"""Cube queries vs. fresh pandas groupbys on synthetic units.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_cube [--units 5000] [--repeat 20]
+"""
+import argparse
+import itertools
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_matching import synthetic_units
+from dashboard import categories, cube, synth
+
+
+def synthetic_inputs(units, seed=0):
+    frame, deaths_matrix = synthetic_units(units, seed)
+    frame['Category'] = categories.classify_adoption(frame['Vaccine_Intro_Date'])
+    rng = np.random.default_rng(seed)
+    totals = deaths_matrix.totals()
+    shares = rng.dirichlet(synth.AGE_SHARES * 200, units)
+    deaths_by_age = pd.DataFrame({
+        'Country_code': np.repeat(frame['Country_code'].to_numpy(), len(synth.AGE_GROUPS)),
+        'Agegroup': np.tile(synth.AGE_GROUPS, units),
+        'Deaths': (shares * totals[:, None]).ravel(),
+    })
+    return frame, deaths_by_age, deaths_matrix
+
+
+def long_table(frame, deaths_by_age, deaths_matrix):
+    """Country x age x month rows, what a groupby-per-view implementation would scan."""
+    by_age = deaths_by_age.pivot_table(index='Country_code', columns='Agegroup', values='Deaths', aggfunc='sum')
+    by_age = by_age.reindex(index=frame['Country_code'], columns=synth.AGE_GROUPS).to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shares = np.nan_to_num(by_age / by_age.sum(axis=1, keepdims=True))
+    values = shares[:, :, None] * deaths_matrix.values[:, None, :]
+    n_ages, n_months = values.shape[1:]
+    return pd.DataFrame({
+        **{column: np.repeat(frame[column].to_numpy(), n_ages * n_months) for column in cube.COUNTRY_DIMENSIONS},
+        'Agegroup': np.tile(np.repeat(synth.AGE_GROUPS, n_months), len(frame)),
+        'month': np.tile(deaths_matrix.dates.to_numpy(), len(frame) * n_ages),
+        'Deaths': values.ravel(),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--units', type=int, default=5_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    frame, deaths_by_age, deaths_matrix = synthetic_inputs(args.units)
+    start = time.perf_counter()
+    data_cube = cube.Cube.from_frames(frame, deaths_by_age, deaths_matrix)
+    build = time.perf_counter() - start
+    table = long_table(frame, deaths_by_age, deaths_matrix)
+
+    views = list(itertools.combinations(cube.DIMENSIONS, 2))[:args.repeat]
+    start = time.perf_counter()
+    for view in views:
+        data_cube.frame(list(view))
+    cube_time = (time.perf_counter() - start) / len(views)
+
+    start = time.perf_counter()
+    for view in views:
+        table.groupby(list(view), observed=True)['Deaths'].agg(['sum', 'count', 'mean'])
+    groupby_time = (time.perf_counter() - start) / len(views)
+
+    print(f'units:        {args.units:,} ({len(table):,} country x age x month rows)')
+    print(f'cube build:   {build * 1000:10.1f} ms  (once per dataset version)')
+    print(f'cube view:    {cube_time * 1000:10.2f} ms')
+    print(f'groupby view: {groupby_time * 1000:10.2f} ms')
+    print(f'speedup:      {groupby_time / cube_time:10.1f}x')
+
+
+if __name__ == '__main__':
+    main()
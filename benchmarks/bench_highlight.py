@@ -0,0 +1,87 @@
+"""Row-wise vs. vectorized highlight classification on synthetic rows.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_highlight [--rows 100000] [--repeat 5]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from dashboard import categories, highlight
+
+
+def synthetic_frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = np.array([f'C{i:06d}' for i in range(rows - 2)] + ['MEX', 'USA'])
+    countries = np.array([f'Country {i}' for i in range(rows - 2)] + ['Mexico', 'United States of America'])
+    order = rng.permutation(rows)
+    dates = (np.datetime64('2020-12-01')
+             + rng.integers(0, 400, size=rows).astype('timedelta64[D]'))
+    frame = pd.DataFrame({
+        'Country_code': pd.Categorical(codes[order]),
+        'Country': pd.Categorical(countries[order]),
+        'Total_Deaths': np.round(rng.lognormal(7, 2.5, size=rows)),
+        'Vaccine_Intro_Date': dates,
+    })
+    frame['Category'] = categories.classify_adoption(frame['Vaccine_Intro_Date'])
+    return frame
+
+
+def rowwise(frame, death_threshold):
+    # The original per-row implementation from app.py
+    def get_highlight_category(row):
+        if row['Country'] == 'Mexico':
+            return 'Mexico'
+        elif row['Country'] == 'United States of America':
+            return 'United States'
+        elif row['Category'] == 'Early Adopters' and row['Total_Deaths'] <= death_threshold:
+            return 'Early + Low Deaths'
+        else:
+            return 'Other'
+
+    classes = frame.apply(get_highlight_category, axis=1)
+    sizes = frame['Total_Deaths'].apply(lambda x: max(8, min(30, np.log10(x+1) * 6)))
+    return classes.to_numpy(), sizes.to_numpy()
+
+
+def vectorized(frame, death_threshold):
+    classes = highlight.highlight_classes(frame, death_threshold)
+    sizes = highlight.marker_sizes(frame['Total_Deaths'])
+    return classes, sizes
+
+
+def best_of(func, repeat, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    frame = synthetic_frame(args.rows)
+    threshold = frame.loc[frame['Category'] == 'Early Adopters', 'Total_Deaths'].quantile(0.25)
+
+    slow, (slow_classes, slow_sizes) = best_of(rowwise, max(1, args.repeat // 5), frame, threshold)
+    fast, (fast_classes, fast_sizes) = best_of(vectorized, args.repeat, frame, threshold)
+
+    assert (slow_classes.astype(str) == fast_classes).all()
+    assert np.allclose(slow_sizes.astype(float), fast_sizes)
+
+    print(f'rows:       {args.rows:,}')
+    print(f'row-wise:   {slow * 1000:10.1f} ms')
+    print(f'vectorized: {fast * 1000:10.1f} ms')
+    print(f'speedup:    {slow / fast:10.1f}x')
+
+
+if __name__ == '__main__':
+    main()
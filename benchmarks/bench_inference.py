@@ -0,0 +1,72 @@
+"""Looped vs. batched bootstrap and permutation tests on synthetic countries.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_inference [--rows 200] [--resamples 10000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_highlight import synthetic_frame
+from dashboard import inference
+
+
+def category_values(frame):
+    values = frame['Total_Deaths'].to_numpy(dtype='float64')
+    labels = frame['Category'].cat.codes.to_numpy()
+    return [values[labels == group] for group in range(3)]
+
+
+def looped(groups, resamples, seed=0):
+    # One resample per iteration: mean intervals per category, Early vs Mid test
+    rng = np.random.default_rng(seed)
+    intervals = [np.percentile([rng.choice(members, len(members)).mean() for _ in range(resamples)], [2.5, 97.5])
+                 for members in groups]
+    pooled, size = np.concatenate(groups[:2]), len(groups[0])
+    null = []
+    for _ in range(resamples):
+        shuffled = rng.permutation(pooled)
+        null.append(shuffled[:size].mean() - shuffled[size:].mean())
+    return intervals, np.asarray(null)
+
+
+def batched(groups, resamples, seed=0):
+    # The same work as one (resamples x n) matrix per step
+    rng = np.random.default_rng(seed)
+    intervals = [inference.bootstrap_intervals(members, rng, resamples)[:2] for members in groups]
+    means, _ = inference.permutation_null(np.concatenate(groups[:2]), [len(groups[0]), len(groups[1])], rng, resamples)
+    return intervals, means[:, 0] - means[:, 1]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--resamples', type=int, default=10_000)
+    args = parser.parse_args()
+
+    frame = synthetic_frame(args.rows)
+    groups = category_values(frame)
+
+    slow, _ = timed(looped, groups, args.resamples)
+    fast, _ = timed(batched, groups, args.resamples)
+    full, result = timed(inference.category_inference, frame, 'Total_Deaths', args.resamples)
+
+    print(f'countries:  {args.rows:,}')
+    print(f'resamples:  {args.resamples:,}')
+    print(f'looped:     {slow * 1000:10.1f} ms  (mean intervals, Early vs Mid test)')
+    print(f'batched:    {fast * 1000:10.1f} ms')
+    print(f'speedup:    {slow / fast:10.1f}x')
+    print(f'full:       {full * 1000:10.1f} ms  (mean and median intervals, overall and pairwise tests)')
+    print(f'overall p:  {result.overall_p:10.4f}')
+
+
+if __name__ == '__main__':
+    main()
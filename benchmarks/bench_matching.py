@@ -0,0 +1,51 @@
+"""Matching time for growing numbers of synthetic units (countries or sub-national regions).
+
+Run from the repository root::
+
+    python -m benchmarks.bench_matching [--units 1000 10000 50000] [--blocks Who_region Wb_income]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from dashboard import matching, synth
+from dashboard.timeseries import DeathMatrix
+
+
+def synthetic_units(units, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = np.array([f'U{i:06d}' for i in range(units)])
+    frame = pd.DataFrame({
+        'Country_code': codes,
+        'Country': codes,
+        'Who_region': pd.Categorical(rng.choice(synth.WHO_REGIONS, units)),
+        'Wb_income': pd.Categorical(rng.choice(synth.WB_INCOMES, units)),
+        'Vaccine_Intro_Date': np.datetime64('2020-12-01') + rng.integers(0, 300, units).astype('timedelta64[D]'),
+        'Population': rng.lognormal(14, 1.5, units),
+    })
+    dates = pd.date_range('2020-01-01', '2023-12-01', freq='MS')
+    values = rng.poisson(rng.lognormal(2, 1.5, (units, 1)) * rng.random((units, len(dates)))).astype('float64')
+    return frame, DeathMatrix(codes, dates, values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--units', type=int, nargs='+', default=[1_000, 10_000, 50_000])
+    parser.add_argument('--blocks', nargs='*', default=list(matching.BLOCK_COLUMNS),
+                        help='exact-match columns (fewer blocks means larger distance matrices)')
+    args = parser.parse_args()
+    matching.BLOCK_COLUMNS = tuple(args.blocks)
+
+    print(f'blocks: {", ".join(args.blocks) or "none"}')
+    for units in args.units:
+        frame, deaths_matrix = synthetic_units(units)
+        start = time.perf_counter()
+        pairs = matching.match_countries(frame, deaths_matrix)
+        elapsed = time.perf_counter() - start
+        print(f'{units:>8,} units  {elapsed * 1000:10.1f} ms  {len(pairs):>8,} pairs')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Per-session memory: what a new session and a rerun allocate on top of the shared caches.
+
+For each scale the shipped CSVs are replicated as in ``bench_pages`` and, in
+a fresh interpreter, every page is first rendered once to fill the
+process-wide caches. A second session then renders it under tracemalloc.
+Reported per page:
+
+- ``shared_mb``: the loaded dataset's frames, held once per process
+- ``session_mb`` / ``session_peak_mb``: memory the new session still holds
+  after its first render, and its peak during that render
+- ``rerun_mb`` / ``rerun_peak_mb``: the same for one more rerun of the page
+
+If any cached frame were copied per rerun, ``rerun_peak_mb`` would grow
+with ``shared_mb``.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_memory [--scales 1,100] [--json memory.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.bench_pages import ROOT, scale_dataset
+from dashboard.pages import PAGE_TITLES
+
+_PROBE = """
+import gc, json, sys, tracemalloc
+from streamlit.testing.v1 import AppTest
+from dashboard import store
+app, pages = sys.argv[1], sys.argv[2:]
+
+def render(page):
+    at = AppTest.from_file(app, default_timeout=3600)
+    at.run()
+    at.sidebar.radio[0].set_value(page).run()
+    if at.exception:
+        raise SystemExit(f'{page!r}: {at.exception}')
+    return at
+
+dataset = store.load_dataset()
+shared = sum(getattr(dataset, name).memory_usage(deep=True).sum() for name in store.SOURCES)
+results = {}
+for page in pages:
+    render(page)
+    gc.collect()
+    tracemalloc.start()
+    at = render(page)
+    gc.collect()
+    session, session_peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    at.run()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results[page] = {
+        'shared_mb': shared / 2**20,
+        'session_mb': session / 2**20,
+        'session_peak_mb': session_peak / 2**20,
+        'rerun_mb': (current - session) / 2**20,
+        'rerun_peak_mb': (peak - session) / 2**20,
+    }
+print(json.dumps(results))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', default='1,100', help='comma-separated replication factors (default: %(default)s)')
+    parser.add_argument('--pages', default=','.join(PAGE_TITLES), help='comma-separated page titles')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'scale':>6}  {'page':<20} {'shared MB':>10} {'session MB':>11} {'peak MB':>8} "
+          f"{'rerun MB':>9} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for factor in (int(s) for s in args.scales.split(',')):
+            data_dir = scale_dataset(Path(tmp) / f'x{factor}', factor)
+            # No background warm-up: its allocations would be counted against the session
+            env = {**os.environ, 'COVID_DATA_DIR': str(data_dir), 'COVID_WARMUP': '0'}
+            subprocess.run([sys.executable, '-m', 'dashboard.store'], cwd=ROOT, env=env,
+                           check=True, capture_output=True)
+            probe = subprocess.run([sys.executable, '-c', _PROBE, str(ROOT / 'app.py'), *args.pages.split(',')],
+                                   cwd=ROOT, env=env, capture_output=True, text=True)
+            if probe.returncode:
+                raise RuntimeError(probe.stderr[-2000:])
+            per_page = json.loads(probe.stdout.strip().splitlines()[-1])
+            for page, entry in per_page.items():
+                print(f"{factor:>5}x  {page:<20} {entry['shared_mb']:10.1f} {entry['session_mb']:11.2f} "
+                      f"{entry['session_peak_mb']:8.2f} {entry['rerun_mb']:9.2f} {entry['rerun_peak_mb']:8.2f}")
+            results[str(factor)] = per_page
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2, sort_keys=True))
+
+
+if __name__ == '__main__':
+    main()
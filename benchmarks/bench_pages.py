@@ -0,0 +1,176 @@
+"""Headless render benchmark for every dashboard page at several data scales.
+
+For each scale the shipped CSVs are replicated into a temporary data
+directory (country codes get a ``~N`` suffix per copy), or, with
+``--synthetic``, generated by ``dashboard.synth`` with ``scale`` times as
+many countries (optionally daily and with sub-national regions), and every
+page is rendered through Streamlit's ``AppTest`` in a fresh interpreter. Reported
+per page:
+
+- ``load_s``: loading the data and building the state every page shares
+  (country index, prefix sums, aggregates), timed before the app runs
+- ``cold_s`` / ``warm_s``: the page's first render (for the default page,
+  the app's first run) and an immediate rerun (wall time)
+- ``peak_rss_mb``: the process's peak resident set size after the render
+- ``alloc_peak_mb`` / ``alloc_blocks``: tracemalloc peak during a separately
+  traced cold render, and the net number of memory blocks it left allocated
+
+Run from the repository root::
+
+    python -m benchmarks.bench_pages [--scales 1,10,100,1000] [--json pages.json]
+    python -m benchmarks.bench_pages --synthetic --freq D --regions 10 --scales 1,10
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import streamlit
+
+from dashboard import synth
+from dashboard.pages import PAGE_TITLES
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_PROBE = """
+import json, resource, sys, time, tracemalloc
+from streamlit.testing.v1 import AppTest
+from dashboard import aggregates, index, loader, normalize, pages
+app, page, traced = sys.argv[1], sys.argv[2], sys.argv[3] == '1'
+
+# The data and the state app.py builds before any page runs, timed apart from the page
+start = time.perf_counter()
+dataset = loader.load_data()
+index.get_index(dataset)
+aggregates.get_prefix(dataset)
+aggregates.get_aggregates(dataset, next(iter(normalize.METRICS.values())))
+result = {'load_s': time.perf_counter() - start}
+
+def cold(run):
+    if traced:
+        blocks = sys.getallocatedblocks()
+        tracemalloc.start()
+    start = time.perf_counter()
+    run()
+    result['cold_s'] = time.perf_counter() - start
+    if traced:
+        result['alloc_peak_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+        result['alloc_blocks'] = sys.getallocatedblocks() - blocks
+
+at = AppTest.from_file(app, default_timeout=3600)
+if page == pages.PAGE_TITLES[0]:
+    # The first run is already the default page's first render
+    cold(at.run)
+else:
+    at.run()
+    if at.exception:
+        raise SystemExit(str(at.exception))
+    cold(lambda: at.sidebar.radio[0].set_value(page).run())
+if not traced:
+    start = time.perf_counter()
+    at.run()
+    result['warm_s'] = time.perf_counter() - start
+    result['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+if at.exception:
+    raise SystemExit(str(at.exception))
+print(json.dumps(result))
+"""
+
+
+def scale_dataset(dest, factor, source=ROOT):
+    """Write the shipped CSVs replicated ``factor`` times into ``dest``."""
+    dest = Path(dest)
+    dest.mkdir(parents=True, exist_ok=True)
+
+    def replicate(frame, rename_country=False):
+        copies = []
+        for i in range(factor):
+            copy = frame.copy()
+            if i:
+                # Copy 0 keeps the real codes so the focus countries still resolve
+                copy['Country_code'] = copy['Country_code'] + f'~{i}'
+                if rename_country:
+                    copy['Country'] = copy['Country'] + f' ({i})'
+            copies.append(copy)
+        return pd.concat(copies, ignore_index=True)
+
+    replicate(pd.read_csv(source / 'covid_analysis_data.csv'), rename_country=True).to_csv(
+        dest / 'covid_analysis_data.csv', index=False)
+    for name in ('covid_time_series.csv', 'covid_deaths_by_age.csv', 'covid_population.csv'):
+        replicate(pd.read_csv(source / name)).to_csv(dest / name, index=False)
+    return dest
+
+
+def _probe(data_dir, page, traced):
+    # No background warm-up: it would fill the caches being measured
+    env = {**os.environ, 'COVID_DATA_DIR': str(data_dir), 'COVID_WARMUP': '0'}
+    result = subprocess.run([sys.executable, '-c', _PROBE, str(ROOT / 'app.py'), page, '1' if traced else '0'],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(f'{page!r} failed:\n{result.stderr[-2000:]}')
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', default='1,10,100,1000',
+                        help='comma-separated replication factors (default: %(default)s)')
+    parser.add_argument('--pages', default=','.join(PAGE_TITLES), help='comma-separated page titles')
+    parser.add_argument('--no-alloc', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--json', help='write results to this file')
+    parser.add_argument('--synthetic', action='store_true', help='generate data instead of replicating the CSVs')
+    parser.add_argument('--freq', choices=['M', 'D'], default='M', help='synthetic date frequency')
+    parser.add_argument('--regions', type=int, default=1, help='synthetic sub-national units per country')
+    parser.add_argument('--seed', type=int, default=0, help='synthetic data seed')
+    args = parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(',')]
+    pages = args.pages.split(',')
+    results = {
+        'environment': {
+            'python': sys.version.split()[0],
+            'pandas': pd.__version__,
+            'streamlit': streamlit.__version__,
+        },
+        'data': ({'source': 'synthetic', 'freq': args.freq, 'regions': args.regions, 'seed': args.seed}
+                 if args.synthetic else {'source': 'replicated'}),
+        'scales': {},
+    }
+
+    print(f"{'scale':>6}  {'page':<18} {'load ms':>9} {'cold ms':>9} {'warm ms':>9} "
+          f"{'rss MB':>8} {'alloc MB':>9} {'blocks':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for factor in scales:
+            data_dir = Path(tmp) / f'x{factor}'
+            if args.synthetic:
+                synth.generate(data_dir, countries=130 * factor, regions=args.regions,
+                               freq=args.freq, seed=args.seed)
+            else:
+                scale_dataset(data_dir, factor)
+            # Build the columnar cache up front so every probe measures the same warm-disk state
+            subprocess.run([sys.executable, '-c', 'from dashboard import store; store.build()'],
+                           cwd=ROOT, env={**os.environ, 'COVID_DATA_DIR': str(data_dir)}, check=True)
+            per_page = {}
+            for page in pages:
+                entry = _probe(data_dir, page, traced=False)
+                if not args.no_alloc:
+                    entry.update({k: v for k, v in _probe(data_dir, page, traced=True).items()
+                                  if k not in ('cold_s', 'load_s')})
+                per_page[page] = entry
+                print(f"{factor:>5}x  {page:<18} {entry['load_s'] * 1000:9.0f} {entry['cold_s'] * 1000:9.0f} "
+                      f"{entry['warm_s'] * 1000:9.0f} "
+                      f"{entry['peak_rss_mb']:8.0f} {entry.get('alloc_peak_mb', float('nan')):9.1f} "
+                      f"{entry.get('alloc_blocks', 0):9d}")
+            results['scales'][str(factor)] = per_page
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2, sort_keys=True))
+
+
+if __name__ == '__main__':
+    main()
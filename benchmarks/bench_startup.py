@@ -0,0 +1,106 @@
+"""Cold-start benchmark: import cost and first render of every page.
+
+Each measurement runs in a fresh interpreter, so module imports and the
+in-process figure caches start cold, as on a newly scaled-up worker. Data
+loading and the state every page shares are timed first (``load_s``), then
+the app's first run (``boot_s``), which is the default page's first render;
+every other page is timed on the switch to it after that run.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_startup [--repeat 3] [--json startup.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from dashboard.pages import PAGE_TITLES
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ['matplotlib.pyplot', 'seaborn', 'plotly.express']
+
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import streamlit, pandas, numpy
+from dashboard import aggregates, categories, store
+base = time.perf_counter() - start
+loaded = [m for m in %r if m in sys.modules]
+print(json.dumps({'import_s': base, 'heavy_loaded': loaded}))
+""" % (HEAVY_MODULES,)
+
+_RENDER_PROBE = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+from dashboard import aggregates, index, loader, normalize, pages
+page = sys.argv[1]
+# The data and the state app.py builds before any page runs, timed apart from the renders
+start = time.perf_counter()
+dataset = loader.load_data()
+index.get_index(dataset)
+aggregates.get_prefix(dataset)
+aggregates.get_aggregates(dataset, next(iter(normalize.METRICS.values())))
+load = time.perf_counter() - start
+start = time.perf_counter()
+at = AppTest.from_file(%r, default_timeout=600)
+at.run()
+boot = time.perf_counter() - start
+if page == pages.PAGE_TITLES[0]:
+    # The boot run is the default page's first render
+    render = boot
+else:
+    start = time.perf_counter()
+    at.sidebar.radio[0].set_value(page).run()
+    render = time.perf_counter() - start
+if at.exception:
+    raise SystemExit(str(at.exception))
+loaded = [m for m in %r if m in sys.modules]
+print(json.dumps({'load_s': load, 'boot_s': boot, 'first_render_s': render, 'heavy_loaded': loaded}))
+""" % (str(ROOT / 'app.py'), HEAVY_MODULES)
+
+
+def _probe(code, *args):
+    # No background warm-up: it would fill the caches being measured
+    result = subprocess.run([sys.executable, '-c', code, *args], cwd=ROOT, env={**os.environ, 'COVID_WARMUP': '0'},
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    imports = [_probe(_IMPORT_PROBE) for _ in range(args.repeat)]
+    results = {
+        'import_s': statistics.median(r['import_s'] for r in imports),
+        'import_heavy_loaded': imports[0]['heavy_loaded'],
+        'pages': {},
+    }
+    print(f"{'base imports':<20} {results['import_s'] * 1000:8.0f} ms  "
+          f"heavy: {', '.join(results['import_heavy_loaded']) or '-'}")
+
+    for page in PAGE_TITLES:
+        runs = [_probe(_RENDER_PROBE, page) for _ in range(args.repeat)]
+        entry = {
+            'load_s': statistics.median(r['load_s'] for r in runs),
+            'boot_s': statistics.median(r['boot_s'] for r in runs),
+            'first_render_s': statistics.median(r['first_render_s'] for r in runs),
+            'heavy_loaded': runs[0]['heavy_loaded'],
+        }
+        results['pages'][page] = entry
+        print(f"{page:<20} {entry['first_render_s'] * 1000:8.0f} ms  "
+              f"(load {entry['load_s'] * 1000:.0f} ms, boot {entry['boot_s'] * 1000:.0f} ms)  heavy: {', '.join(entry['heavy_loaded']) or '-'}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
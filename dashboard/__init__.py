@@ -0,0 +1 @@
+"""Support modules for the COVID-19 vaccination impact dashboard (app.py)."""
@@ -0,0 +1,220 @@
+"""Derived tables shared by the dashboard pages.
+
+Everything here is computed once per dataset version and death metric
+(absolute or per 100k, see :mod:`dashboard.normalize`) and held in a
+process-wide cache keyed on ``Dataset.fingerprint``, so page reruns and
+concurrent sessions only read the results.
+
+For a date window, :func:`get_window` swaps in per-country deaths summed
+over the window (from a :class:`DeathPrefix`) and recomputes only the
+tables that depend on them.
+"""
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dashboard import categories, normalize, store, tracing, versions
+from dashboard.timeseries import DeathMatrix, DeathPrefix, appended_rows
+
+
+class Aggregates(NamedTuple):
+    # The Crisis
+    top_20_deaths: pd.DataFrame
+    age_totals: pd.DataFrame
+    # The Solution
+    timeline_data: pd.DataFrame
+    # The Evidence
+    death_threshold: float
+    category_stats: pd.DataFrame
+    regional_pivot: pd.DataFrame
+    # Time series
+    deaths_matrix: DeathMatrix
+    vaccine_split: pd.DataFrame
+    category_split: pd.DataFrame
+
+
+def country_tables(merged_data, deaths):
+    """The tables built from the per-country ``deaths`` column."""
+    top_20_deaths = merged_data.nlargest(20, deaths).sort_values(deaths, ascending=True)
+
+    # Bottom 25% of early adopters by deaths
+    early_deaths = merged_data.loc[merged_data['Category'] == categories.EARLY, deaths]
+    death_threshold = early_deaths.quantile(0.25)
+
+    category_stats = merged_data.groupby('Category', observed=True).agg({
+        deaths: ['mean', 'median', 'count']
+    })
+    category_stats.columns = ['Mean', 'Median', 'Count']
+    category_stats = category_stats.reset_index()
+
+    regional_data = merged_data.groupby(['Who_region', 'Category'], observed=True)[deaths].mean().reset_index()
+    regional_pivot = regional_data.pivot(index='Who_region', columns='Category', values=deaths)
+
+    return {
+        'top_20_deaths': top_20_deaths,
+        'death_threshold': death_threshold,
+        'category_stats': category_stats,
+        'regional_pivot': regional_pivot,
+    }
+
+
+def compute_aggregates(dataset, metric=normalize.ABSOLUTE):
+    merged_data = dataset.merged_data
+
+    age_totals = dataset.deaths_by_age.groupby('Agegroup', observed=True)['Deaths'].sum().reset_index()
+    age_totals['Percentage'] = (age_totals['Deaths'] / age_totals['Deaths'].sum() * 100).round(1)
+    age_totals = age_totals.sort_values('Deaths', ascending=False)
+
+    timeline_data = merged_data.sort_values('Vaccine_Intro_Date', kind='stable').reset_index(drop=True)
+    timeline_data['Rank'] = timeline_data.index + 1
+
+    deaths_matrix = get_deaths_matrix(dataset)
+    vaccine_split = deaths_matrix.split_at(
+        merged_data.set_index('Country_code')['Vaccine_Intro_Date']
+    ).reindex(merged_data['Country_code'])
+    if metric == normalize.PER_100K:
+        # Pooled rate: category deaths over category population, countries with a population only
+        known = ~np.isnan(merged_data['Population'].to_numpy())
+        groups = merged_data['Category'].array[known]
+        category_split = vaccine_split[known].groupby(groups, observed=True).sum().div(
+            merged_data['Population'][known].groupby(groups, observed=True).sum().to_numpy(), axis=0
+        ) * normalize.PER
+    else:
+        category_split = vaccine_split.groupby(merged_data['Category'].array, observed=True).sum()
+    category_split.index.name = 'Category'
+
+    return Aggregates(
+        **country_tables(merged_data, metric.column),
+        age_totals=age_totals,
+        timeline_data=timeline_data,
+        deaths_matrix=deaths_matrix,
+        vaccine_split=vaccine_split,
+        category_split=category_split,
+    )
+
+
+def _freeze(aggs):
+    """``aggs`` with every table over read-only arrays (see :func:`store.freeze`)."""
+    return aggs._replace(**{name: store.freeze(value) for name, value in aggs._asdict().items()
+                            if isinstance(value, pd.DataFrame)})
+
+
+@versions.derived
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _cached_aggregates(fingerprint, metric, _dataset):
+    with tracing.span('aggregates.compute', metric=metric.column):
+        return _freeze(compute_aggregates(_dataset, metric))
+
+
+def get_aggregates(dataset, metric=normalize.ABSOLUTE):
+    """Return the shared :class:`Aggregates` for ``dataset``; treat them as read-only."""
+    return _cached_aggregates(dataset.fingerprint, metric, dataset)
+
+
+def _extended(base, rows):
+    """``base`` with ``rows`` appended, leaving the shared ``base`` untouched."""
+    with tracing.span('aggregates.matrix_append', unit=base.unit, rows=len(rows)):
+        return base if len(rows) == 0 else base.copy().append(rows)
+
+
+@versions.derived
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _cached_deaths_matrix(fingerprint, _time_series, _extend=None):
+    if _extend is not None:
+        return _extended(*_extend)
+    with tracing.span('aggregates.deaths_matrix'):
+        return DeathMatrix.from_frame(_time_series)
+
+
+def get_deaths_matrix(dataset):
+    """Return the shared monthly :class:`DeathMatrix` for ``dataset.time_series``."""
+    return _cached_deaths_matrix(dataset.fingerprint, dataset.time_series)
+
+
+# Largest dense daily matrix we are willing to hold (countries x days, float64)
+MAX_DAILY_CELLS = 25_000_000
+
+
+@versions.derived
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _cached_daily_matrix(fingerprint, _time_series, _extend=None):
+    if _extend is not None:
+        daily = _extended(*_extend)
+        return daily if daily.values.size <= MAX_DAILY_CELLS else None
+    dates = _time_series['date']
+    # Monthly sources (every date on the 1st) have no daily view
+    if not (dates.dt.day != 1).any():
+        return None
+    days = (dates.max() - dates.min()).days + 1
+    if _time_series['Country_code'].nunique() * days > MAX_DAILY_CELLS:
+        return None
+    with tracing.span('aggregates.daily_matrix'):
+        return DeathMatrix.from_frame(_time_series, unit='D')
+
+
+def get_daily_matrix(dataset):
+    """Return a day-resolution :class:`DeathMatrix`, or None if the series is monthly or too large."""
+    return _cached_daily_matrix(dataset.fingerprint, dataset.time_series)
+
+
+def extend_matrices(previous, dataset):
+    """Build ``dataset``'s death matrices from ``previous``'s if its time series only gained rows.
+
+    When ``dataset.time_series`` is ``previous.time_series`` followed by rows
+    dated after its last one (e.g. a feed appending each day), those rows
+    are appended to copies of the previous version's matrices
+    (:meth:`DeathMatrix.append`) and the results cached for ``dataset``
+    instead of being rebuilt from every row. Returns whether that applied.
+    """
+    rows = appended_rows(previous.time_series, dataset.time_series)
+    if rows is None:
+        return False
+    with tracing.span('aggregates.extend', rows=len(rows)):
+        _cached_deaths_matrix(dataset.fingerprint, dataset.time_series, (get_deaths_matrix(previous), rows))
+        daily = get_daily_matrix(previous)
+        if daily is not None:
+            _cached_daily_matrix(dataset.fingerprint, dataset.time_series, (daily, rows))
+    return True
+
+
+@versions.derived
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _cached_prefix(fingerprint, _time_series):
+    with tracing.span('aggregates.prefix'):
+        return DeathPrefix.from_frame(_time_series)
+
+
+def get_prefix(dataset):
+    """Return the shared :class:`DeathPrefix` for ``dataset.time_series``."""
+    return _cached_prefix(dataset.fingerprint, dataset.time_series)
+
+
+def window_data(dataset, start, end):
+    """``merged_data`` with ``Total_Deaths`` (and per-100k) summed over ``start..end``."""
+    merged_data = dataset.merged_data
+    totals = get_prefix(dataset).window_totals(start, end)
+    deaths = totals.reindex(merged_data['Country_code'], fill_value=0.0).to_numpy()
+    return merged_data.assign(
+        Total_Deaths=deaths,
+        Deaths_per_100k=deaths / merged_data['Population'].to_numpy() * normalize.PER,
+    )
+
+
+@versions.derived
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _cached_window(fingerprint, metric, start, end, _dataset):
+    with tracing.span('aggregates.window', start=str(start), end=str(end)):
+        merged_data = store.freeze(window_data(_dataset, start, end))
+        aggs = get_aggregates(_dataset, metric)._replace(**country_tables(merged_data, metric.column))
+        return _dataset._replace(merged_data=merged_data), _freeze(aggs)
+
+
+def get_window(dataset, metric, start, end):
+    """Return ``(dataset, aggs)`` with per-country deaths restricted to ``start..end``.
+
+    ``merged_data`` and the tables derived from it are recomputed for the
+    window; time-series and age tables are shared with the full dataset.
+    """
+    return _cached_window(dataset.fingerprint, metric, start, end, dataset)
@@ -0,0 +1,65 @@
+"""Adoption-category classification.
+
+Countries are binned by ``Vaccine_Intro_Date`` once at load time; pages read
+the resulting ``Category`` column instead of re-binning per rerun, and take
+the category names and their periods from here (see :func:`adoption_periods`).
+"""
+import numpy as np
+import pandas as pd
+
+# Right-closed intervals, as with pd.cut: (edge[i], edge[i + 1]] -> LABELS[i]
+ADOPTION_EDGES = ('2020-01-01', '2021-02-01', '2021-05-01', '2022-01-01')
+ADOPTION_LABELS = ('Early Adopters', 'Mid Adopters', 'Late Adopters')
+# The earliest category, where the Evidence page looks for success cases
+EARLY = ADOPTION_LABELS[0]
+
+_NS_PER_DAY = 86_400 * 10**9
+
+
+def classify_adoption(dates, edges=ADOPTION_EDGES, labels=ADOPTION_LABELS):
+    """Bin ``dates`` into an ordered categorical of ``labels``.
+
+    Dates outside the edges (or missing) become NaN, matching ``pd.cut``.
+    """
+    if len(edges) != len(labels) + 1:
+        raise ValueError('edges must have exactly one more entry than labels')
+    edge_days = np.asarray(edges, dtype='datetime64[D]').astype('int64')
+    if np.any(np.diff(edge_days) <= 0):
+        raise ValueError('edges must be strictly increasing')
+
+    ns = np.asarray(dates, dtype='datetime64[ns]').astype('int64')
+    missing = ns == np.iinfo('int64').min
+    # Ceil to whole days so "after the edge" keeps its meaning for timestamps within a day
+    days = -(-ns // _NS_PER_DAY)
+    codes = np.searchsorted(edge_days, days, side='left') - 1
+    codes[missing | (codes < 0) | (codes >= len(labels))] = -1
+    return pd.Categorical.from_codes(codes, categories=list(labels), ordered=True)
+
+
+def short_label(label):
+    """The first word of a category label (``'Early Adopters'`` -> ``'Early'``), for tight spaces."""
+    return str(label).split()[0]
+
+
+def adoption_periods(edges=ADOPTION_EDGES, labels=ADOPTION_LABELS, short=False):
+    """``{label: period}`` naming each bin's months, e.g. ``'February – May 2021'``.
+
+    The first bin reads "Before" its upper edge and the last "After" its
+    lower one. ``short`` abbreviates the months (``'Feb-May 2021'``).
+    """
+    if len(edges) != len(labels) + 1:
+        raise ValueError('edges must have exactly one more entry than labels')
+    month, dash = ('%b', '-') if short else ('%B', ' – ')
+    edges = pd.to_datetime(list(edges))
+    periods = {}
+    for i, label in enumerate(labels):
+        low, high = edges[i], edges[i + 1]
+        if len(labels) > 1 and i == 0:
+            periods[label] = f'Before {high:{month} %Y}'
+        elif len(labels) > 1 and i == len(labels) - 1:
+            periods[label] = f'After {low:{month} %Y}'
+        elif low.year == high.year:
+            periods[label] = f'{low:{month}}{dash}{high:{month} %Y}'
+        else:
+            periods[label] = f'{low:{month} %Y}{dash}{high:{month} %Y}'
+    return periods
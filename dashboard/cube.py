@@ -0,0 +1,219 @@
+"""Aggregation cube over region, income, adoption category, age group and month.
+
+Deaths are held in dense arrays indexed by ``Who_region`` x ``Wb_income`` x
+``Category`` (the *country* dimensions, which partition countries) and
+``Agegroup`` x ``month`` (the *within-country* dimensions). Each cell keeps
+the sum, count and sum of squares of per-country deaths, so means and
+variances across countries follow from array reductions: slicing is
+``np.take`` along an axis, and rolling a dimension up is a sum over it.
+
+Rolling up a within-country dimension changes the per-country value being
+described (e.g. deaths in one month to deaths over all months), and sums of
+squares do not add across it. The cube therefore stores one array set per
+subset of the within-country dimensions (four in all); a query picks the
+set matching the dimensions it keeps.
+
+The sources have deaths by month and deaths by age, but not both at once:
+each country's monthly deaths are split across age groups in proportion to
+its age breakdown, and countries without one go to ``NOT_REPORTED``. Both
+margins (age totals and monthly totals) match the sources exactly for the
+countries in ``merged_data``; rows of the age and time-series tables for
+countries outside it are not in the cube.
+"""
+import re
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dashboard import normalize, tracing, versions
+
+COUNTRY_DIMENSIONS = ('Who_region', 'Wb_income', 'Category')
+WITHIN_DIMENSIONS = ('Agegroup', 'month')
+DIMENSIONS = COUNTRY_DIMENSIONS + WITHIN_DIMENSIONS
+
+NOT_REPORTED = 'Not reported'
+
+
+class Cube:
+    """Sum, count and sum of squares of per-country deaths over :data:`DIMENSIONS`.
+
+    ``labels`` maps each dimension to an ``Index`` of its values. ``counts``
+    (countries per country-dimension cell) and ``population`` are
+    ``(regions, incomes, categories)`` arrays; ``sums[within]`` and
+    ``squares[within]`` add the axes of the ``within`` dimensions (a tuple,
+    in :data:`WITHIN_DIMENSIONS` order) to those three.
+    """
+
+    def __init__(self, labels, counts, population, sums, squares):
+        self.labels = labels
+        self.counts = counts
+        self.population = population
+        self.sums = sums
+        self.squares = squares
+
+    @classmethod
+    def from_frames(cls, merged_data, deaths_by_age, deaths_matrix):
+        """Build from ``merged_data`` (with ``Category`` and ``Population``), the age table and a monthly matrix.
+
+        Countries without a region, income group or category are left out.
+        """
+        cells = [pd.Categorical(merged_data[column]) for column in COUNTRY_DIMENSIONS]
+        keep = np.logical_and.reduce([c.codes >= 0 for c in cells])
+        codes = merged_data['Country_code'].astype(str).to_numpy()[keep]
+        shape = tuple(len(c.categories) for c in cells)
+        flat = np.ravel_multi_index([c.codes[keep] for c in cells], shape)
+
+        # Country x month deaths (countries without rows in the series stay zero)
+        rows = deaths_matrix.countries.astype(str).get_indexer(codes)
+        monthly = np.vstack([deaths_matrix.values, np.zeros((1, deaths_matrix.values.shape[1]))])[rows]
+
+        # Country x age shares, with the unreported remainder as one more group
+        by_age = deaths_by_age.pivot_table(index='Country_code', columns='Agegroup', values='Deaths',
+                                           aggfunc='sum', observed=True)
+        by_age.index = by_age.index.astype(str)
+        by_age.columns = by_age.columns.astype(str)
+        # Youngest group first ('0_4', '5_14', '15_64', '65+')
+        ages = sorted(by_age.columns, key=lambda group: int(re.match(r'\d*', group).group() or 0))
+        by_age = by_age.reindex(index=codes, columns=ages).fillna(0.0).to_numpy()
+        totals = by_age.sum(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shares = np.where(totals > 0, by_age / totals, 0.0)
+        # Rounding noise of complete breakdowns is not a remainder
+        remainder = np.where(totals[:, 0] > 0, 0.0, 1.0)
+        if remainder.any():
+            shares = np.column_stack([shares, remainder])
+            ages.append(NOT_REPORTED)
+
+        # Country x age x month; the only per-country array, dropped after the build
+        values = shares[:, :, None] * monthly[:, None, :]
+        labels = {column: pd.Index(c.categories.astype(str), name=column) for column, c in zip(COUNTRY_DIMENSIONS, cells)}
+        labels['Agegroup'] = pd.Index(ages, name='Agegroup')
+        labels['month'] = pd.Index(deaths_matrix.dates, name='month')
+
+        n_cells = int(np.prod(shape))
+        counts = np.bincount(flat, minlength=n_cells).reshape(shape).astype('float64')
+        population = np.bincount(flat, weights=np.nan_to_num(merged_data['Population'].to_numpy(dtype='float64')[keep]),
+                                 minlength=n_cells).reshape(shape)
+
+        sums, squares = {}, {}
+        for size in range(len(WITHIN_DIMENSIONS) + 1):
+            for within in combinations(WITHIN_DIMENSIONS, size):
+                # Per-country values with the other within-country dimensions summed out
+                dropped = tuple(1 + i for i, d in enumerate(WITHIN_DIMENSIONS) if d not in within)
+                per_country = values.sum(axis=dropped) if dropped else values
+                per_country = per_country.reshape(len(codes), -1)
+                cell_shape = shape + tuple(len(labels[d]) for d in within)
+                sums[within] = _group_sum(flat, per_country, n_cells).reshape(cell_shape)
+                squares[within] = _group_sum(flat, per_country ** 2, n_cells).reshape(cell_shape)
+        return cls(labels, counts, population, sums, squares)
+
+    def aggregate(self, keep, where=None):
+        """Sum, count and sum of squares over the ``keep`` dimensions.
+
+        ``where`` maps dimensions to the labels to include (a dice); every
+        other dimension is rolled up. Returns ``(sums, counts, squares)``
+        arrays with one axis per ``keep`` dimension, in ``keep`` order.
+        ``squares`` is NaN when a within-country dimension is filtered but
+        not kept, as per-country totals over a subset are not stored.
+        """
+        unknown = set(keep).union(where or ()) - set(DIMENSIONS)
+        if unknown:
+            raise KeyError(f'unknown cube dimensions: {sorted(unknown)}')
+        where = where or {}
+        within = tuple(d for d in WITHIN_DIMENSIONS if d in keep or d in where)
+        axes = COUNTRY_DIMENSIONS + within
+        sums, squares = self.sums[within], self.squares[within]
+        counts = self.counts.reshape(self.counts.shape + (1,) * len(within))
+
+        for dimension, selected in where.items():
+            axis = axes.index(dimension)
+            positions = self._positions(dimension, selected)
+            sums, squares = sums.take(positions, axis=axis), squares.take(positions, axis=axis)
+            if dimension in COUNTRY_DIMENSIONS:
+                counts = counts.take(positions, axis=axis)
+
+        rolled = tuple(i for i, d in enumerate(axes) if d not in keep)
+        sums = sums.sum(axis=rolled)
+        if all(d in keep for d in within):
+            squares = squares.sum(axis=rolled)
+        else:
+            squares = np.full(sums.shape, np.nan)
+        # Counts have length 1 along the within-country axes
+        counts = counts.sum(axis=rolled, keepdims=True).squeeze(axis=rolled)
+        counts = np.broadcast_to(counts, sums.shape)
+
+        order = [d for d in axes if d in keep]
+        permutation = [order.index(d) for d in keep]
+        return sums.transpose(permutation), counts.transpose(permutation), squares.transpose(permutation)
+
+    def population_for(self, keep, where=None):
+        """Population summed to the country dimensions in ``keep``, with length-1 axes for the others."""
+        population = self.population
+        for dimension, selected in (where or {}).items():
+            if dimension in COUNTRY_DIMENSIONS:
+                population = population.take(self._positions(dimension, selected),
+                                             axis=COUNTRY_DIMENSIONS.index(dimension))
+        population = population.sum(axis=tuple(i for i, d in enumerate(COUNTRY_DIMENSIONS) if d not in keep))
+        kept = [d for d in keep if d in COUNTRY_DIMENSIONS]
+        in_order = [d for d in COUNTRY_DIMENSIONS if d in keep]
+        population = population.transpose([in_order.index(d) for d in kept])
+        return population.reshape([population.shape[kept.index(d)] if d in kept else 1 for d in keep])
+
+    def frame(self, keep, where=None):
+        """Tidy table of the ``keep`` cells: Deaths, Countries, Mean, Std and Deaths_per_100k."""
+        sums, counts, squares = self.aggregate(keep, where)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = sums / counts
+            variance = np.maximum(squares / counts - mean ** 2, 0.0) * counts / (counts - 1)
+            rate = sums / self.population_for(keep, where) * normalize.PER
+        levels = [self._selected(d, where) for d in keep]
+        if len(levels) == 1:
+            index = levels[0]
+        elif levels:
+            # Explicit levels keep the cube's label order (e.g. age groups) through unstack
+            index = pd.MultiIndex(levels=levels, codes=np.indices(sums.shape).reshape(len(keep), -1), names=keep)
+        else:
+            index = [0]
+        return pd.DataFrame({
+            'Deaths': sums.ravel(),
+            'Countries': counts.ravel(),
+            'Mean': mean.ravel(),
+            'Std': np.sqrt(variance).ravel(),
+            'Deaths_per_100k': np.broadcast_to(rate, sums.shape).ravel(),
+        }, index=index)
+
+    def _positions(self, dimension, selected):
+        """Sorted positions of the ``selected`` labels of ``dimension`` (unknown labels skipped)."""
+        labels = self.labels[dimension]
+        positions = labels.get_indexer(pd.Index(selected).astype(labels.dtype))
+        return np.sort(positions[positions >= 0])
+
+    def _selected(self, dimension, where):
+        if where and dimension in where:
+            return self.labels[dimension][self._positions(dimension, where[dimension])]
+        return self.labels[dimension]
+
+
+def _group_sum(groups, values, n_groups):
+    """Sum the rows of ``values`` by ``groups`` into ``(n_groups, values.shape[1])``."""
+    out = np.zeros((n_groups, values.shape[1]))
+    np.add.at(out, groups, values)
+    return out
+
+
+@versions.derived
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _cached_cube(fingerprint, _merged_data, _deaths_by_age, _deaths_matrix):
+    with tracing.span('cube.build'):
+        return Cube.from_frames(_merged_data, _deaths_by_age, _deaths_matrix)
+
+
+def get_cube(dataset, deaths_matrix):
+    """Return the shared :class:`Cube` for ``dataset``; treat it as read-only.
+
+    Only static columns of ``merged_data`` are used, so a windowed dataset
+    shares the cube of the full one.
+    """
+    return _cached_cube(dataset.fingerprint, dataset.merged_data, dataset.deaths_by_age, deaths_matrix)
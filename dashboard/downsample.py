@@ -0,0 +1,70 @@
+"""Server-side downsampling for long time-series curves.
+
+Plotting hundreds of curves with thousands of points each would ship
+megabytes of JSON to the browser for detail no screen can show. Curves are
+reduced before they reach Plotly:
+
+- :func:`lttb` (Largest-Triangle-Three-Buckets) keeps the points that best
+  preserve a single curve's visual shape; used for the highlighted curves.
+- :func:`minmax` keeps each bucket's minimum and maximum for a whole
+  matrix of curves at once, so peaks survive; used for background curves.
+"""
+import numpy as np
+
+
+def lttb(x, y, n_out):
+    """Indices of the ``n_out`` points of ``(x, y)`` chosen by LTTB.
+
+    ``x`` must be increasing and numeric (e.g. int64 nanoseconds). The
+    first and last points are always kept; curves with ``n_out`` points or
+    fewer are returned whole.
+    """
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Interior points split into n_out - 2 buckets of (almost) equal size
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (the last point for the final bucket)
+        next_lo, next_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        # Twice the triangle area for every candidate in this bucket
+        area = np.abs((x[previous] - avg_x) * (y[lo:hi] - y[previous])
+                      - (x[previous] - x[lo:hi]) * (avg_y - y[previous]))
+        previous = lo + int(np.nanargmax(area)) if np.isfinite(area).any() else lo
+        keep[i + 1] = previous
+    return keep
+
+
+def minmax(values, n_buckets):
+    """Column indices keeping each bucket's min and max, for every row of ``values``.
+
+    ``values`` is a ``(curves, points)`` array. Returns a ``(curves, k)``
+    int array (``k <= 2 * n_buckets``) of increasing column positions per
+    row; matrices with ``2 * n_buckets`` columns or fewer are returned whole.
+    """
+    values = np.asarray(values, dtype='float64')
+    rows, n = values.shape
+    if n <= 2 * n_buckets:
+        return np.broadcast_to(np.arange(n), (rows, n))
+
+    size = -(-n // n_buckets)
+    padded = np.full((rows, n_buckets * size), np.nan)
+    padded[:, :n] = values
+    buckets = padded.reshape(rows, n_buckets, size)
+    # All-NaN buckets (only the padded tail) fall back to their first column
+    filled = np.where(np.isnan(buckets), np.inf, buckets)
+    low = filled.argmin(axis=2)
+    filled = np.where(np.isnan(buckets), -np.inf, buckets)
+    high = filled.argmax(axis=2)
+
+    base = np.arange(n_buckets) * size
+    pairs = np.stack([np.minimum(low, high), np.maximum(low, high)], axis=2) + base[None, :, None]
+    return np.minimum(pairs.reshape(rows, -1), n - 1)
@@ -0,0 +1,39 @@
+"""Rendered-figure cache for the matplotlib/seaborn charts.
+
+Charts are rendered once per (dataset fingerprint, chart, parameters) key and
+the image bytes are kept in a process-wide LRU, so reruns and other sessions
+serve them with ``st.image`` instead of rebuilding the figure.
+"""
+import io
+
+from dashboard import tracing
+from dashboard.lru import LRUCache
+
+# Same defaults st.pyplot uses, so cached images look identical
+SAVEFIG_DEFAULTS = {'dpi': 200, 'bbox_inches': 'tight'}
+
+FIGURE_CACHE = LRUCache(max_entries=64, max_bytes=32 * 2**20)
+
+
+def render(fig, fmt='png', **savefig_kwargs):
+    """Serialize ``fig`` to PNG bytes or SVG text."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt, **{**SAVEFIG_DEFAULTS, **savefig_kwargs})
+    data = buffer.getvalue()
+    return data.decode('utf-8') if fmt == 'svg' else data
+
+
+def cached_figure(key, build, fmt='png', **savefig_kwargs):
+    """Return the rendered image for ``key``, calling ``build()`` on a miss.
+
+    ``key`` must identify the data version and every chart parameter, e.g.
+    ``('age_totals', dataset.fingerprint)``; ``build`` returns a
+    ``matplotlib.figure.Figure`` made without pyplot, whose figure registry
+    is not thread-safe (sessions and the warm-up build charts concurrently).
+    """
+    def build_and_render():
+        with tracing.span('matplotlib.build', figure=key[0]):
+            return render(build(), fmt, **savefig_kwargs)
+
+    return FIGURE_CACHE.get_or_create((key, fmt), build_and_render)
+
@@ -0,0 +1,84 @@
+"""Focus countries, highlight classes and marker sizes for the Evidence scatter."""
+import os
+
+import numpy as np
+
+from dashboard import categories
+
+# Country_code -> highlight label shown in the charts
+DEFAULT_FOCUS = {
+    'MEX': 'Mexico',
+    'USA': 'United States',
+}
+
+# Initial focus countries for this deployment, e.g. COVID_FOCUS=MEX,USA,BRA;
+# users change the selection in the sidebar
+FOCUS_CODES = tuple(code.strip() for code in os.environ.get('COVID_FOCUS', ','.join(DEFAULT_FOCUS)).split(',')
+                    if code.strip())
+
+# Labels for focus countries whose official names are too long for a chart
+SHORT_NAMES = {
+    **DEFAULT_FOCUS,
+    'GBR': 'United Kingdom',
+    'BOL': 'Bolivia',
+    'COD': 'DR Congo',
+    'NLD': 'Netherlands',
+    'PSE': 'Palestine',
+    'TZA': 'Tanzania',
+    'XKX': 'Kosovo',
+}
+
+# Each focus country needs its own accent color (see theme.focus_colors)
+MAX_FOCUS = 10
+
+SUCCESS = 'Early + Low Deaths'
+OTHER = 'Other'
+
+
+def focus_labels(codes, index):
+    """``{code: label}`` for the ``codes`` present in ``index``, in the given order."""
+    return {code: SHORT_NAMES.get(code) or index.name(code) for code in codes if code in index}
+
+
+def highlight_classes(frame, death_threshold, focus=DEFAULT_FOCUS, deaths='Total_Deaths'):
+    """Classify each row of ``frame`` for the scatter.
+
+    Focus countries (keyed on ``Country_code``) win over the success rule
+    (``deaths`` column at or below ``death_threshold``), in ``focus`` order;
+    everything else is ``OTHER``.
+    """
+    codes = frame['Country_code']
+    conditions = [np.asarray(codes == code) for code in focus]
+    choices = list(focus.values())
+
+    conditions.append(np.asarray(frame['Category'] == categories.EARLY)
+                      & (frame[deaths].to_numpy() <= death_threshold))
+    choices.append(SUCCESS)
+    return np.select(conditions, choices, default=OTHER)
+
+
+def highlight_groups(index, death_threshold, focus=DEFAULT_FOCUS, deaths='Total_Deaths', frame=None):
+    """Row positions per highlight class, from ``index`` lookups instead of column scans.
+
+    Same classes as :func:`highlight_classes`: ``{label: positions}`` for each
+    focus country, then ``SUCCESS`` and ``OTHER``. ``frame`` (default: the
+    indexed frame) supplies the ``deaths`` column, e.g. windowed totals.
+    """
+    values = (index.frame if frame is None else frame)[deaths].to_numpy()
+    focus_positions = index.positions(focus)
+    groups = {label: index.positions([code]) for code, label in focus.items()}
+
+    early = index.group('Category', categories.EARLY)
+    success = early[values[early] <= death_threshold]
+    groups[SUCCESS] = np.setdiff1d(success, focus_positions, assume_unique=True)
+
+    other = np.ones(len(index), dtype=bool)
+    other[focus_positions] = False
+    other[success] = False
+    groups[OTHER] = np.flatnonzero(other)
+    return groups
+
+
+def marker_sizes(deaths, smallest=8, largest=30):
+    """Log-scaled marker sizes, clipped to ``[smallest, largest]``."""
+    return np.clip(np.log10(np.asarray(deaths, dtype='float64') + 1) * 6, smallest, largest)
@@ -0,0 +1,80 @@
+"""Keyed lookups into ``merged_data``.
+
+:class:`CountryIndex` is built once per dataset version and maps each
+``Country_code`` to its row position, and each value of the grouping
+columns (adoption category, WHO region) to the positions of its rows, so
+pages pick out countries and groups with a hash lookup or a slice instead
+of scanning whole columns.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dashboard import versions
+
+GROUP_COLUMNS = ('Category', 'Who_region')
+
+
+def group_positions(values):
+    """Map each distinct value to the (ascending) positions where it occurs."""
+    codes, uniques = pd.factorize(values, sort=False)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.cumsum(np.bincount(codes[codes >= 0], minlength=len(uniques)))
+    # Missing values (code -1) sort first; skip them
+    start = int((codes < 0).sum())
+    groups = {}
+    for label, end in zip(uniques, bounds + start):
+        groups[label] = order[start:end]
+        start = end
+    return groups
+
+
+class CountryIndex:
+    """Row positions of ``merged_data`` by country code and by group."""
+
+    def __init__(self, frame, groups=GROUP_COLUMNS):
+        self.frame = frame
+        self.codes = pd.Index(frame['Country_code'].astype(str))
+        # Code -> country name, also the option list for the focus selector
+        self.names = dict(zip(self.codes, frame['Country'].astype(str)))
+        self.groups = {column: group_positions(frame[column]) for column in groups if column in frame}
+        # Adoption order, 1-based; ties keep file order (matches Aggregates.timeline_data)
+        order = np.argsort(frame['Vaccine_Intro_Date'].to_numpy(), kind='stable')
+        self.rank = np.empty(len(frame), dtype='int64')
+        self.rank[order] = np.arange(1, len(frame) + 1)
+
+    def __contains__(self, code):
+        return code in self.codes
+
+    def __len__(self):
+        return len(self.codes)
+
+    def position(self, code):
+        """Row position of ``code``; raises ``KeyError`` if it is not loaded."""
+        return self.codes.get_loc(code)
+
+    def positions(self, codes):
+        """Row positions of ``codes``, skipping any that are not loaded."""
+        found = self.codes.get_indexer(list(codes))
+        return found[found >= 0]
+
+    def row(self, code):
+        return self.frame.iloc[self.position(code)]
+
+    def group(self, column, label):
+        """Positions of the rows whose ``column`` equals ``label`` (empty if none)."""
+        return self.groups[column].get(label, np.empty(0, dtype='intp'))
+
+    def name(self, code):
+        return self.names[code]
+
+
+@versions.derived
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _cached_index(fingerprint, _frame):
+    return CountryIndex(_frame)
+
+
+def get_index(dataset):
+    """Return the shared :class:`CountryIndex` for ``dataset.merged_data``."""
+    return _cached_index(dataset.fingerprint, dataset.merged_data)
@@ -0,0 +1,188 @@
+"""Bootstrap intervals and permutation tests for the adoption categories.
+
+Category means and medians of per-country deaths come from a few dozen
+countries each, so they move a lot with the countries that happen to be in
+a category. This module puts intervals around them and tests whether the
+categories differ at all.
+
+Both procedures draw every resample at once, as a ``(resamples, n)`` matrix
+of row indices (bootstrap) or of shuffled values cut into blocks of the
+category sizes (permutation), and reduce it along its second axis; nothing
+loops over resamples in Python. Matrices larger than ``MAX_CELLS`` are drawn in row blocks to bound
+memory. Results are cached per dataset version and metric, for the full
+period only: a date window changes with every slider move, and resampling
+for each one would hold up the rerun for seconds.
+"""
+import os
+from itertools import combinations
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dashboard import tracing, versions
+
+# Deployment settings, e.g. COVID_BOOTSTRAP_RESAMPLES=2000 on a small instance
+RESAMPLES = int(os.environ.get('COVID_BOOTSTRAP_RESAMPLES', 10_000))
+SEED = int(os.environ.get('COVID_BOOTSTRAP_SEED', 0))
+CONFIDENCE = 0.95
+
+# Largest block of a resample matrix held at once (float64: 32 MB)
+MAX_CELLS = 4_000_000
+
+
+class CategoryInference(NamedTuple):
+    # Indexed by Category: Mean_Low, Mean_High, Median_Low, Median_High
+    intervals: pd.DataFrame
+    # Indexed by comparison ('Early vs Mid', ...): Mean_Difference, Mean_P,
+    # Median_Difference, Median_P; differences are first minus second, p-values
+    # two-sided permutation tests
+    pairs: pd.DataFrame
+    # Permutation p-value for any difference between the category means
+    overall_p: float
+    resamples: int
+    confidence: float
+
+
+def _blocks(resamples, n):
+    """Row counts of the blocks a ``(resamples, n)`` matrix is drawn in."""
+    step = max(1, MAX_CELLS // max(n, 1))
+    return [min(step, resamples - start) for start in range(0, resamples, step)]
+
+
+def bootstrap_intervals(values, rng, resamples=RESAMPLES, confidence=CONFIDENCE):
+    """Percentile bootstrap intervals for the mean and median of ``values``.
+
+    Returns ``(mean_low, mean_high, median_low, median_high)``; NaN values
+    are dropped first, and an empty sample gives NaN bounds.
+    """
+    values = np.asarray(values, dtype='float64')
+    values = values[~np.isnan(values)]
+    n = len(values)
+    if n == 0:
+        return (np.nan,) * 4
+
+    means, medians = [], []
+    for rows in _blocks(resamples, n):
+        sample = values[rng.integers(0, n, size=(rows, n))]
+        means.append(sample.mean(axis=1))
+        medians.append(np.median(sample, axis=1))
+
+    tail = (1 - confidence) / 2 * 100
+    mean_low, mean_high = np.percentile(np.concatenate(means), [tail, 100 - tail])
+    median_low, median_high = np.percentile(np.concatenate(medians), [tail, 100 - tail])
+    return mean_low, mean_high, median_low, median_high
+
+
+def block_stats(samples, sizes):
+    """Mean and median of consecutive column blocks of ``sizes`` in each row.
+
+    ``samples`` is a ``(rows, sum(sizes))`` array; returns two
+    ``(rows, len(sizes))`` arrays (NaN for empty blocks).
+    """
+    bounds = np.concatenate([[0], np.cumsum(sizes)])
+    means = np.full((len(samples), len(sizes)), np.nan)
+    medians = np.full((len(samples), len(sizes)), np.nan)
+    for group, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])):
+        if hi > lo:
+            means[:, group] = samples[:, lo:hi].mean(axis=1)
+            medians[:, group] = np.median(samples[:, lo:hi], axis=1)
+    return means, medians
+
+
+def permutation_null(values, sizes, rng, resamples=RESAMPLES):
+    """:func:`block_stats` for ``resamples`` random reassignments of ``values`` to groups.
+
+    Shuffling each row of values and cutting it into blocks of ``sizes`` is
+    the same as shuffling the group labels, and keeps every group contiguous.
+    """
+    means, medians = [], []
+    for rows in _blocks(resamples, len(values)):
+        shuffled = rng.permuted(np.broadcast_to(values, (rows, len(values))), axis=1)
+        block_means, block_medians = block_stats(shuffled, sizes)
+        means.append(block_means)
+        medians.append(block_medians)
+    return np.concatenate(means), np.concatenate(medians)
+
+
+def p_value(null, observed):
+    """Two-sided permutation p-value, counting the observed labelling as one resample."""
+    return (1 + np.count_nonzero(np.abs(null) >= abs(observed))) / (len(null) + 1)
+
+
+def category_inference(frame, column, resamples=RESAMPLES, seed=SEED, confidence=CONFIDENCE):
+    """Intervals and permutation tests for ``frame[column]`` by ``Category``.
+
+    Rows without a category or a value (e.g. no population for per-100k
+    deaths) are left out.
+    """
+    values = frame[column].to_numpy(dtype='float64')
+    categories = pd.Categorical(frame['Category'])
+    labels = categories.codes
+    known = (labels >= 0) & ~np.isnan(values)
+    values, labels = values[known], labels[known].astype(np.intp)
+    names = list(categories.categories)
+    rng = np.random.default_rng(seed)
+
+    intervals = pd.DataFrame(
+        [bootstrap_intervals(values[labels == group], rng, resamples, confidence) for group in range(len(names))],
+        index=pd.Index(names, name='Category'),
+        columns=['Mean_Low', 'Mean_High', 'Median_Low', 'Median_High'],
+    )
+
+    # Values grouped by category, so the observed labelling is one row of blocks
+    order = np.argsort(labels, kind='stable')
+    values, labels = values[order], labels[order]
+    counts = np.bincount(labels, minlength=len(names))
+    present = np.flatnonzero(counts)
+
+    # Overall: spread of the category means around the grand mean (the
+    # one-way ANOVA numerator; the total sum of squares is fixed under shuffling)
+    def spread(means):
+        return (counts[present] * (means[:, present] - values.mean()) ** 2).sum(axis=1)
+
+    if len(present) > 1:
+        null_means, _ = permutation_null(values, counts, rng, resamples)
+        observed_means, _ = block_stats(values[None, :], counts)
+        overall_p = p_value(spread(null_means), spread(observed_means)[0])
+    else:
+        overall_p = np.nan
+
+    # Pairs: reassign values between the two categories only
+    rows = []
+    for first, second in combinations(present, 2):
+        pair = values[(labels == first) | (labels == second)]
+        sizes = counts[[first, second]]
+        null_means, null_medians = permutation_null(pair, sizes, rng, resamples)
+        observed_means, observed_medians = block_stats(pair[None, :], sizes)
+        mean_difference = observed_means[0, 0] - observed_means[0, 1]
+        median_difference = observed_medians[0, 0] - observed_medians[0, 1]
+        rows.append({
+            'Comparison': f'{names[first].split()[0]} vs {names[second].split()[0]}',
+            'Mean_Difference': mean_difference,
+            'Mean_P': p_value(null_means[:, 0] - null_means[:, 1], mean_difference),
+            'Median_Difference': median_difference,
+            'Median_P': p_value(null_medians[:, 0] - null_medians[:, 1], median_difference),
+        })
+    pairs = pd.DataFrame(rows, columns=['Comparison', 'Mean_Difference', 'Mean_P',
+                                        'Median_Difference', 'Median_P']).set_index('Comparison')
+
+    return CategoryInference(intervals, pairs, overall_p, resamples, confidence)
+
+
+@versions.derived
+@st.cache_resource(max_entries=16, show_spinner='Resampling category statistics...')
+def _cached_inference(fingerprint, column, resamples, seed, _frame):
+    with tracing.span('inference.category', column=column, resamples=resamples):
+        return category_inference(_frame, column, resamples, seed)
+
+
+def get_category_inference(dataset, metric, resamples=RESAMPLES, seed=SEED):
+    """Return the shared :class:`CategoryInference` for ``dataset.merged_data``.
+
+    ``dataset`` must be the full dataset, not one restricted to a date window
+    (see :func:`dashboard.aggregates.get_window`): that shares the
+    fingerprint, so its result would be cached for the full period.
+    """
+    return _cached_inference(dataset.fingerprint, metric.column, resamples, seed, dataset.merged_data)
@@ -0,0 +1,47 @@
+"""The dashboard's dataset as every page sees it.
+
+Loaded once per process (memory-mapped columnar cache, CSV fallback - see
+:mod:`dashboard.store`), with the adoption categories and per-100k columns
+added, and shared read-only by all sessions and by the warm-up. A newer
+version replaces it only as a whole (see :mod:`dashboard.reload`), so a
+rerun that called :func:`load_data` keeps one consistent version.
+"""
+import threading
+
+from dashboard import categories, normalize, store, tracing
+
+_lock = threading.Lock()
+_current = None
+
+
+def build_dataset(data_dir=None):
+    """Load the source tables and add the derived columns; returns a read-only :class:`store.Dataset`."""
+    with tracing.span('load_data.build'):
+        dataset = store.load_dataset(data_dir)
+        # Adoption categories are binned once here; pages read the 'Category' column
+        dataset.merged_data['Category'] = categories.classify_adoption(dataset.merged_data['Vaccine_Intro_Date'])
+        # Population join: adds Population and Deaths_per_100k columns
+        dataset = normalize.add_per_100k(dataset)
+    # Read-only from here on: pages derive views, never write in place
+    return dataset._replace(**{name: store.freeze(getattr(dataset, name)) for name in store.SOURCES})
+
+
+def load_data():
+    """Return the current dataset version, loading it on first use.
+
+    One instance per process, shared by every session and rerun (``st.cache_data``
+    would unpickle a copy each time).
+    """
+    global _current
+    with _lock:
+        if _current is None:
+            _current = build_dataset()
+        return _current
+
+
+def swap(dataset):
+    """Make ``dataset`` the current version; returns the one it replaces (None before the first load)."""
+    global _current
+    with _lock:
+        previous, _current = _current, dataset
+    return previous
@@ -0,0 +1,76 @@
+"""Thread-safe LRU cache bounded by entry count and total payload size."""
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Least-recently-used mapping of hashable keys to sized values.
+
+    Values are usually ``bytes``/``str``; their ``len`` counts towards
+    ``max_bytes`` unless an explicit size is given to :meth:`put`.
+    """
+
+    def __init__(self, max_entries=128, max_bytes=64 * 2**20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value, _ = self._items[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, size=None):
+        size = len(value) if size is None else size
+        with self._lock:
+            if key in self._items:
+                self._bytes -= self._items.pop(key)[1]
+            if size > self.max_bytes:
+                # Never cache a single value larger than the whole budget
+                return
+            self._items[key] = (value, size)
+            self._bytes += size
+            while len(self._items) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self._bytes -= evicted
+
+    def get_or_create(self, key, factory):
+        """Return the cached value for ``key``, calling ``factory()`` on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def discard(self, predicate):
+        """Drop every entry whose key satisfies ``predicate``; return how many went."""
+        with self._lock:
+            doomed = [key for key in self._items if predicate(key)]
+            for key in doomed:
+                self._bytes -= self._items.pop(key)[1]
+        return len(doomed)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
@@ -0,0 +1,163 @@
+"""Nearest-neighbour matching of countries for controlled comparisons.
+
+Each country is paired with the most similar country that introduced
+vaccines at a clearly different time: same ``Who_region`` and ``Wb_income``
+(exact match), closest pre-vaccine death trajectory (nearest neighbour),
+and introduction dates at least ``MIN_GAP_DAYS`` apart.
+
+The trajectory is described by standardized features from the monthly
+:class:`~dashboard.timeseries.DeathMatrix` up to ``PRE_VACCINE_END``: the
+log of cumulative deaths per 100k, and the share of those deaths falling in
+each month (the shape of the early waves, weighted to count as one feature
+in total). Distances are computed per region/income block as a
+``(chunk, block)`` matrix with ``|a|^2 + |b|^2 - 2ab``, so the only Python
+loops are over blocks and row chunks, and memory is bounded by
+``MAX_CELLS`` however many sub-national units a block holds.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dashboard import normalize, store, tracing, versions
+from dashboard.index import group_positions
+from dashboard.timeseries import DeathMatrix
+
+# Pre-vaccine period: months before the first large-scale introductions
+PRE_VACCINE_END = '2020-12-01'
+# Matched countries must introduce vaccines at least this far apart
+MIN_GAP_DAYS = 60
+BLOCK_COLUMNS = ('Who_region', 'Wb_income')
+
+# Largest (chunk x block) distance matrix held at once (float64: 32 MB)
+MAX_CELLS = 4_000_000
+
+
+def trajectory_features(deaths_matrix, population, end=PRE_VACCINE_END):
+    """Standardized trajectory features, one row per ``deaths_matrix`` country.
+
+    ``population`` is aligned with ``deaths_matrix.countries``; rows without
+    a population are NaN.
+    """
+    pre = deaths_matrix.values[:, deaths_matrix.dates < pd.Timestamp(end)]
+    totals = pre.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        level = np.log1p(totals / population * normalize.PER)
+        shape = np.where(totals[:, None] > 0, pre / totals[:, None], 0.0)
+
+    features = np.column_stack([level, shape])
+    known = ~np.isnan(level)
+    mean = features[known].mean(axis=0) if known.any() else 0.0
+    std = features[known].std(axis=0) if known.any() else 1.0
+    features = (features - mean) / np.where(std > 0, std, 1.0)
+    # The monthly shares together weigh as much as the level
+    features[:, 1:] /= np.sqrt(max(shape.shape[1], 1))
+    features[~known] = np.nan
+    return features
+
+
+def nearest_eligible(features, days, min_gap=MIN_GAP_DAYS):
+    """For each row, the closest row with ``|days - days[row]| >= min_gap``.
+
+    Returns ``(neighbour, distance)``; rows without an eligible neighbour get
+    -1 and ``inf``.
+    """
+    n = len(features)
+    neighbour = np.full(n, -1, dtype=np.intp)
+    distance = np.full(n, np.inf)
+    if n < 2:
+        return neighbour, distance
+    squares = (features ** 2).sum(axis=1)
+    step = max(1, MAX_CELLS // n)
+    for lo in range(0, n, step):
+        rows = slice(lo, lo + step)
+        cells = squares[rows, None] + squares[None, :] - 2 * features[rows] @ features.T
+        cells[np.abs(days[rows, None] - days[None, :]) < min_gap] = np.inf
+        best = cells.argmin(axis=1)
+        found = np.take_along_axis(cells, best[:, None], axis=1)[:, 0]
+        ok = np.isfinite(found)
+        neighbour[rows] = np.where(ok, best, -1)
+        distance[rows] = np.sqrt(np.maximum(found, 0.0))
+    return neighbour, distance
+
+
+def match_countries(frame, deaths_matrix, min_gap=MIN_GAP_DAYS, end=PRE_VACCINE_END):
+    """Matched pairs of ``frame`` rows (``merged_data`` with ``Population``).
+
+    Returns one row per distinct pair, closest first: ``Who_region``,
+    ``Wb_income``, ``Distance`` and ``Gap_Days``, then for the earlier
+    (``Early_``) and later (``Later_``) adopter: ``Country_code``,
+    ``Country``, ``Intro``, ``Population``, ``Pre`` (deaths before
+    ``end``), ``Gap`` (deaths between the two introductions) and ``After``
+    (deaths since the earlier introduction).
+    """
+    codes = frame['Country_code'].astype(str).to_numpy()
+    rows = deaths_matrix.countries.astype(str).get_indexer(codes)
+    # Countries without time-series rows get an all-zero row
+    values = np.vstack([deaths_matrix.values, np.zeros((1, deaths_matrix.values.shape[1]))])[rows]
+    population = frame['Population'].to_numpy(dtype='float64')
+    matrix = DeathMatrix(codes, deaths_matrix.dates, values, deaths_matrix.unit)
+    features = trajectory_features(matrix, population, end)
+
+    intro = frame['Vaccine_Intro_Date'].to_numpy(dtype='datetime64[D]')
+    days = intro.astype('int64')
+    usable = ~np.isnan(features).any(axis=1) & ~np.isnat(intro)
+    # Region/income block of each row; NaN (no block) for missing values and unusable rows
+    blocks = frame.groupby(list(BLOCK_COLUMNS), observed=True, sort=False).ngroup().to_numpy(dtype='float64')
+    blocks[(blocks < 0) | ~usable] = np.nan
+
+    first, second, distance = [], [], []
+    for members in group_positions(blocks).values():
+        neighbour, dist = nearest_eligible(features[members], days[members], min_gap)
+        found = neighbour >= 0
+        first.append(members[found])
+        second.append(members[neighbour[found]])
+        distance.append(dist[found])
+    first, second = np.concatenate(first or [[]]).astype(np.intp), np.concatenate(second or [[]]).astype(np.intp)
+    distance = np.concatenate(distance or [[]])
+
+    # Earlier adopter first; each pair once, however many countries chose it
+    early = np.where(days[first] <= days[second], first, second)
+    later = np.where(days[first] <= days[second], second, first)
+    _, unique = np.unique(early * len(frame) + later, return_index=True)
+    early, later, distance = early[unique], later[unique], distance[unique]
+
+    # Deaths over each pair's own windows, from prefix sums along the date axis
+    prefix = np.concatenate([np.zeros((len(values), 1)), matrix.cumulative()], axis=1)
+    dates = matrix.dates.values
+    start = np.searchsorted(dates, intro[early].astype('datetime64[ns]'), side='left')
+    stop = np.searchsorted(dates, intro[later].astype('datetime64[ns]'), side='left')
+    cutoff = np.searchsorted(dates, np.datetime64(end, 'ns'), side='left')
+
+    pairs = {
+        'Who_region': frame['Who_region'].to_numpy()[early],
+        'Wb_income': frame['Wb_income'].to_numpy()[early],
+        'Distance': distance,
+        'Gap_Days': days[later] - days[early],
+    }
+    for prefix_name, side in (('Early', early), ('Later', later)):
+        pairs.update({
+            f'{prefix_name}_Country_code': codes[side],
+            f'{prefix_name}_Country': frame['Country'].astype(str).to_numpy()[side],
+            f'{prefix_name}_Intro': intro[side],
+            f'{prefix_name}_Population': population[side],
+            f'{prefix_name}_Pre': prefix[side, cutoff],
+            f'{prefix_name}_Gap': prefix[side, stop] - prefix[side, start],
+            f'{prefix_name}_After': prefix[side, -1] - prefix[side, start],
+        })
+    return pd.DataFrame(pairs).sort_values('Distance', kind='stable').reset_index(drop=True)
+
+
+@versions.derived
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _cached_matches(fingerprint, _frame, _deaths_matrix):
+    with tracing.span('matching.pairs'):
+        return store.freeze(match_countries(_frame, _deaths_matrix))
+
+
+def get_matches(dataset, deaths_matrix):
+    """Return the shared matched pairs for ``dataset``; treat them as read-only.
+
+    Only static columns of ``merged_data`` are used, so a windowed dataset
+    shares the result of the full one.
+    """
+    return _cached_matches(dataset.fingerprint, dataset.merged_data, deaths_matrix)
@@ -0,0 +1,61 @@
+"""Population-normalized death metrics.
+
+``covid_population.csv`` (2020 mid-year population, keyed on
+``Country_code``) is joined onto ``merged_data`` and ``time_series`` once per
+dataset load, adding ``Population`` and ``Deaths_per_100k`` columns. Pages
+then pick a :class:`Metric` and read its column, so switching between
+absolute and per-100k values never recomputes anything on a rerun.
+"""
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+PER = 100_000
+
+
+class Metric(NamedTuple):
+    column: str
+    label: str
+    # Format spec for values, valid both in Python f-strings and Plotly hovers
+    number_format: str
+
+
+ABSOLUTE = Metric('Total_Deaths', 'Total Deaths', ',.0f')
+PER_100K = Metric('Deaths_per_100k', 'Deaths per 100k', ',.1f')
+
+# Sidebar label -> metric
+METRICS = {
+    'Absolute': ABSOLUTE,
+    'Per 100k': PER_100K,
+}
+
+
+def population_for(population, codes):
+    """Population for each entry of ``codes`` (NaN where the table has no row).
+
+    A single hash lookup per distinct code: categorical codes are resolved
+    through their categories and expanded with a take.
+    """
+    lookup = pd.Index(population['Country_code'].astype(str))
+    values = np.append(population['Population'].to_numpy(dtype='float64'), np.nan)
+    if isinstance(codes.dtype, pd.CategoricalDtype):
+        positions = lookup.get_indexer(codes.cat.categories.astype(str))
+        positions = np.append(positions, -1)[codes.cat.codes.to_numpy()]
+    else:
+        positions = lookup.get_indexer(codes.astype(str))
+    # -1 (missing) picks the trailing NaN
+    return values[positions]
+
+
+def add_per_100k(dataset):
+    """Add ``Population`` and ``Deaths_per_100k`` to the dataset's frames in place."""
+    merged_data, time_series = dataset.merged_data, dataset.time_series
+
+    population = population_for(dataset.population, merged_data['Country_code'])
+    merged_data['Population'] = population
+    merged_data['Deaths_per_100k'] = merged_data['Total_Deaths'].to_numpy() / population * PER
+
+    population = population_for(dataset.population, time_series['Country_code'])
+    time_series['Deaths_per_100k'] = time_series['Deaths'].to_numpy() / population * PER
+    return dataset
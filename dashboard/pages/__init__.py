@@ -0,0 +1,67 @@
+"""Page registry for the dashboard.
+
+Each page is a module in this package exposing ``render(ctx)``, where ``ctx``
+is the shared :class:`PageContext`. Modules are imported on first use, and
+plotting backends (matplotlib, seaborn, plotly.express) are imported inside
+the functions that build figures, so a page only pays for the libraries it
+actually draws with, and only on a figure-cache miss.
+"""
+import importlib
+from typing import NamedTuple
+
+from dashboard import tracing
+from dashboard.aggregates import Aggregates
+from dashboard.index import CountryIndex
+from dashboard.normalize import Metric
+from dashboard.store import Dataset
+
+
+class PageContext(NamedTuple):
+    """Shared, read-only state handed to every page."""
+    dataset: Dataset
+    aggs: Aggregates
+    # Death measure selected in the sidebar; ``aggs`` were computed for it
+    metric: Metric
+    # Keyed lookups into ``dataset.merged_data``
+    index: CountryIndex
+    # Highlighted countries, ``{Country_code: label}`` in display order
+    focus: dict
+    # ``(start, end)`` dates when deaths are restricted to a window, else None;
+    # ``dataset.merged_data`` and the per-country ``aggs`` tables then hold
+    # the windowed totals
+    window: tuple = None
+    # The dataset before windowing, for results computed on the full period
+    # only (None when ``window`` is None: ``dataset`` is the full one)
+    full_dataset: Dataset = None
+
+
+class Page(NamedTuple):
+    title: str
+    module: str
+
+
+# Sidebar order
+PAGES = (
+    Page("Executive Summary", "executive_summary"),
+    Page("The Crisis", "crisis"),
+    Page("The Solution", "solution"),
+    Page("The Timeline", "timeline"),
+    Page("The Evidence", "evidence"),
+    Page("Matched Comparisons", "comparisons"),
+    Page("Recommendations", "recommendations"),
+    Page("Explore", "explore"),
+)
+
+PAGE_TITLES = [p.title for p in PAGES]
+
+_BY_TITLE = {p.title: p for p in PAGES}
+
+
+def load_page(title):
+    """Import (once per process) and return the module that renders ``title``."""
+    return importlib.import_module(f'{__name__}.{_BY_TITLE[title].module}')
+
+
+def render(title, ctx):
+    with tracing.span('page.render', page=title):
+        load_page(title).render(ctx)
@@ -0,0 +1,159 @@
+"""Matched Comparisons: similar countries with different vaccine timing."""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from dashboard import matching, normalize, plotly_cache, tracing
+from dashboard.theme import COLORS
+
+# Pairs drawn in the chart, closest first; the table lists all of them
+CHART_PAIRS = 25
+ALL_REGIONS = 'All regions'
+
+
+def outcome(pairs, side, window, metric):
+    """Deaths of the ``side`` ('Early' or 'Later') countries over ``window``, in ``metric`` units."""
+    deaths = pairs[f'{side}_{window}'].to_numpy()
+    if metric == normalize.PER_100K:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return deaths / pairs[f'{side}_Population'].to_numpy() * normalize.PER
+    return deaths
+
+
+def render(ctx):
+    dataset, metric = ctx.dataset, ctx.metric
+
+    st.markdown('<h1 class="main-header">Controlled Comparisons</h1>', unsafe_allow_html=True)
+    st.markdown('<p class="byline">Similar Countries, Different Timing</p>', unsafe_allow_html=True)
+
+    st.markdown(f"""
+    <p class="lead-text">
+        Each country is paired with its closest match in the same WHO region and income group, with a
+        similar death trajectory before vaccines arrived, but an introduction date at least
+        {matching.MIN_GAP_DAYS} days apart. Within a pair, the earlier adopter had vaccines while the
+        other did not yet.
+    </p>
+    """, unsafe_allow_html=True)
+
+    with tracing.span('matching'):
+        all_pairs = matching.get_matches(dataset, ctx.aggs.deaths_matrix)
+
+    regions = sorted(all_pairs['Who_region'].astype(str).unique())
+    region = st.selectbox("WHO region", [ALL_REGIONS] + regions)
+    pairs = all_pairs if region == ALL_REGIONS else all_pairs[all_pairs['Who_region'].astype(str) == region]
+
+    early_gap = outcome(pairs, 'Early', 'Gap', metric)
+    later_gap = outcome(pairs, 'Later', 'Gap', metric)
+    compared = ~np.isnan(early_gap) & ~np.isnan(later_gap)
+    lower = np.count_nonzero(early_gap[compared] < later_gap[compared])
+
+    col1, col2, col3 = st.columns(3)
+    cards = (
+        (col1, 'Matched Pairs', f'{len(pairs):,}'),
+        (col2, 'Median Gap', f'{pairs["Gap_Days"].median():.0f} days' if len(pairs) else '–'),
+        (col3, 'Earlier Adopter Lower', f'{lower / compared.sum():.0%}' if compared.any() else '–'),
+    )
+    for col, label, value in cards:
+        with col:
+            st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-label">{label}</div>
+                <div class="metric-value">{value}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+    # Closest pairs: deaths between the two introduction dates
+    st.markdown(f'<h2 class="sub-header">{metric.label} Between Introductions</h2>', unsafe_allow_html=True)
+
+    def build_pairs_chart():
+        shown = pairs.head(CHART_PAIRS).iloc[::-1]
+        labels = (shown['Early_Country_code'].astype(str) + ' vs ' + shown['Later_Country_code'].astype(str)).tolist()
+        early = outcome(shown, 'Early', 'Gap', metric)
+        later = outcome(shown, 'Later', 'Gap', metric)
+
+        fig = go.Figure()
+        # Connectors: one trace with NaN breaks between pairs
+        fig.add_trace(go.Scatter(
+            x=np.column_stack([early, later, np.full(len(shown), np.nan)]).ravel(),
+            y=np.repeat(labels, 3),
+            mode='lines', line=dict(color=COLORS['light'], width=3),
+            hoverinfo='skip', showlegend=False
+        ))
+        for side, values, color, name in (('Early', early, COLORS['early'], 'Earlier adopter'),
+                                          ('Later', later, COLORS['late'], 'Later adopter')):
+            fig.add_trace(go.Scatter(
+                x=values, y=labels, mode='markers', name=name,
+                marker=dict(size=11, color=color, line=dict(width=1, color='#fff')),
+                customdata=np.column_stack([shown[f'{side}_Country'].astype(str),
+                                            shown[f'{side}_Intro'].dt.strftime('%b %d, %Y'),
+                                            shown['Gap_Days']]),
+                hovertemplate=('%{customdata[0]}<br>Introduced %{customdata[1]}<br>'
+                               '%{x:' + metric.number_format + '} over %{customdata[2]} days<extra></extra>')
+            ))
+        fig.update_layout(
+            height=max(360, 24 * len(shown) + 120),
+            font=dict(family='IBM Plex Sans', size=12),
+            paper_bgcolor='#fff',
+            plot_bgcolor='#FAFAF8',
+            xaxis=dict(title=metric.label, gridcolor='#e0e0e0', tickfont=dict(size=11)),
+            yaxis=dict(tickfont=dict(size=11, family='IBM Plex Mono')),
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0, font=dict(size=11)),
+            margin=dict(l=0, r=20, t=50, b=40)
+        )
+        return fig
+
+    fig = plotly_cache.cached_figure(('comparisons.pairs', dataset.fingerprint, metric.column, region),
+                                     build_pairs_chart)
+    with tracing.span('st.plotly_chart'):
+        st.plotly_chart(fig, width='stretch')
+
+    # Pairs involving the focus countries
+    focus_pairs = [(label, pairs[(pairs['Early_Country_code'] == code) | (pairs['Later_Country_code'] == code)])
+                   for code, label in ctx.focus.items()]
+    focus_pairs = [(label, matched) for label, matched in focus_pairs if len(matched)]
+    if focus_pairs:
+        st.markdown('<h2 class="sub-header">Focus Countries</h2>', unsafe_allow_html=True)
+        for label, matched in focus_pairs:
+            early = outcome(matched, 'Early', 'Gap', metric)
+            later = outcome(matched, 'Later', 'Gap', metric)
+            lines = ''.join(
+                f"{row.Early_Country} ({row.Early_Intro:%b %d, %Y}): "
+                f"<span style='font-family: IBM Plex Mono;'>{early_value:{metric.number_format}}</span> vs "
+                f"{row.Later_Country} ({row.Later_Intro:%b %d, %Y}): "
+                f"<span style='font-family: IBM Plex Mono;'>{later_value:{metric.number_format}}</span><br>"
+                for row, early_value, later_value in zip(matched.itertuples(), early, later)
+            )
+            st.markdown(f"""
+            <div style='padding: 16px 20px; margin: 10px 0; background: #fff; border: 1px solid #e0e0e0;'>
+                <div style='font-weight: 600; margin-bottom: 8px;'>{label}</div>
+                <div style='font-size: 0.95rem; color: #555; line-height: 1.7;'>{lines}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+    # Every pair in the selection
+    st.markdown('<h2 class="sub-header">All Matched Pairs</h2>', unsafe_allow_html=True)
+    table = pd.DataFrame({
+        'Earlier adopter': pairs['Early_Country'],
+        'Later adopter': pairs['Later_Country'],
+        'Gap (days)': pairs['Gap_Days'],
+        f'Earlier: {metric.label} between': outcome(pairs, 'Early', 'Gap', metric),
+        f'Later: {metric.label} between': outcome(pairs, 'Later', 'Gap', metric),
+        f'Earlier: {metric.label} since': outcome(pairs, 'Early', 'After', metric),
+        f'Later: {metric.label} since': outcome(pairs, 'Later', 'After', metric),
+        'Distance': pairs['Distance'],
+    })
+    st.dataframe(table, width='stretch', hide_index=True,
+                 column_config={column: st.column_config.NumberColumn(format='%.1f')
+                                for column in table.columns[3:]})
+
+    st.markdown("""
+    <div class="insight-box">
+        <div class="insight-label">How to Read This</div>
+        <p>"Between" counts deaths from the earlier to the later introduction date, the period when only
+        one country of the pair had vaccines; "since" counts everything after the earlier introduction.
+        Distance measures how different the two pre-vaccine trajectories were (0 is identical). Matching
+        removes region, income and early-wave differences, but not every confounder: testing, reporting
+        and later variants still differ within pairs.</p>
+    </div>
+    """, unsafe_allow_html=True)
@@ -0,0 +1,154 @@
+"""The Crisis: death toll by country and demographic vulnerability."""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from dashboard import figures, plotly_cache, tracing
+from dashboard.theme import COLORS, focus_colors
+
+
+def render(ctx):
+    dataset, aggs, metric = ctx.dataset, ctx.aggs, ctx.metric
+
+    st.markdown('<h1 class="main-header">Understanding the Impact</h1>', unsafe_allow_html=True)
+    st.markdown('<p class="byline">COVID-19 Mortality Patterns</p>', unsafe_allow_html=True)
+    
+    st.markdown("""
+    <p class="lead-text">
+        Before vaccines arrived, COVID-19 devastated populations worldwide. Understanding who was 
+        affected—and where—is essential context for evaluating vaccination strategies.
+    </p>
+    """, unsafe_allow_html=True)
+    
+    # Total deaths by country
+    st.markdown('<h2 class="sub-header">Global Death Toll by Country</h2>', unsafe_allow_html=True)
+    
+    top_20_deaths = aggs.top_20_deaths
+    colors = focus_colors(ctx.focus)
+    
+    def build_top_20_chart():
+        # Base figure: every bar muted; focus colors are applied per rerun below
+        fig = go.Figure()
+        fig.add_trace(go.Bar(
+            x=top_20_deaths[metric.column],
+            y=top_20_deaths['Country'],
+            orientation='h',
+            marker_color=COLORS['muted'],
+            text=top_20_deaths[metric.column].apply(lambda x: f'{x:{metric.number_format}}'),
+            textposition='outside',
+            textfont=dict(family='IBM Plex Mono', size=12, color='#555'),
+            showlegend=False
+        ))
+    
+        fig.update_layout(
+            xaxis_title=metric.label,
+            yaxis_title=None,
+            height=580,
+            font=dict(family='IBM Plex Sans', size=12),
+            paper_bgcolor='#fff',
+            plot_bgcolor='#FAFAF8',
+            xaxis=dict(gridcolor='#e0e0e0', showline=True, linecolor='#e0e0e0'),
+            yaxis=dict(showline=False, tickfont=dict(size=12)),
+            margin=dict(l=0, r=60, t=20, b=40),
+            showlegend=False
+        )
+        return fig
+
+    def color_focus_bars(spec):
+        # Color array highlighting the focus countries that made the top 20
+        bar_colors = np.full(len(top_20_deaths), COLORS['muted'], dtype=object)
+        positions = pd.Index(top_20_deaths['Country_code'].astype(str)).get_indexer(list(colors))
+        found = positions >= 0
+        bar_colors[positions[found]] = np.array(list(colors.values()), dtype=object)[found]
+        spec['data'][0]['marker']['color'] = bar_colors.tolist()
+
+    fig = plotly_cache.cached_figure(('crisis.top_20', dataset.fingerprint, metric.column, ctx.window), build_top_20_chart,
+                                     restyle=color_focus_bars)
+    with tracing.span('st.plotly_chart'):
+        st.plotly_chart(fig, width='stretch')
+    
+    # Legend for highlighted countries
+    focus_items = ''.join(f"""
+        <div style='display: flex; align-items: center; gap: 8px;'>
+            <div style='width: 16px; height: 16px; background: {colors[code]}; border-radius: 2px;'></div>
+            <span>{label}</span>
+        </div>""" for code, label in ctx.focus.items())
+    st.markdown(f"""
+    <div style='display: flex; flex-wrap: wrap; gap: 32px; margin-bottom: 20px; font-size: 0.9rem;'>{focus_items}
+        <div style='display: flex; align-items: center; gap: 8px;'>
+            <div style='width: 16px; height: 16px; background: {COLORS['muted']}; border-radius: 2px;'></div>
+            <span>Other countries</span>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown("""
+    <div class="insight-box">
+        <div class="insight-label">Key Finding</div>
+        <p>The United States recorded over 1.2 million deaths, followed by Brazil with 289,000 and Mexico with 279,000. 
+        These three countries alone account for a significant portion of global COVID-19 mortality, 
+        though population size is a major factor in absolute numbers.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Deaths by age group
+    st.markdown('<h2 class="sub-header">Demographic Vulnerability</h2>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        age_totals = aggs.age_totals
+        
+        def build_age_chart():
+            import matplotlib
+            from matplotlib.figure import Figure
+
+            fig = Figure(figsize=(10, 6.5))
+            ax = fig.subplots()
+        
+            # Use a refined color gradient with more contrast
+            n_bars = len(age_totals)
+            colors = matplotlib.colormaps['Blues'](np.linspace(0.35, 0.85, n_bars))[::-1]
+        
+            bars = ax.barh(age_totals['Agegroup'], age_totals['Deaths'], color=colors)
+        
+            for i, (deaths, pct) in enumerate(zip(age_totals['Deaths'], age_totals['Percentage'])):
+                ax.text(deaths + age_totals['Deaths'].max() * 0.02, i,
+                       f'{deaths:,.0f} ({pct}%)',
+                       va='center', fontsize=11, fontfamily='monospace', color='#444')
+        
+            ax.set_xlabel('Total Deaths', fontsize=12, fontfamily='sans-serif', color='#555')
+            ax.set_ylabel('')
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+            ax.spines['bottom'].set_color('#e0e0e0')
+            ax.spines['left'].set_visible(False)
+            ax.tick_params(colors='#555', labelsize=11)
+            ax.set_facecolor('#FAFAF8')
+            fig.patch.set_facecolor('#fff')
+            fig.tight_layout()
+            return fig
+
+        image = figures.cached_figure(('crisis.age_totals', dataset.fingerprint), build_age_chart)
+        with tracing.span('st.image'):
+            st.image(image, width='stretch')
+    
+    with col2:
+        st.markdown("""
+        <div class="insight-box" style="margin-top: 0;">
+            <div class="insight-label">Critical Pattern</div>
+            <p>The elderly population (65+) bore a disproportionate mortality burden. 
+            This demographic reality shaped vaccination prioritization strategies globally.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Top 3 age groups summary
+        for i, (_, row) in enumerate(age_totals.head(3).iterrows()):
+            st.markdown(f"""
+            <div style='padding: 12px 16px; background: #fff; border: 1px solid #e0e0e0; margin-bottom: 8px;'>
+                <div style='font-family: IBM Plex Mono; font-size: 0.8rem; color: #888;'>#{i+1}</div>
+                <div style='font-weight: 600; margin: 4px 0;'>{row['Agegroup']}</div>
+                <div style='font-family: IBM Plex Mono; color: #1e3a5f;'>{row['Percentage']}% of deaths</div>
+            </div>
+            """, unsafe_allow_html=True)
@@ -0,0 +1,407 @@
+"""The Evidence: vaccine timing against mortality outcomes."""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from dashboard import categories, figures, highlight, inference, plotly_cache, tracing
+from dashboard.theme import CATEGORY_COLORS, COLORS, focus_colors
+
+
+def render(ctx):
+    dataset, aggs, metric = ctx.dataset, ctx.aggs, ctx.metric
+    merged_data = dataset.merged_data
+
+    st.markdown('<h1 class="main-header">Analyzing the Relationship</h1>', unsafe_allow_html=True)
+    st.markdown('<p class="byline">Vaccine Timing and Mortality Outcomes</p>', unsafe_allow_html=True)
+    
+    st.markdown("""
+    <p class="lead-text">
+        The central question: Did countries that adopted vaccines earlier experience fewer deaths? 
+        The answer is more nuanced than a simple correlation might suggest.
+    </p>
+    """, unsafe_allow_html=True)
+    
+    # Main scatter plot
+    st.markdown(f'<h2 class="sub-header">Timing vs. {metric.label}</h2>', unsafe_allow_html=True)
+    
+    # Identify success stories: early adopters with relatively low deaths
+    death_threshold = aggs.death_threshold  # Bottom 25% of early adopters
+    
+    colors = focus_colors(ctx.focus)
+
+    hover = '<br>Deaths: %{y:' + metric.number_format + '}<br>Date: %{x|%b %d, %Y}<extra></extra>'
+
+    def base_groups():
+        # Row positions per highlight class without any focus countries; those
+        # are moved into traces of their own per rerun by add_focus_traces
+        return highlight.highlight_groups(ctx.index, death_threshold, {}, deaths=metric.column, frame=merged_data)
+
+    def build_scatter():
+        groups = base_groups()
+    
+        # Custom scatter plot with highlighting
+        fig = go.Figure()
+    
+        # Plot "Other" countries first (background, muted)
+        other_data = merged_data.iloc[groups[highlight.OTHER]]
+        fig.add_trace(go.Scatter(
+            x=other_data['Vaccine_Intro_Date'],
+            y=other_data[metric.column],
+            mode='markers',
+            name='Other countries',
+            marker=dict(
+                size=highlight.marker_sizes(other_data[metric.column]),
+                color=COLORS['muted'],
+                opacity=0.5,
+                line=dict(width=1, color='#fff')
+            ),
+            text=other_data['Country'],
+            hovertemplate='<b>%{text}</b>' + hover
+        ))
+    
+        # Plot success stories (early adopters with low deaths)
+        success_data = merged_data.iloc[groups[highlight.SUCCESS]]
+        fig.add_trace(go.Scatter(
+            x=success_data['Vaccine_Intro_Date'],
+            y=success_data[metric.column],
+            mode='markers',
+            name='Early adopters, low mortality',
+            marker=dict(
+                size=12,
+                color=COLORS['success'],
+                symbol='diamond',
+                line=dict(width=2, color='#fff')
+            ),
+            text=success_data['Country'],
+            hovertemplate='<b>%{text}</b>' + hover
+        ))
+    
+        fig.update_layout(
+            xaxis_title='Vaccine Introduction Date',
+            yaxis_title=f'{metric.label} (log scale)',
+            yaxis_type="log",
+            height=600,
+            font=dict(family='IBM Plex Sans', size=12),
+            paper_bgcolor='#fff',
+            plot_bgcolor='#FAFAF8',
+            legend=dict(
+                title=dict(text=''),
+                orientation="h",
+                yanchor="bottom",
+                y=1.02,
+                xanchor="left",
+                x=0,
+                font=dict(size=11)
+            ),
+            xaxis=dict(gridcolor='#e0e0e0', tickfont=dict(size=11)),
+            yaxis=dict(gridcolor='#e0e0e0', tickfont=dict(size=11)),
+            margin=dict(l=0, r=20, t=50, b=40)
+        )
+        return fig
+
+    def add_focus_traces(spec):
+        # Styling layer: one labelled marker per focus country, taken out of
+        # the base trace (Other or success) that drew it
+        positions = ctx.index.positions(ctx.focus)
+        groups = base_groups()
+        for trace, label in zip(spec['data'], (highlight.OTHER, highlight.SUCCESS)):
+            # Group positions are sorted, so each focus country is one lookup
+            rows = groups[label]
+            points = np.searchsorted(rows, positions)
+            found = points < len(rows)
+            found[found] = rows[points[found]] == positions[found]
+            plotly_cache.drop_points(trace, points[found])
+
+        focus_data = merged_data.iloc[positions]
+        sizes = highlight.marker_sizes(focus_data[metric.column], smallest=22, largest=28)
+        dates = focus_data['Vaccine_Intro_Date'].dt.strftime('%Y-%m-%d')
+        for (code, label), date, value, size in zip(ctx.focus.items(), dates, focus_data[metric.column], sizes):
+            spec['data'].append({
+                'type': 'scatter',
+                'x': [date],
+                'y': [float(value)],
+                'mode': 'markers+text',
+                'name': label,
+                'marker': {'size': float(size), 'color': colors[code], 'symbol': 'circle',
+                           'line': {'width': 2, 'color': '#fff'}},
+                'text': [label],
+                'textposition': 'top center',
+                'textfont': {'size': 12, 'color': colors[code], 'family': 'IBM Plex Sans'},
+                'hovertemplate': f'<b>{label}</b>' + hover,
+            })
+
+    fig = plotly_cache.cached_figure(('evidence.scatter', dataset.fingerprint, metric.column, ctx.window), build_scatter,
+                                     restyle=add_focus_traces)
+    with tracing.span('st.plotly_chart'):
+        st.plotly_chart(fig, width='stretch')
+    
+    # Custom legend explanation: each focus country with its rank on the current metric
+    values = merged_data[metric.column].to_numpy()
+    focus_items = ''.join(f"""
+        <div style='display: flex; align-items: center; gap: 8px;'>
+            <div style='width: 18px; height: 18px; background: {colors[code]}; border-radius: 50%;'></div>
+            <span><strong>{label}</strong> — #{(values > values[ctx.index.position(code)]).sum() + 1} by {metric.label.lower()}</span>
+        </div>""" for code, label in ctx.focus.items())
+    st.markdown(f"""
+    <div style='display: flex; flex-wrap: wrap; gap: 24px; margin: 16px 0 24px 0; font-size: 0.95rem;'>{focus_items}
+        <div style='display: flex; align-items: center; gap: 8px;'>
+            <div style='width: 14px; height: 14px; background: {COLORS['success']}; transform: rotate(45deg);'></div>
+            <span style='margin-left: 4px;'><strong>Success cases</strong> — early adoption + low mortality</span>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown("""
+    <div class="insight-box">
+        <div class="insight-label">Important Context</div>
+        <p>The scatter reveals a complex picture: while USA and Mexico (both early adopters) show high death counts, 
+        this reflects population size and pandemic severity. The green diamonds highlight countries that achieved 
+        both early vaccine adoption AND relatively low mortality — these represent potential models for effective 
+        pandemic response strategies.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Statistics by category
+    st.markdown('<h2 class="sub-header">Mortality by Adoption Category</h2>', unsafe_allow_html=True)
+    
+    # Bootstrap intervals and permutation tests, cached per dataset and metric
+    # for the full period only; with a window they describe the full period
+    # and are not drawn around the windowed bars
+    full_period = ctx.window is None
+    with tracing.span('inference'):
+        tests = inference.get_category_inference(dataset if full_period else ctx.full_dataset, metric)
+    intervals = tests.intervals
+    confidence = f'{tests.confidence:.0%}'
+
+    col1, col2 = st.columns([3, 2])
+    
+    with col1:
+        category_stats = aggs.category_stats
+        # Error bar lengths below and above each bar (clipped: a skewed
+        # sample's point estimate can fall just outside its interval)
+        bounds = intervals.reindex(category_stats['Category'])
+
+        def error_bars(column):
+            if not full_period:
+                return None
+            point = category_stats[column].to_numpy()
+            return np.clip([point - bounds[f'{column}_Low'].to_numpy(),
+                            bounds[f'{column}_High'].to_numpy() - point], 0, None)
+
+        def label_tops(column):
+            point = category_stats[column].to_numpy()
+            return np.fmax(point, bounds[f'{column}_High'].to_numpy()) if full_period else point
+        
+        def build_category_chart():
+            from matplotlib.figure import Figure
+
+            fig = Figure(figsize=(11, 5))
+            ax1, ax2 = fig.subplots(1, 2)
+        
+            colors = [CATEGORY_COLORS[label] for label in category_stats['Category']]
+            ticks = [categories.short_label(label) for label in category_stats['Category']]
+            x_pos = np.arange(len(category_stats))
+        
+            # Mean deaths
+            bars1 = ax1.bar(x_pos, category_stats['Mean'], color=colors, width=0.6,
+                            yerr=error_bars('Mean'), ecolor='#555', capsize=6)
+            ax1.set_xticks(x_pos)
+            ax1.set_xticklabels(ticks, fontsize=12)
+            ax1.set_ylabel(f'Average {metric.label}', fontsize=12, color='#555')
+            ax1.set_title('Mean Deaths', fontsize=14, fontweight='500', fontfamily='sans-serif', pad=14)
+            ax1.spines['top'].set_visible(False)
+            ax1.spines['right'].set_visible(False)
+            ax1.spines['bottom'].set_color('#e0e0e0')
+            ax1.spines['left'].set_color('#e0e0e0')
+            ax1.set_facecolor('#FAFAF8')
+            ax1.tick_params(axis='y', labelsize=11)
+        
+            # Labels sit above the upper end of each interval
+            tops = label_tops('Mean')
+            for bar, top in zip(bars1, tops):
+                height = bar.get_height()
+                ax1.text(bar.get_x() + bar.get_width()/2., top + np.nanmax(tops) * 0.02,
+                        f'{height:{metric.number_format}}', ha='center', va='bottom',
+                        fontsize=11, fontfamily='monospace', color='#444')
+        
+            # Median deaths
+            bars2 = ax2.bar(x_pos, category_stats['Median'], color=colors, width=0.6,
+                            yerr=error_bars('Median'), ecolor='#555', capsize=6)
+            ax2.set_xticks(x_pos)
+            ax2.set_xticklabels(ticks, fontsize=12)
+            ax2.set_ylabel(f'Median {metric.label}', fontsize=12, color='#555')
+            ax2.set_title('Median Deaths', fontsize=14, fontweight='500', fontfamily='sans-serif', pad=14)
+            ax2.spines['top'].set_visible(False)
+            ax2.spines['right'].set_visible(False)
+            ax2.spines['bottom'].set_color('#e0e0e0')
+            ax2.spines['left'].set_color('#e0e0e0')
+            ax2.set_facecolor('#FAFAF8')
+            ax2.tick_params(axis='y', labelsize=11)
+        
+            # Labels sit above the upper end of each interval
+            tops = label_tops('Median')
+            for bar, top in zip(bars2, tops):
+                height = bar.get_height()
+                ax2.text(bar.get_x() + bar.get_width()/2., top + np.nanmax(tops) * 0.02,
+                        f'{height:{metric.number_format}}', ha='center', va='bottom',
+                        fontsize=11, fontfamily='monospace', color='#444')
+        
+            fig.patch.set_facecolor('#fff')
+            fig.tight_layout()
+            return fig
+
+        image = figures.cached_figure(('evidence.category_stats', dataset.fingerprint, metric.column, ctx.window),
+                                      build_category_chart)
+        with tracing.span('st.image'):
+            st.image(image, width='stretch')
+    
+    with col2:
+        for _, row in category_stats.iterrows():
+            color = CATEGORY_COLORS[row['Category']]
+            low_high = bounds.loc[row['Category']]
+            mean_ci = median_ci = ''
+            if full_period:
+                mean_ci = (f"<span style='font-size: 0.8rem; color: #888;'>({confidence} CI "
+                           f"{low_high['Mean_Low']:{metric.number_format}} – {low_high['Mean_High']:{metric.number_format}})</span>")
+                median_ci = (f"<span style='font-size: 0.8rem; color: #888;'>({confidence} CI "
+                             f"{low_high['Median_Low']:{metric.number_format}} – {low_high['Median_High']:{metric.number_format}})</span>")
+            st.markdown(f"""
+            <div style='padding: 20px; margin: 10px 0; background: #fff; 
+                        border-left: 4px solid {color}; border: 1px solid #e0e0e0;'>
+                <div style='font-weight: 600; color: {color}; font-size: 1rem;'>{row['Category']}</div>
+                <div style='margin-top: 10px; font-size: 0.95rem; color: #555; line-height: 1.7;'>
+                    <span style='font-family: IBM Plex Mono;'>{row['Count']:.0f}</span> countries<br>
+                    Mean: <span style='font-family: IBM Plex Mono;'>{row['Mean']:{metric.number_format}}</span>
+                    {mean_ci}<br>
+                    Median: <span style='font-family: IBM Plex Mono;'>{row['Median']:{metric.number_format}}</span>
+                    {median_ci}
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    st.markdown("""
+    <div class="insight-box" style="margin-top: 24px;">
+        <div class="insight-label">Statistical Nuance</div>
+        <p>Early adopters show higher mean deaths (skewed by large countries), but median values 
+        tell a different story. Population size, pandemic wave timing, and healthcare capacity 
+        are significant confounding factors.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Permutation tests: how often shuffling the category labels gives a gap this large
+    pairs = tests.pairs
+    table = pd.DataFrame({
+        'Mean difference': pairs['Mean_Difference'].map(lambda v: f'{v:{metric.number_format}}'),
+        'p (mean)': pairs['Mean_P'].map('{:.3f}'.format),
+        'Median difference': pairs['Median_Difference'].map(lambda v: f'{v:{metric.number_format}}'),
+        'p (median)': pairs['Median_P'].map('{:.3f}'.format),
+    })
+    if full_period:
+        scope = (f"Error bars and ranges are {confidence} bootstrap intervals from {tests.resamples:,} resamples of "
+                 f"each category's countries.")
+    else:
+        scope = ("These tests use each country's deaths over the full period, not the selected window, "
+                 "so the window's bars above are shown without intervals.")
+    st.markdown(f"""
+    <div class="insight-box">
+        <div class="insight-label">Are the Differences Real?</div>
+        <p>{scope} If adoption timing made no difference, shuffling the category labels
+        would produce gaps between category means at least as large as the observed ones with probability
+        <span style='font-family: IBM Plex Mono;'>p = {tests.overall_p:.3f}</span>; the table below repeats
+        the test for each pair. Small p-values say the gap is unlikely to be chance alone, not that timing
+        caused it.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    st.dataframe(table, width='stretch')
+
+    # Deaths before vs. after each country's vaccine introduction (from the monthly time series)
+    st.markdown('<h2 class="sub-header">Before and After Introduction</h2>', unsafe_allow_html=True)
+
+    def build_split_chart():
+        category_split = aggs.category_split
+        fig = go.Figure()
+        fig.add_trace(go.Bar(
+            x=category_split.index.astype(str),
+            y=category_split['Deaths_Before'],
+            name='Before vaccine introduction',
+            marker_color=COLORS['muted'],
+            hovertemplate='%{x}<br>Before: %{y:' + metric.number_format + '}<extra></extra>'
+        ))
+        fig.add_trace(go.Bar(
+            x=category_split.index.astype(str),
+            y=category_split['Deaths_After'],
+            name='After vaccine introduction',
+            marker_color=COLORS['primary'],
+            hovertemplate='%{x}<br>After: %{y:' + metric.number_format + '}<extra></extra>'
+        ))
+        fig.update_layout(
+            barmode='group',
+            yaxis_title=metric.label,
+            height=420,
+            font=dict(family='IBM Plex Sans', size=12),
+            paper_bgcolor='#fff',
+            plot_bgcolor='#FAFAF8',
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0, font=dict(size=11)),
+            xaxis=dict(tickfont=dict(size=11)),
+            yaxis=dict(gridcolor='#e0e0e0', tickfont=dict(size=11)),
+            margin=dict(l=0, r=20, t=50, b=40)
+        )
+        return fig
+
+    fig = plotly_cache.cached_figure(('evidence.category_split', dataset.fingerprint, metric.column), build_split_chart)
+    with tracing.span('st.plotly_chart'):
+        st.plotly_chart(fig, width='stretch')
+
+    st.markdown("""
+    <div class="insight-box">
+        <div class="insight-label">How to Read This</div>
+        <p>Monthly deaths are split at each country's vaccine introduction date, then summed by adoption
+        category. Months starting before the introduction date count as "before". Later waves,
+        reporting changes and the length of each period all shape these totals.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Regional heatmap
+    st.markdown('<h2 class="sub-header">Regional Patterns</h2>', unsafe_allow_html=True)
+
+    pivot_data = aggs.regional_pivot
+
+    def build_regional_heatmap():
+        import seaborn as sns
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=(10, 5.5))
+        ax = fig.subplots()
+        sns.heatmap(pivot_data, annot=False,
+                    cmap='Blues', cbar_kws={'label': f'Average {metric.label}'},
+                    linewidths=3, linecolor='#fff', ax=ax)
+
+        # Agregar texto manualmente sobre cada celda
+        # White text on the dark end of the color scale (seaborn spans the data's min to max)
+        low, high = np.nanmin(pivot_data.to_numpy()), np.nanmax(pivot_data.to_numpy())
+        dark = low + 0.6 * (high - low)
+        for i in range(len(pivot_data)):
+            for j in range(len(pivot_data.columns)):
+                value = pivot_data.iloc[i, j]
+                if not pd.isna(value):
+                    text_color = '#ffffff' if high > low and value > dark else '#1a1a1a'
+
+                    text = ax.text(j + 0.5, i + 0.5, f'{value:{metric.number_format}}',
+                                 ha='center', va='center',
+                                 fontfamily='monospace', fontsize=14,
+                                 fontweight='600', color=text_color)
+
+        ax.set_title('')
+        ax.set_xlabel('Adoption Category', fontsize=12, color='#555')
+        ax.set_ylabel('WHO Region', fontsize=12, color='#555')
+        ax.tick_params(labelsize=11)
+        ax.set_facecolor('#FAFAF8')
+        fig.patch.set_facecolor('#fff')
+        fig.tight_layout()
+        return fig
+
+    image = figures.cached_figure(('evidence.regional_pivot', dataset.fingerprint, metric.column, ctx.window),
+                                  build_regional_heatmap)
+    with tracing.span('st.image'):
+        st.image(image, width='stretch')
@@ -0,0 +1,74 @@
+"""Executive Summary: headline metrics and the structure of the analysis."""
+import streamlit as st
+
+
+def render(ctx):
+    merged_data = ctx.dataset.merged_data
+
+    st.markdown('<h1 class="main-header">The Race Against Time</h1>', unsafe_allow_html=True)
+    st.markdown('<p class="byline">COVID-19 Vaccination Impact Analysis</p>', unsafe_allow_html=True)
+    
+    st.markdown("""
+    <p class="lead-text">
+        This analysis examines data from 130 countries to answer a critical question from the pandemic: 
+        Did countries that adopted vaccines earlier experience different mortality outcomes?
+    </p>
+    """, unsafe_allow_html=True)
+    
+    # Key metrics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown("""
+        <div class="metric-card">
+            <div class="metric-label">Countries Analyzed</div>
+            <div class="metric-value">130</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        total_deaths = merged_data['Total_Deaths'].sum()
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-label">Total Deaths</div>
+            <div class="metric-value">{total_deaths:,.0f}</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        earliest_vax = merged_data['Vaccine_Intro_Date'].min().strftime('%b %d, %Y')
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-label">First Vaccination</div>
+            <div class="metric-value" style="font-size: 1.3rem;">{earliest_vax}</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col4:
+        latest_vax = merged_data['Vaccine_Intro_Date'].max().strftime('%b %d, %Y')
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-label">Last to Adopt</div>
+            <div class="metric-value" style="font-size: 1.3rem;">{latest_vax}</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    st.markdown('<h2 class="sub-header">Structure of Analysis</h2>', unsafe_allow_html=True)
+    
+    cols = st.columns(4)
+    sections = [
+        ("01", "The Crisis", "Understanding the scale and demographic impact of COVID-19 mortality"),
+        ("02", "The Solution", "When and how countries introduced vaccination programs"),
+        ("03", "The Evidence", "Statistical analysis of timing versus outcomes"),
+        ("04", "Recommendations", "Strategic implications for future pandemic preparedness")
+    ]
+    
+    for col, (num, title, desc) in zip(cols, sections):
+        with col:
+            st.markdown(f"""
+            <div class="story-card">
+                <div class="story-number">{num}</div>
+                <div class="story-title">{title}</div>
+                <div class="story-desc">{desc}</div>
+            </div>
+            """, unsafe_allow_html=True)
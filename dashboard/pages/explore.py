@@ -0,0 +1,135 @@
+"""Explore: pivot deaths over region, income, adoption category, age group and month."""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from dashboard import cube, normalize, plotly_cache, tracing
+from dashboard.theme import COLORS
+
+DIMENSION_LABELS = {
+    'Who_region': 'WHO region',
+    'Wb_income': 'Income group',
+    'Category': 'Adoption category',
+    'Agegroup': 'Age group',
+    'month': 'Month',
+}
+
+# Label -> (cube.frame column, number format)
+STATISTICS = {
+    'Total deaths': ('Deaths', ',.0f'),
+    'Mean per country': ('Mean', ',.1f'),
+    'Std. across countries': ('Std', ',.1f'),
+    'Deaths per 100k': ('Deaths_per_100k', ',.1f'),
+    'Countries': ('Countries', ',.0f'),
+}
+
+NONE = 'None'
+
+
+def axis_labels(values, dimension):
+    if dimension == 'month':
+        return pd.DatetimeIndex(values).strftime('%b %Y').tolist()
+    return [str(v) for v in values]
+
+
+def render(ctx):
+    dataset, metric = ctx.dataset, ctx.metric
+
+    st.markdown('<h1 class="main-header">Explore the Data</h1>', unsafe_allow_html=True)
+    st.markdown('<p class="byline">Deaths by Region, Income, Adoption, Age and Month</p>', unsafe_allow_html=True)
+
+    st.markdown("""
+    <p class="lead-text">
+        Pick any two dimensions to cross and a statistic to show. Every view is read from a
+        precomputed cube, so changing the pivot or the filters never re-scans the data.
+    </p>
+    """, unsafe_allow_html=True)
+
+    with tracing.span('cube'):
+        data_cube = cube.get_cube(dataset, ctx.aggs.deaths_matrix)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        rows = st.selectbox("Rows", list(DIMENSION_LABELS), format_func=DIMENSION_LABELS.__getitem__)
+    with col2:
+        choices = [NONE] + [d for d in DIMENSION_LABELS if d != rows]
+        columns = st.selectbox("Columns", choices, index=choices.index('Category') if 'Category' in choices else 0,
+                               format_func=lambda d: DIMENSION_LABELS.get(d, d))
+    with col3:
+        default = 'Deaths per 100k' if metric == normalize.PER_100K else 'Mean per country'
+        statistic = st.selectbox("Statistic", list(STATISTICS), index=list(STATISTICS).index(default))
+    column, number_format = STATISTICS[statistic]
+
+    # Dice: any subset of each categorical dimension; months follow the sidebar period
+    where = {}
+    with st.expander("Filters"):
+        for dimension in cube.COUNTRY_DIMENSIONS + ('Agegroup',):
+            options = data_cube.labels[dimension].tolist()
+            selected = st.multiselect(DIMENSION_LABELS[dimension], options, default=options)
+            if len(selected) < len(options):
+                where[dimension] = selected
+    if ctx.window is not None:
+        months = data_cube.labels['month']
+        where['month'] = months[(months >= pd.Timestamp(ctx.window[0]))
+                                & (months <= pd.Timestamp(ctx.window[1]))]
+
+    keep = [rows] if columns == NONE else [rows, columns]
+    with tracing.span('cube.query', keep=','.join(keep)):
+        table = data_cube.frame(keep, where)[column]
+    if columns != NONE:
+        table = table.unstack(columns)
+
+    def build_chart():
+        layout = dict(
+            font=dict(family='IBM Plex Sans', size=12),
+            paper_bgcolor='#fff',
+            plot_bgcolor='#FAFAF8',
+            margin=dict(l=0, r=20, t=30, b=40)
+        )
+        hover = '%{y}<br>%{x}<br>' + statistic + ': %{z:' + number_format + '}<extra></extra>'
+        if columns == NONE:
+            fig = go.Figure(go.Bar(
+                x=axis_labels(table.index, rows), y=table.to_numpy(),
+                marker_color=COLORS['primary'],
+                hovertemplate='%{x}<br>' + statistic + ': %{y:' + number_format + '}<extra></extra>'
+            ))
+            fig.update_layout(height=420, yaxis=dict(title=statistic, gridcolor='#e0e0e0'), **layout)
+        else:
+            fig = go.Figure(go.Heatmap(
+                z=table.to_numpy(), x=axis_labels(table.columns, columns), y=axis_labels(table.index, rows),
+                colorscale='Blues', colorbar=dict(title=dict(text=statistic, side='right')),
+                hovertemplate=hover, xgap=2, ygap=2
+            ))
+            fig.update_layout(height=max(360, 26 * len(table) + 120),
+                              yaxis=dict(autorange='reversed'), **layout)
+        return fig
+
+    key = ('explore.pivot', dataset.fingerprint, rows, columns, statistic,
+           tuple((d, tuple(map(str, v))) for d, v in sorted(where.items())))
+    fig = plotly_cache.cached_figure(key, build_chart)
+    with tracing.span('st.plotly_chart'):
+        st.plotly_chart(fig, width='stretch')
+
+    shown = table.to_frame(statistic) if columns == NONE else table
+    shown = shown.set_axis(axis_labels(shown.index, rows), axis=0)
+    if columns != NONE:
+        shown = shown.set_axis(axis_labels(shown.columns, columns), axis=1)
+    st.dataframe(shown.round(1), width='stretch')
+
+    missing_std = column == 'Std' and np.isnan(table.to_numpy()).all()
+    # The Crisis sums the whole age table, including countries outside the analysis
+    outside = sum(code not in ctx.index for code in dataset.deaths_by_age['Country_code'].unique())
+    st.markdown(f"""
+    <div class="insight-box">
+        <div class="insight-label">How to Read This</div>
+        <p>Monthly deaths come from the time series and are split across age groups by each country's
+        reported age breakdown, so age and month totals match the source tables for the {len(ctx.index)}
+        countries analysed here.{
+        f' The age totals on The Crisis page also include {outside} countries outside this analysis, so they'
+        ' are higher than the ones here.' if outside else ''} "Mean per country" and
+        "Std. across countries" describe the countries in each cell.{
+        ' The standard deviation needs the age groups or months you filter on as rows or columns.'
+        if missing_std else ''}</p>
+    </div>
+    """, unsafe_allow_html=True)
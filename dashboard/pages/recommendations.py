@@ -0,0 +1,197 @@
+"""Recommendations: what the evidence supports and what needs more research."""
+import streamlit as st
+
+from dashboard import categories
+
+
+def render(ctx):
+    st.markdown('<h1 class="main-header">Considerations & Next Steps</h1>', unsafe_allow_html=True)
+    st.markdown('<p class="byline">Interpreting the Evidence</p>', unsafe_allow_html=True)
+    
+    st.markdown("""
+    <p class="lead-text">
+        This analysis reveals complex patterns but does not establish clear causation between 
+        vaccine adoption timing and mortality outcomes. The following considerations acknowledge 
+        both what we learned and what requires further investigation.
+    </p>
+    """, unsafe_allow_html=True)
+    
+    # Evidence Gaps - What we cannot conclude
+    st.markdown('<h2 class="sub-header">What We Cannot Conclude</h2>', unsafe_allow_html=True)
+    
+    st.markdown("""
+    <div class="insight-box" style="border-left-color: #9d4b4b;">
+        <div class="insight-label" style="color: #9d4b4b;">Evidence Gaps</div>
+        <p style="margin-bottom: 16px;">
+            <strong>Correlation ≠ Causation:</strong> Early vaccine adoption did not consistently predict lower mortality. 
+            Countries like the USA and Brazil adopted early but had high death counts due to population size and other factors.
+        </p>
+        <p style="margin-bottom: 16px;">
+            <strong>Confounding variables dominate:</strong> Population size, healthcare infrastructure quality, 
+            pandemic wave timing, reporting standards, and socioeconomic conditions all significantly 
+            influenced outcomes — often more than adoption timing itself.
+        </p>
+        <p>
+            <strong>Data limitations:</strong> Absolute death counts without population normalization 
+            make direct country comparisons misleading. The analysis supports general preparedness principles 
+            but cannot validate specific timing thresholds.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Key findings - keeping this section
+    st.markdown('<h2 class="sub-header">Summary of Findings</h2>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("""
+        <div style='background: #fff; padding: 28px; border: 1px solid #e0e0e0;'>
+            <div style='font-size: 0.8rem; text-transform: uppercase; letter-spacing: 1.5px; color: #2d6a4f; margin-bottom: 14px;'>
+                What the Data Shows
+            </div>
+            <ul style='margin: 0; padding-left: 20px; line-height: 1.9; color: #444; font-size: 1rem;'>
+                <li>130 countries analyzed with complete data</li>
+                <li>60 countries achieved early adoption</li>
+                <li>65+ age group bore disproportionate mortality</li>
+                <li>Regional variations in both timing and outcomes</li>
+                <li>Population size was a major confounding factor</li>
+            </ul>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown("""
+        <div style='background: #fff; padding: 28px; border: 1px solid #e0e0e0;'>
+            <div style='font-size: 0.8rem; text-transform: uppercase; letter-spacing: 1.5px; color: #b08968; margin-bottom: 14px;'>
+                Limitations & Context
+            </div>
+            <ul style='margin: 0; padding-left: 20px; line-height: 1.9; color: #444; font-size: 1rem;'>
+                <li>Large countries had more deaths regardless of timing</li>
+                <li>Pandemic waves occurred at different times globally</li>
+                <li>Healthcare infrastructure varied significantly</li>
+                <li>Reporting quality differed between countries</li>
+                <li>Socioeconomic factors played major roles</li>
+            </ul>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Further Research Needed
+    st.markdown('<h2 class="sub-header">Further Research Needed</h2>', unsafe_allow_html=True)
+    
+    research_items = [
+        {
+            "num": "01",
+            "title": "Population-Normalized Analysis",
+            "desc": "Conduct analysis using deaths per 100,000 population to enable meaningful cross-country comparisons and control for size effects."
+        },
+        {
+            "num": "02",
+            "title": "Controlled Regional Comparisons",
+            "desc": "Compare countries with similar demographics, healthcare systems, and pandemic timing but different adoption speeds to isolate the vaccine timing variable. A first region- and income-matched version is on the Matched Comparisons page."
+        },
+        {
+            "num": "03",
+            "title": "Qualitative Decision-Maker Research",
+            "desc": "Survey health officials to understand barriers to faster adoption — supply constraints, regulatory processes, or distribution challenges."
+        }
+    ]
+    
+    for item in research_items:
+        st.markdown(f"""
+        <div style='background: #fff; padding: 24px 28px; border: 1px solid #e0e0e0; margin-bottom: 16px; border-left: 3px solid #1e3a5f;'>
+            <div style='font-family: IBM Plex Mono; font-size: 0.85rem; color: #1e3a5f; margin-bottom: 8px;'>{item['num']}</div>
+            <div style='font-family: Source Serif 4, Georgia, serif; font-size: 1.15rem; font-weight: 600; margin-bottom: 10px;'>{item['title']}</div>
+            <div style='font-size: 1rem; line-height: 1.7; color: #444;'>{item['desc']}</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Preliminary Considerations (formerly Priority Actions) - reduced to 3
+    st.markdown('<h2 class="sub-header">Preliminary Considerations</h2>', unsafe_allow_html=True)
+    
+    st.markdown("""
+    <p style='font-size: 1rem; color: #666; margin-bottom: 24px; line-height: 1.7;'>
+        While further research is needed for definitive conclusions, general pandemic preparedness 
+        principles suggest the following areas merit attention:
+    </p>
+    """, unsafe_allow_html=True)
+    
+    recommendations = [
+        {
+            "num": "01",
+            "title": "Build Strategic Vaccine Reserves",
+            "what": "Establish emergency stockpiles with flexible manufacturing partnerships",
+            "why": "Early adopters were those with pre-existing infrastructure and procurement agreements",
+            "action": "Allocate budget for reserve capacity and advance purchase agreements"
+        },
+        {
+            "num": "02",
+            "title": "Invest in Distribution Infrastructure",
+            "what": "Develop cold-chain logistics and last-mile delivery capabilities",
+            "why": "Speed of rollout, not just availability, determined success",
+            "action": "Map vulnerable populations and pre-position distribution networks"
+        },
+        {
+            "num": "03",
+            "title": "Implement Accelerated Approval Protocols",
+            "what": "Create frameworks for emergency use authorization",
+            "why": "Every week of delay meant preventable deaths",
+            "action": "Establish clear criteria and streamlined review processes"
+        }
+    ]
+    
+    for rec in recommendations:
+        st.markdown(f"""
+        <div class="rec-card">
+            <div class="rec-number">{rec['num']}</div>
+            <div class="rec-title">{rec['title']}</div>
+            <div class="rec-text">{rec['what']}</div>
+            <div class="rec-label">Rationale</div>
+            <div class="rec-text">{rec['why']}</div>
+            <div class="rec-label">Action Item</div>
+            <div class="rec-text">{rec['action']}</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Final message - more measured tone
+    st.markdown("""
+    <div class="final-box">
+        <div class="final-title">The Bottom Line</div>
+        <div class="final-text">
+            This analysis does not provide definitive evidence that early vaccine adoption 
+            directly caused lower mortality — the relationship is far more complex than 
+            a simple timing correlation.
+            <br><br>
+            However, the data does support the value of <strong>preparedness infrastructure</strong>: 
+            countries that could act quickly had systems already in place. Further research 
+            with normalized data and controlled comparisons is essential before drawing 
+            policy conclusions.
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Methodology
+    periods = [f"{categories.short_label(label)} ({period.replace('Before', 'before').replace('After', 'after')})"
+               for label, period in categories.adoption_periods(short=True).items()]
+    with st.expander("Data Sources & Methodology"):
+        st.markdown(f"""
+        **Data Sources**
+        
+        WHO COVID-19 Data Repository, COVID-19 Vaccination Uptake Data (2021-2023), 
+        WHO Global Monthly Death by Age Data, COVID-19 Vaccine Production Data
+        
+        **Analysis Period**
+        
+        Deaths: January 2020 – August 2025 | Vaccinations: December 2020 – December 2023
+        
+        **Methodology**
+        
+        Total deaths calculated by summing all monthly deaths per country. Vaccine introduction 
+        date taken as first recorded vaccination. Countries categorized into {', '.join(periods[:-1])}, 
+        and {periods[-1]} adopters.
+        
+        **Limitations**
+        
+        Data quality varies by country. Population size not normalized in some visualizations. 
+        Pandemic timing differed globally. Healthcare infrastructure disparities not accounted for.
+        """)
@@ -0,0 +1,133 @@
+"""The Solution: vaccine introduction timeline and adoption categories."""
+import pandas as pd
+import streamlit as st
+
+from dashboard import categories, plotly_cache, tracing
+from dashboard.theme import CATEGORY_COLORS, focus_colors
+
+
+def render(ctx):
+    dataset, aggs = ctx.dataset, ctx.aggs
+
+    st.markdown('<h1 class="main-header">Vaccine Introduction Timeline</h1>', unsafe_allow_html=True)
+    st.markdown('<p class="byline">Global Adoption Patterns</p>', unsafe_allow_html=True)
+    
+    st.markdown("""
+    <p class="lead-text">
+        Vaccines became available at different times across countries. This section examines 
+        adoption patterns and the factors that influenced rollout speed.
+    </p>
+    """, unsafe_allow_html=True)
+    
+    # Key statistics - adoption rank of each focus country
+    st.markdown('<h2 class="sub-header">Adoption Sequence</h2>', unsafe_allow_html=True)
+
+    timeline_data = aggs.timeline_data
+    index = ctx.index
+    colors = focus_colors(ctx.focus)
+    total_countries = len(timeline_data)
+
+    # Display key stats, up to four cards per row
+    if ctx.focus:
+        columns = st.columns(min(len(ctx.focus), 4))
+        for i, (code, label) in enumerate(ctx.focus.items()):
+            position = index.position(code)
+            intro_date = index.frame['Vaccine_Intro_Date'].iat[position]
+            with columns[i % len(columns)]:
+                st.markdown(f"""
+                <div style='background: {colors[code]}; padding: 32px 28px; border: 1px solid #e0e0e0; text-align: center;'>
+                    <div style='font-family: IBM Plex Sans; font-size: 0.9rem; text-transform: uppercase;
+                                letter-spacing: 1.5px; color: rgba(255,255,255,0.9); margin-bottom: 12px;'>
+                        {label}
+                    </div>
+                    <div style='font-family: IBM Plex Mono; font-size: 3rem; font-weight: 600;
+                                color: #fff; margin-bottom: 8px;'>
+                        #{index.rank[position]}
+                    </div>
+                    <div style='font-size: 1.1rem; color: rgba(255,255,255,0.95); margin-bottom: 4px;'>
+                        de {total_countries} países
+                    </div>
+                    <div style='font-family: IBM Plex Mono; font-size: 0.95rem; color: rgba(255,255,255,0.85);'>
+                        {intro_date.strftime('%B %d, %Y')}
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
+
+    st.markdown("<div style='margin-top: 32px;'></div>", unsafe_allow_html=True)
+
+    # World map visualization
+    def build_adoption_map():
+        import plotly.express as px
+
+        # Plotly Express reads the columns it needs; the shared frame is passed as is
+        fig = px.choropleth(
+            timeline_data,
+            locations='Country_code',
+            color='Category',
+            hover_name='Country',
+            hover_data={
+                'Country_code': False,
+                'Vaccine_Intro_Date': '|%B %d, %Y',
+                'Rank': True,
+                'Category': True
+            },
+            color_discrete_map=CATEGORY_COLORS,
+            category_orders={'Category': list(categories.ADOPTION_LABELS)},
+            labels={'Vaccine_Intro_Date': 'Adoption Date', 'Rank': 'Ranking'}
+        )
+
+        fig.update_layout(
+            height=550,
+            font=dict(family='IBM Plex Sans', size=12),
+            paper_bgcolor='#fff',
+            geo=dict(
+                showframe=False,
+                showcoastlines=True,
+                coastlinecolor='#e0e0e0',
+                projection_type='natural earth',
+                bgcolor='#FAFAF8',
+                landcolor='#f5f5f5',
+                oceancolor='#FAFAF8'
+            ),
+            legend=dict(
+                title=dict(text='Adoption Category', font=dict(size=12, family='IBM Plex Sans')),
+                orientation="h",
+                yanchor="bottom",
+                y=-0.1,
+                xanchor="center",
+                x=0.5,
+                font=dict(size=11)
+            ),
+            margin=dict(l=0, r=0, t=20, b=0)
+        )
+        return fig
+
+    fig = plotly_cache.cached_figure(('solution.choropleth', dataset.fingerprint), build_adoption_map)
+    with tracing.span('st.plotly_chart'):
+        st.plotly_chart(fig, width='stretch')
+    
+    # Category statistics
+    st.markdown('<h2 class="sub-header">Adoption Categories</h2>', unsafe_allow_html=True)
+
+    periods = categories.adoption_periods()
+    for column, label in zip(st.columns(len(categories.ADOPTION_LABELS)), categories.ADOPTION_LABELS):
+        color = CATEGORY_COLORS[label]
+        with column:
+            st.markdown(f"""
+            <div class="category-card" style="border-top: 4px solid {color};">
+                <div class="category-label" style="color: {color};">{label}</div>
+                <div class="category-value">{len(index.group('Category', label))}</div>
+                <div class="category-period">{periods[label]}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+    # Countries in every category but the last introduced vaccines by its lower edge
+    share = sum(len(index.group('Category', label)) for label in categories.ADOPTION_LABELS[:-1]) / total_countries
+    by_date = pd.Timestamp(categories.ADOPTION_EDGES[-2])
+    st.markdown(f"""
+    <div class="insight-box" style="margin-top: 32px;">
+        <div class="insight-label">Observation</div>
+        <p>{share:.0%} of analyzed countries had introduced vaccines by {by_date:%B %Y}. 
+        However, timing differences of even a few months had implications for mortality outcomes during peak waves.</p>
+    </div>
+    """, unsafe_allow_html=True)
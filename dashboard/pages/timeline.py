@@ -0,0 +1,191 @@
+"""The Timeline: deaths over time by WHO region and by country."""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from dashboard import aggregates, downsample, normalize, plotly_cache, tracing
+from dashboard.theme import COLORS, REGION_COLORS, focus_colors
+
+# Highlighted curves keep at most MAX_POINTS points (LTTB); background
+# curves keep the min and max of BACKGROUND_BUCKETS buckets, for the
+# BACKGROUND_CURVES countries with the most deaths
+MAX_POINTS = 600
+BACKGROUND_BUCKETS = 120
+BACKGROUND_CURVES = 500
+
+
+def curve_values(matrix, population, metric, rows=slice(None)):
+    """Deaths per period for matrix ``rows``, per 100k people if ``metric`` asks for it."""
+    if metric == normalize.PER_100K:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return matrix.values[rows] / population[rows, None] * normalize.PER
+    return matrix.values[rows]
+
+
+def region_curves(matrix, index, population, metric):
+    """``{region: (curve, median introduction date)}`` over each region's countries."""
+    positions = index.codes.get_indexer(matrix.countries.astype(str))
+    frame = index.frame
+    curves = {}
+    for region, members in sorted(index.groups['Who_region'].items()):
+        rows = np.flatnonzero(np.isin(positions, members))
+        if metric == normalize.PER_100K:
+            rows = rows[np.isfinite(population[rows])]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                curve = matrix.values[rows].sum(axis=0) / population[rows].sum() * normalize.PER
+        else:
+            curve = matrix.values[rows].sum(axis=0)
+        intro = frame['Vaccine_Intro_Date'].iloc[members].median()
+        curves[str(region)] = (curve, intro)
+    return curves
+
+
+def value_at(dates, curve, when):
+    """Curve value for the period containing ``when``."""
+    column = np.searchsorted(dates, np.datetime64(when, 'ns'), side='right') - 1
+    return float(curve[min(max(column, 0), len(curve) - 1)])
+
+
+def epoch_ms(dates):
+    """Dates as float milliseconds, which Plotly ships as a binary array on a date axis."""
+    return dates.astype('datetime64[ms]').astype('float64')
+
+
+def line_trace(dates, curve, **kwargs):
+    """A WebGL line of ``curve``, reduced to ``MAX_POINTS`` with LTTB."""
+    keep = downsample.lttb(dates.view('int64'), np.nan_to_num(curve), MAX_POINTS)
+    return go.Scattergl(x=epoch_ms(dates[keep]), y=curve[keep].astype('float32'), mode='lines', **kwargs)
+
+
+def render(ctx):
+    dataset, metric = ctx.dataset, ctx.metric
+
+    st.markdown('<h1 class="main-header">Mortality Over Time</h1>', unsafe_allow_html=True)
+    st.markdown('<p class="byline">Pandemic Waves and Vaccine Introduction</p>', unsafe_allow_html=True)
+
+    st.markdown("""
+    <p class="lead-text">
+        Totals hide timing. These curves show when deaths occurred in each region and country,
+        and where each vaccine program began relative to the waves.
+    </p>
+    """, unsafe_allow_html=True)
+
+    # Daily curves are offered when the source series is daily
+    daily = aggregates.get_daily_matrix(dataset)
+    resolution = 'Monthly'
+    if daily is not None:
+        resolution = st.radio("Resolution", ["Monthly", "Daily"], horizontal=True)
+    matrix = daily if resolution == 'Daily' else ctx.aggs.deaths_matrix
+    period = 'day' if resolution == 'Daily' else 'month'
+    y_title = f'{metric.label} per {period}'
+
+    population = normalize.population_for(dataset.population, matrix.countries.to_series())
+    dates = matrix.dates.values
+    hover = '%{x|%b %d, %Y}<br>%{y:' + metric.number_format + '}<extra>%{fullData.name}</extra>'
+
+    def set_window(spec):
+        # The sidebar period only moves the visible range
+        if ctx.window is not None:
+            spec['layout'].setdefault('xaxis', {})['range'] = [str(ctx.window[0]), str(ctx.window[1])]
+
+    layout = dict(
+        height=480,
+        font=dict(family='IBM Plex Sans', size=12),
+        paper_bgcolor='#fff',
+        plot_bgcolor='#FAFAF8',
+        xaxis=dict(type='date', gridcolor='#e0e0e0', tickfont=dict(size=11)),
+        yaxis=dict(gridcolor='#e0e0e0', tickfont=dict(size=11), title=y_title),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0, font=dict(size=11)),
+        margin=dict(l=0, r=20, t=50, b=40),
+        hovermode='closest'
+    )
+
+    # Regional curves
+    st.markdown('<h2 class="sub-header">Deaths by WHO Region</h2>', unsafe_allow_html=True)
+
+    def build_region_chart():
+        fig = go.Figure()
+        intro_x, intro_y, intro_colors, intro_text = [], [], [], []
+        for region, (curve, intro) in region_curves(matrix, ctx.index, population, metric).items():
+            color = REGION_COLORS.get(region, COLORS['neutral'])
+            fig.add_trace(line_trace(dates, curve, name=region, line=dict(color=color, width=2),
+                                     hovertemplate=hover))
+            if pd.notna(intro):
+                intro_x.append(intro)
+                intro_y.append(value_at(dates, curve, intro))
+                intro_colors.append(color)
+                intro_text.append(f'{region}: median introduction {intro:%b %d, %Y}')
+        fig.add_trace(go.Scattergl(
+            x=intro_x, y=intro_y, mode='markers', name='Vaccine introduction (median)',
+            marker=dict(size=11, color=intro_colors, symbol='diamond', line=dict(width=1.5, color='#fff')),
+            text=intro_text, hovertemplate='%{text}<extra></extra>'
+        ))
+        fig.update_layout(**layout)
+        return fig
+
+    fig = plotly_cache.cached_figure(('timeline.regions', dataset.fingerprint, metric.column, resolution),
+                                     build_region_chart, restyle=set_window)
+    with tracing.span('st.plotly_chart'):
+        st.plotly_chart(fig, width='stretch')
+
+    # Country curves: every country in the background, focus countries on top
+    st.markdown('<h2 class="sub-header">Deaths by Country</h2>', unsafe_allow_html=True)
+
+    def build_country_chart():
+        values = curve_values(matrix, population, metric)
+        if len(values) > BACKGROUND_CURVES:
+            totals = np.nan_to_num(values).sum(axis=1)
+            values = values[np.argpartition(totals, -BACKGROUND_CURVES)[-BACKGROUND_CURVES:]]
+        keep = downsample.minmax(values, BACKGROUND_BUCKETS)
+        # One trace for all countries: curves joined by NaN breaks
+        # float32 milliseconds are exact to about two minutes, plenty for daily points
+        x = epoch_ms(np.concatenate([dates[keep], dates[keep[:, -1:]]], axis=1).ravel()).astype('float32')
+        y = np.concatenate([np.take_along_axis(values, keep, axis=1),
+                            np.full((len(values), 1), np.nan)], axis=1).ravel().astype('float32')
+        fig = go.Figure(go.Scattergl(
+            x=x, y=y, mode='lines', name='All countries',
+            line=dict(color=COLORS['muted'], width=1), opacity=0.6,
+            connectgaps=False, hoverinfo='skip'
+        ))
+        fig.update_layout(**layout)
+        return fig
+
+    colors = focus_colors(ctx.focus)
+
+    def add_focus_curves(spec):
+        set_window(spec)
+        for code, label in ctx.focus.items():
+            if code not in matrix:
+                continue
+            curve = curve_values(matrix, population, metric, matrix.row(code))
+            trace = line_trace(dates, curve, name=label, line=dict(color=colors[code], width=2.5),
+                               hovertemplate=hover)
+            spec['data'].append(trace.to_plotly_json())
+            intro = ctx.index.frame['Vaccine_Intro_Date'].iat[ctx.index.position(code)]
+            if pd.notna(intro):
+                spec['data'].append({
+                    'type': 'scattergl',
+                    'x': [intro.strftime('%Y-%m-%d')],
+                    'y': [value_at(dates, curve, intro)],
+                    'mode': 'markers',
+                    'name': f'{label} introduction',
+                    'showlegend': False,
+                    'marker': {'size': 12, 'color': colors[code], 'symbol': 'diamond',
+                               'line': {'width': 1.5, 'color': '#fff'}},
+                    'hovertemplate': f'{label}: vaccine introduced {intro:%b %d, %Y}<extra></extra>',
+                })
+
+    fig = plotly_cache.cached_figure(('timeline.countries', dataset.fingerprint, metric.column, resolution),
+                                     build_country_chart, restyle=add_focus_curves)
+    with tracing.span('st.plotly_chart'):
+        st.plotly_chart(fig, width='stretch')
+
+    st.markdown(f"""
+    <div class="insight-box">
+        <div class="insight-label">How to Read This</div>
+        <p>Each line sums reported deaths per {period}; diamonds mark vaccine introduction (for regions,
+        the median country's date). Long series are downsampled before display, keeping each curve's
+        shape and peaks, so the charts stay responsive with many countries and daily data.</p>
+    </div>
+    """, unsafe_allow_html=True)
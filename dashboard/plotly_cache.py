@@ -0,0 +1,112 @@
+"""Serialized Plotly figure cache.
+
+Figures are built and validated once per key, stored as JSON, and rehydrated
+with validation switched off, so reruns skip Plotly's figure construction.
+The in-process LRU can be backed by a directory shared between server
+processes (``COVID_PLOTLY_CACHE_DIR``), so one warmed process warms them all.
+
+Keys must be tuples of plain values (strings, numbers, tuples) that include
+the dataset fingerprint and every page parameter; their ``repr`` names the
+on-disk entry.
+"""
+import base64
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import plotly.graph_objects as go
+
+from dashboard import tracing
+from dashboard.lru import LRUCache
+
+FIGURE_JSON_CACHE = LRUCache(max_entries=32, max_bytes=64 * 2**20)
+
+# Optional shared tier; None keeps the cache in-process only
+DISK_DIR = os.environ.get('COVID_PLOTLY_CACHE_DIR') or None
+
+
+def _disk_path(key):
+    digest = hashlib.sha256(repr(key).encode()).hexdigest()
+    return Path(DISK_DIR) / f'{digest}.json'
+
+
+def _read_disk(key):
+    if DISK_DIR is None:
+        return None
+    try:
+        return _disk_path(key).read_text()
+    except OSError:
+        return None
+
+
+def _write_disk(key, spec):
+    if DISK_DIR is None:
+        return
+    path = _disk_path(key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp.write_text(spec)
+        os.replace(tmp, path)
+    except OSError:
+        # A full or read-only shared volume only costs us the shared tier
+        pass
+
+
+def cached_figure_json(key, build):
+    """Return the figure JSON for ``key``, calling ``build()`` on a miss."""
+    spec = FIGURE_JSON_CACHE.get(key)
+    if spec is None:
+        spec = _read_disk(key)
+        if spec is None:
+            with tracing.span('plotly.build', figure=key[0]):
+                spec = build().to_json()
+            _write_disk(key, spec)
+        FIGURE_JSON_CACHE.put(key, spec)
+    return spec
+
+
+def cached_figure(key, build, restyle=None):
+    """Return a ready-to-send figure for ``key`` without re-running validation.
+
+    ``restyle(spec)``, if given, edits the decoded figure dict in place
+    before it is wrapped: a per-rerun styling layer (colors, highlight
+    traces, labels) over the cached base figure, whose key must not depend
+    on anything ``restyle`` reads.
+    """
+    spec = json.loads(cached_figure_json(key, build))
+    if restyle is not None:
+        with tracing.span('plotly.restyle', figure=key[0]):
+            restyle(spec)
+    return go.Figure(spec, _validate=False)
+
+
+def _keep(values, keep):
+    if isinstance(values, dict) and 'bdata' in values and 'shape' not in values:
+        # Plotly's typed-array encoding of numeric arrays
+        array = np.frombuffer(base64.b64decode(values['bdata']), dtype=values['dtype'])
+        if len(array) == len(keep):
+            return {**values, 'bdata': base64.b64encode(array[keep].tobytes()).decode()}
+    elif isinstance(values, list) and len(values) == len(keep):
+        return [value for value, kept in zip(values, keep) if kept]
+    return values
+
+
+def drop_points(trace, points):
+    """Remove the points at ``points`` from a decoded trace dict in place.
+
+    Every per-point array of the trace and its ``marker`` (plain lists and
+    Plotly's base64 typed arrays) loses those entries; for a restyle that
+    draws some points of a cached trace in a trace of their own.
+    """
+    if len(points) == 0:
+        return
+    x = trace['x']
+    n = len(x) if isinstance(x, list) else len(base64.b64decode(x['bdata'])) // np.dtype(x['dtype']).itemsize
+    keep = np.ones(n, dtype=bool)
+    keep[points] = False
+    for owner in (trace, trace.get('marker', {})):
+        for name, values in owner.items():
+            owner[name] = _keep(values, keep)
@@ -0,0 +1,111 @@
+"""Hot reload of the source CSVs without restarting the server.
+
+A daemon thread polls the ``mtime``/size of every source file (stdlib only,
+so it works the same on any filesystem, including network mounts where
+inotify sees nothing). When they change, it waits one more interval for the
+writer to finish, then in the background:
+
+1. builds the new dataset version (:func:`loader.build_dataset`; the
+   columnar cache is rebuilt for the changed tables), extending the death
+   matrices of the current one if the time series only gained rows after
+   its last date (:func:`aggregates.extend_matrices`),
+2. checks the files did not change again meanwhile, else starts over,
+3. warms the new version's caches (:func:`warmup.warm`),
+4. swaps it in as a whole (:func:`loader.swap`), and
+5. drops the caches derived from the old version (:func:`versions.discard`).
+
+Sessions read the old version until step 4 and the new one after it, so
+they never see a half-loaded dataset. A new version that fails to load
+(e.g. a :class:`schema.SchemaError`) is logged and the old one keeps
+serving until the files change again.
+
+``COVID_RELOAD_INTERVAL`` sets the polling period in seconds (default 30;
+0 disables the watcher).
+"""
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from dashboard import aggregates, loader, store, tracing, versions, warmup
+
+INTERVAL = float(os.environ.get('COVID_RELOAD_INTERVAL', 30))
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_thread = None
+
+
+def signature(data_dir=None):
+    """``(mtime_ns, size)`` of every source file (None for a missing one)."""
+    data_dir = Path(data_dir) if data_dir else store.DATA_DIR
+    stats = []
+    for filename in store.SOURCES.values():
+        try:
+            stat = (data_dir / filename).stat()
+        except OSError:
+            stats.append(None)
+        else:
+            stats.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(stats)
+
+
+def reload(expected=None):
+    """Build, warm and swap in the dataset on disk now; returns the new fingerprint.
+
+    With ``expected`` (a :func:`signature`), the build is dropped and None
+    returned if the files no longer match it once the build is done. Also
+    None when the content is unchanged (files only touched).
+    """
+    with tracing.span('reload.build'):
+        dataset = loader.build_dataset()
+    if expected is not None and signature() != expected:
+        return None
+    previous = loader.load_data()
+    if dataset.fingerprint == previous.fingerprint:
+        return None
+    aggregates.extend_matrices(previous, dataset)
+    warmup.warm(dataset)
+    previous = loader.swap(dataset)
+    dropped = versions.discard(previous.fingerprint)
+    logger.info('data reloaded: %s -> %s (%d cache entries dropped)',
+                previous.fingerprint, dataset.fingerprint, dropped)
+    return dataset.fingerprint
+
+
+def watch(interval=INTERVAL):
+    """Poll the source files forever, reloading once a change has settled."""
+    current = pending = signature()
+    while True:
+        time.sleep(interval)
+        seen = signature()
+        if seen == current:
+            pending = current
+            continue
+        if seen != pending or None in seen:
+            # Still being written (or mid-replace): wait for one quiet interval
+            pending = seen
+            continue
+        try:
+            reload(expected=seen)
+        except Exception:
+            logger.exception('data reload failed; still serving the previous version')
+        else:
+            # A build that raced another write is retried on the next change
+            if signature() != seen:
+                continue
+        current = seen
+
+
+def start():
+    """Start :func:`watch` in a daemon thread, once per process; returns the thread (None if disabled)."""
+    global _thread
+    if INTERVAL <= 0:
+        return None
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=watch, name='reload-watch', daemon=True)
+            _thread.start()
+    return _thread
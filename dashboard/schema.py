@@ -0,0 +1,163 @@
+"""Column dtypes of the dashboard's source tables.
+
+Text columns repeat a few hundred values over thousands (or millions) of
+rows, so they load as ``category``; death counts are whole numbers and load
+as ``int32``; populations exceed the ``int32`` range once summed and stay
+``int64``. :func:`apply` coerces a freshly parsed CSV and rejects values
+that do not fit, :func:`validate` checks an already typed frame (e.g. one
+mapped from the columnar cache).
+
+Compare memory with pandas' default dtypes::
+
+    python -m dashboard.schema [data_dir]
+"""
+import argparse
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+class Column(NamedTuple):
+    name: str
+    # 'category', 'datetime64[<unit>]' or a numpy integer dtype name
+    dtype: str
+    nullable: bool = False
+
+
+class SchemaError(ValueError):
+    """A source table is missing a column or holds values its dtype cannot."""
+
+
+SCHEMAS = {
+    'merged_data': (
+        Column('Country_code', 'category'),
+        Column('Country', 'category'),
+        Column('Who_region', 'category', nullable=True),
+        Column('Wb_income', 'category', nullable=True),
+        Column('Total_Deaths', 'int32'),
+        Column('Vaccine_Intro_Date', 'datetime64[us]', nullable=True),
+        Column('Adoption_Category', 'category', nullable=True),
+    ),
+    'time_series': (
+        Column('Country_code', 'category'),
+        Column('date', 'datetime64[us]'),
+        Column('Deaths', 'int32'),
+    ),
+    'deaths_by_age': (
+        Column('Country_code', 'category'),
+        Column('Agegroup', 'category'),
+        Column('Deaths', 'int32'),
+    ),
+    'population': (
+        Column('Country_code', 'category'),
+        Column('Population', 'int64'),
+    ),
+}
+
+
+def _missing(name, frame):
+    missing = [column.name for column in SCHEMAS[name] if column.name not in frame.columns]
+    if missing:
+        raise SchemaError(f'{name}: missing columns {missing}')
+
+
+def _coerce(name, column, series):
+    where = f'{name}.{column.name}'
+    if column.dtype == 'category':
+        values = series.astype('category')
+    elif column.dtype.startswith('datetime64'):
+        try:
+            values = pd.to_datetime(series).astype(column.dtype)
+        except (ValueError, TypeError) as e:
+            raise SchemaError(f'{where}: unparseable dates ({e})') from None
+    else:
+        try:
+            numbers = pd.to_numeric(series).to_numpy(dtype='float64')
+        except (ValueError, TypeError) as e:
+            raise SchemaError(f'{where}: non-numeric values ({e})') from None
+        if np.isnan(numbers).any():
+            raise SchemaError(f'{where}: {np.isnan(numbers).sum():,} missing values in an integer column')
+        if (np.mod(numbers, 1) != 0).any():
+            raise SchemaError(f'{where}: fractional values in an integer column')
+        info = np.iinfo(column.dtype)
+        if len(numbers) and (numbers.min() < info.min or numbers.max() > info.max):
+            raise SchemaError(f'{where}: values outside the {column.dtype} range')
+        values = pd.Series(numbers.astype(column.dtype), index=series.index)
+    if not column.nullable and values.isna().any():
+        raise SchemaError(f'{where}: {values.isna().sum():,} missing values')
+    return values
+
+
+def apply(name, frame):
+    """Return ``frame`` (source table ``name``) with its schema's dtypes.
+
+    Columns outside the schema are kept; text ones become ``category`` too.
+    Raises :class:`SchemaError` when a column is missing or a value does not
+    fit its dtype (fractional or out-of-range counts, unparseable dates).
+    """
+    _missing(name, frame)
+    columns = {column.name: column for column in SCHEMAS[name]}
+    data = {}
+    for label in frame.columns:
+        if label in columns:
+            data[label] = _coerce(name, columns[label], frame[label])
+        elif pd.api.types.is_string_dtype(frame[label]):
+            data[label] = frame[label].astype('category')
+        else:
+            data[label] = frame[label]
+    return pd.DataFrame(data, copy=False)
+
+
+def validate(name, frame):
+    """Raise :class:`SchemaError` unless ``frame`` already has table ``name``'s dtypes."""
+    _missing(name, frame)
+    for column in SCHEMAS[name]:
+        series = frame[column.name]
+        if column.dtype == 'category':
+            matches = isinstance(series.dtype, pd.CategoricalDtype)
+        else:
+            matches = series.dtype == np.dtype(column.dtype)
+        if not matches:
+            raise SchemaError(f'{name}.{column.name}: dtype {series.dtype}, expected {column.dtype}')
+        if not column.nullable and series.isna().any():
+            raise SchemaError(f'{name}.{column.name}: missing values')
+
+
+def memory_report(data_dir=None):
+    """Bytes per column with pandas' default dtypes and with the schema's.
+
+    Parses every source CSV under ``data_dir`` (the dashboard's data
+    directory by default); indexed by ``(table, column)``.
+    """
+    from dashboard import store
+
+    rows = []
+    for name, filename in store.SOURCES.items():
+        raw = pd.read_csv(Path(data_dir or store.DATA_DIR) / filename)
+        typed = apply(name, raw)
+        before, after = raw.memory_usage(index=False, deep=True), typed.memory_usage(index=False, deep=True)
+        for label in raw.columns:
+            rows.append((name, label, str(raw[label].dtype), str(typed[label].dtype), before[label], after[label]))
+    return pd.DataFrame(rows, columns=['table', 'column', 'dtype_before', 'dtype_after',
+                                       'bytes_before', 'bytes_after']).set_index(['table', 'column'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('data_dir', nargs='?', help='directory with the source CSVs')
+    args = parser.parse_args()
+
+    report = memory_report(args.data_dir)
+    with pd.option_context('display.width', 120):
+        print(report.to_string())
+    totals = report.groupby(level='table', sort=False)[['bytes_before', 'bytes_after']].sum()
+    totals.loc['total'] = totals.sum()
+    print()
+    for table, (before, after) in totals.iterrows():
+        print(f'{table:<15} {before / 2**20:10.2f} MiB -> {after / 2**20:8.2f} MiB  ({after / before:.0%})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+"""Columnar cache for the dashboard's CSV sources.
+
+Each CSV is parsed with the dtypes of :mod:`dashboard.schema` and converted
+once into a directory of ``.npy`` column files (dates stored as int64 ticks,
+text columns as categorical codes) described by a JSON manifest. Loading
+memory-maps those files instead of re-parsing the CSV. The cache is rebuilt
+whenever a source file's mtime and content hash change, and the CSVs are read
+directly whenever the cache cannot be used.
+
+Build the cache ahead of time with::
+
+    python -m dashboard.store
+"""
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from dashboard import schema
+
+DATA_DIR = Path(os.environ.get('COVID_DATA_DIR', Path(__file__).resolve().parent.parent))
+CACHE_DIR = Path(os.environ.get('COVID_CACHE_DIR', DATA_DIR / '.cache' / 'columnar'))
+
+# table name -> source file; column dtypes are in schema.SCHEMAS
+SOURCES = {
+    'merged_data': 'covid_analysis_data.csv',
+    'time_series': 'covid_time_series.csv',
+    'deaths_by_age': 'covid_deaths_by_age.csv',
+    'population': 'covid_population.csv',
+}
+
+MANIFEST = 'manifest.json'
+FORMAT_VERSION = 2
+
+
+class Dataset(NamedTuple):
+    merged_data: pd.DataFrame
+    time_series: pd.DataFrame
+    deaths_by_age: pd.DataFrame
+    population: pd.DataFrame
+    # Combined content hash of the source files; keys every derived cache
+    fingerprint: str
+
+
+def _dirs(data_dir, cache_dir):
+    data_dir = Path(data_dir) if data_dir else DATA_DIR
+    if cache_dir is None:
+        cache_dir = CACHE_DIR if data_dir == DATA_DIR else data_dir / '.cache' / 'columnar'
+    return data_dir, Path(cache_dir)
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def read_source(name, data_dir=None):
+    """Parse a source CSV into its schema's dtypes (raises ``schema.SchemaError``)."""
+    frame = pd.read_csv(Path(data_dir or DATA_DIR) / SOURCES[name])
+    return schema.apply(name, frame)
+
+
+def _read_manifest(table_dir):
+    try:
+        with open(table_dir / MANIFEST) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('format') != FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def _write_json(path, payload):
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _is_fresh(manifest, source, table_dir):
+    """Cheap stat check first; fall back to the content hash when mtime moved."""
+    stat = source.stat()
+    if manifest['mtime_ns'] == stat.st_mtime_ns and manifest['size'] == stat.st_size:
+        return True
+    if manifest['size'] != stat.st_size or manifest['sha256'] != file_digest(source):
+        return False
+    # Touched but unchanged: record the new mtime so the next check is a stat again
+    manifest['mtime_ns'] = stat.st_mtime_ns
+    try:
+        _write_json(table_dir / MANIFEST, manifest)
+    except OSError:
+        pass
+    return True
+
+
+def write_table(name, frame, data_dir=None, cache_dir=None, digest=None):
+    """Write ``frame`` as the cached version of source table ``name``."""
+    data_dir, cache_dir = _dirs(data_dir, cache_dir)
+    source = data_dir / SOURCES[name]
+    table_dir = cache_dir / name
+    stat = source.stat()
+    digest = digest or file_digest(source)
+    version = digest[:16]
+    version_dir = table_dir / version
+    version_dir.mkdir(parents=True, exist_ok=True)
+
+    columns = []
+    for i, column in enumerate(frame.columns):
+        series = frame[column]
+        entry = {'name': column, 'file': f'{i:03d}.npy'}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            entry['kind'] = 'category'
+            entry['categories'] = series.cat.categories.tolist()
+            values = series.cat.codes.to_numpy()
+        elif pd.api.types.is_datetime64_dtype(series.dtype):
+            entry['kind'] = 'datetime'
+            entry['unit'] = np.datetime_data(series.dtype)[0]
+            values = series.to_numpy().view('i8')
+        else:
+            entry['kind'] = 'numeric'
+            values = series.to_numpy()
+        # Write beside and rename so live memory maps never see a truncated file
+        tmp = version_dir / (entry['file'] + '.tmp')
+        with open(tmp, 'wb') as f:
+            np.save(f, np.ascontiguousarray(values), allow_pickle=False)
+        os.replace(tmp, version_dir / entry['file'])
+        columns.append(entry)
+
+    _write_json(table_dir / MANIFEST, {
+        'format': FORMAT_VERSION,
+        'source': source.name,
+        'version': version,
+        'sha256': digest,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'rows': len(frame),
+        'columns': columns,
+    })
+
+    # Drop superseded versions; open memory maps keep their pages alive
+    for stale in table_dir.iterdir():
+        if stale.is_dir() and stale.name != version:
+            shutil.rmtree(stale, ignore_errors=True)
+
+
+def _map_table(manifest, table_dir):
+    version_dir = table_dir / manifest['version']
+    data = {}
+    for entry in manifest['columns']:
+        values = np.load(version_dir / entry['file'], mmap_mode='r', allow_pickle=False)
+        if entry['kind'] == 'category':
+            data[entry['name']] = pd.Categorical.from_codes(values, entry['categories'])
+        elif entry['kind'] == 'datetime':
+            data[entry['name']] = values.view(f"M8[{entry['unit']}]")
+        else:
+            data[entry['name']] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def freeze(frame):
+    """Return ``frame`` over read-only views of its column arrays (no data is copied).
+
+    Frames held in a process-wide cache are shared by every session; writing
+    into one in place (``.loc``/``.iloc`` assignment) then raises
+    ``ValueError`` instead of changing the data under other sessions.
+    """
+    data = {}
+    for i, column in enumerate(frame.columns):
+        series = frame.iloc[:, i]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Categorical.codes is already a read-only view
+            data[i] = pd.Categorical.from_codes(series.array.codes, dtype=series.dtype)
+        elif isinstance(series.dtype, np.dtype):
+            values = series.to_numpy()
+            if values.flags.writeable:
+                values = values.view()
+                values.flags.writeable = False
+            data[i] = values
+        else:
+            data[i] = series.array
+    frozen = pd.DataFrame(data, index=frame.index, copy=False)
+    frozen.columns = frame.columns
+    return frozen
+
+
+def load_table(name, data_dir=None, cache_dir=None):
+    """Return ``(frame, sha256)`` for table ``name``, rebuilding the cache if stale."""
+    data_dir, cache_dir = _dirs(data_dir, cache_dir)
+    source = data_dir / SOURCES[name]
+    table_dir = cache_dir / name
+    manifest = _read_manifest(table_dir)
+    if manifest is not None and _is_fresh(manifest, source, table_dir):
+        try:
+            frame = _map_table(manifest, table_dir)
+            # A cache written under an older schema is rebuilt like a stale one
+            schema.validate(name, frame)
+            return frame, manifest['sha256']
+        except (OSError, ValueError):
+            pass
+
+    digest = file_digest(source)
+    frame = read_source(name, data_dir)
+    try:
+        write_table(name, frame, data_dir, cache_dir, digest)
+    except OSError:
+        # Read-only deployments simply keep parsing the CSVs
+        pass
+    return frame, digest
+
+
+def load_dataset(data_dir=None, cache_dir=None):
+    """Return every source table as a :class:`Dataset`."""
+    tables = {}
+    fingerprint = hashlib.sha256()
+    for name in SOURCES:
+        tables[name], digest = load_table(name, data_dir, cache_dir)
+        fingerprint.update(digest.encode())
+    return Dataset(**tables, fingerprint=fingerprint.hexdigest()[:16])
+
+
+def build(data_dir=None, cache_dir=None):
+    """Convert every source CSV into the columnar cache."""
+    for name in SOURCES:
+        write_table(name, read_source(name, data_dir), data_dir, cache_dir)
+
+
+if __name__ == '__main__':
+    build()
+    print(f'Columnar cache written to {CACHE_DIR}')
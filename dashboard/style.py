@@ -0,0 +1,58 @@
+"""Stylesheet and font delivery for the dashboard.
+
+The editorial stylesheet lives in ``static/dashboard.css`` and the fonts in
+``static/fonts/``; Streamlit serves both at ``/app/static`` (see
+``.streamlit/config.toml``). Each rerun only emits a one-line ``@import`` of
+the content-versioned URLs, which the browser fetches once and caches.
+
+``COVID_FONTS=google`` restores the original Google Fonts import, and
+``COVID_STYLE=inline`` embeds the stylesheet for servers without static file
+serving. The bundled fonts need static serving too, so inline mode imports
+Google Fonts unless told otherwise, and rejects ``COVID_FONTS=local``.
+"""
+import functools
+import hashlib
+import os
+from pathlib import Path
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / 'static'
+STATIC_URL = 'app/static'
+
+GOOGLE_FONTS_URL = (
+    'https://fonts.googleapis.com/css2?family=Source+Serif+4:opsz,wght@8..60,400;8..60,600;8..60,700'
+    '&family=IBM+Plex+Sans:wght@400;500;600&family=IBM+Plex+Mono:wght@400;500&display=swap'
+)
+
+# 'static' links the versioned stylesheet; 'inline' embeds it in every rerun
+STYLE_MODE = os.environ.get('COVID_STYLE', 'static')
+# 'local' serves the bundled fonts; 'google' keeps the Google Fonts import
+FONT_SOURCE = os.environ.get('COVID_FONTS', 'google' if STYLE_MODE == 'inline' else 'local')
+
+
+def _versioned_url(relative_path):
+    digest = hashlib.sha256((STATIC_DIR / relative_path).read_bytes()).hexdigest()[:12]
+    return f'{STATIC_URL}/{relative_path}?v={digest}'
+
+
+@functools.lru_cache(maxsize=None)
+def stylesheet_tag(font_source=FONT_SOURCE, mode=STYLE_MODE):
+    """Return the ``<style>`` element to inject at the top of each page."""
+    if font_source == 'google':
+        fonts = f"@import url('{GOOGLE_FONTS_URL}');"
+    elif font_source == 'local':
+        if mode == 'inline':
+            raise ValueError("inline mode is for servers without static file serving, so it cannot load "
+                             "the bundled fonts; use font_source='google' (COVID_FONTS=google)")
+        fonts = f"@import url('{_versioned_url('fonts/fonts.css')}');"
+    else:
+        raise ValueError(f"unknown font source {font_source!r}; expected 'local' or 'google'")
+
+    if mode == 'static':
+        return f"<style>{fonts}\n@import url('{_versioned_url('dashboard.css')}');</style>"
+    if mode == 'inline':
+        return f"<style>{fonts}\n{(STATIC_DIR / 'dashboard.css').read_text()}</style>"
+    raise ValueError(f"unknown style mode {mode!r}; expected 'static' or 'inline'")
+
+
+if __name__ == '__main__':
+    print(stylesheet_tag())
@@ -0,0 +1,176 @@
+"""Seeded synthetic data in the dashboard's CSV schemas.
+
+Generates ``covid_analysis_data.csv``, ``covid_time_series.csv``,
+``covid_deaths_by_age.csv`` and ``covid_population.csv`` at any scale: more countries, sub-national
+regions per country, and daily instead of monthly dates. The same arguments
+and seed always produce byte-identical files. Point the dashboard at the
+output with ``COVID_DATA_DIR``::
+
+    python -m dashboard.synth out/ --countries 2000 --regions 10 --freq D --seed 7
+    COVID_DATA_DIR=out/ streamlit run app.py
+
+Rows are generated and written in chunks of units, so memory stays flat
+for multi-million-row series.
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dashboard.categories import ADOPTION_EDGES
+
+WHO_REGIONS = ['AFR', 'AMR', 'EMR', 'EUR', 'SEAR', 'WPR']
+WB_INCOMES = ['HIC', 'UMC', 'LMC', 'LIC']
+AGE_GROUPS = ['0_4', '5_14', '15_64', '65+']
+AGE_SHARES = np.array([0.003, 0.002, 0.22, 0.775])
+
+# Labels used by the shipped Adoption_Category column
+ADOPTION_CATEGORY_LABELS = [
+    'Early Adopters (Before Feb 2021)',
+    'Mid Adopters (Feb-May 2021)',
+    'Late Adopters (After May 2021)',
+]
+
+# Real units the pages single out, so the generated data renders every page
+ANCHORS = [
+    ('USA', 'United States of America', 'AMR', 'HIC', '2020-12-14', 60.0, 335942003),
+    ('MEX', 'Mexico', 'AMR', 'UMC', '2020-12-24', 25.0, 125998302),
+]
+
+
+def _units(rng, countries, regions):
+    """One row per reporting unit: anchors first, then generated countries and regions."""
+    n_generated = max(countries - len(ANCHORS), 0)
+    country_ids = np.repeat(np.arange(n_generated), regions)
+    region_ids = np.tile(np.arange(1, regions + 1), n_generated)
+
+    country_region = rng.integers(0, len(WHO_REGIONS), n_generated)
+    country_income = rng.integers(0, len(WB_INCOMES), n_generated)
+    # Most countries start between Dec 2020 and Jun 2021, with a long late tail
+    offsets = np.where(rng.random(n_generated) < 0.9,
+                       rng.integers(0, 200, n_generated),
+                       rng.integers(200, 380, n_generated))
+    country_intro = np.datetime64('2020-12-01') + offsets.astype('timedelta64[D]')
+    country_scale = rng.lognormal(1.0, 1.6, n_generated)
+
+    if regions > 1:
+        codes = [f'C{c:05d}-R{r:03d}' for c, r in zip(country_ids, region_ids)]
+        names = [f'Country {c:05d} / Region {r}' for c, r in zip(country_ids, region_ids)]
+        # Regions split their country's burden unevenly and start within a few weeks of it
+        scale = country_scale[country_ids] * rng.dirichlet(np.ones(regions), n_generated).ravel()
+        intro = country_intro[country_ids] + rng.integers(0, 21, len(codes)).astype('timedelta64[D]')
+    else:
+        codes = [f'C{c:05d}' for c in country_ids]
+        names = [f'Country {c:05d}' for c in country_ids]
+        scale = country_scale
+        intro = country_intro
+
+    # Population roughly tracks burden, with a wide spread of death rates
+    population = np.round(scale * 2e6 * rng.lognormal(0, 0.8, len(codes)))
+
+    anchors = pd.DataFrame(ANCHORS, columns=['Country_code', 'Country', 'Who_region', 'Wb_income',
+                                             'Vaccine_Intro_Date', 'scale', 'Population'])
+    generated = pd.DataFrame({
+        'Country_code': codes,
+        'Country': names,
+        'Who_region': np.array(WHO_REGIONS)[country_region[country_ids]],
+        'Wb_income': np.array(WB_INCOMES)[country_income[country_ids]],
+        'Vaccine_Intro_Date': intro,
+        'scale': scale,
+        'Population': population,
+    })
+    units = pd.concat([anchors, generated], ignore_index=True)
+    units['Vaccine_Intro_Date'] = pd.to_datetime(units['Vaccine_Intro_Date'])
+    return units
+
+
+def _deaths(rng, scale, dates, freq):
+    """Deaths per (unit, date): a few waves per unit plus Poisson noise."""
+    t = (dates - dates[0]).astype('timedelta64[D]').astype('float64')[None, :]
+    n = len(scale)
+    rate = np.zeros((n, t.shape[1]))
+    for center, width, weight in ((90, 40, 0.6), (330, 60, 1.0), (560, 45, 0.8), (760, 70, 0.5)):
+        jitter = rng.normal(0, 25, (n, 1))
+        amplitude = weight * rng.lognormal(0, 0.4, (n, 1))
+        rate += amplitude * np.exp(-0.5 * ((t - center - jitter) / width) ** 2)
+    days_per_step = 30.4 if freq == 'M' else 1.0
+    rate *= scale[:, None] * days_per_step
+    return rng.poisson(rate).astype('float64')
+
+
+def generate(dest, countries=130, regions=1, freq='M', start='2020-01-01', end='2025-08-01',
+             seed=0, chunk_units=2000):
+    """Write the source CSVs into ``dest`` and return their paths."""
+    if freq not in ('M', 'D'):
+        raise ValueError("freq must be 'M' (monthly) or 'D' (daily)")
+    dest = Path(dest)
+    dest.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    units = _units(rng, countries, regions)
+    dates = pd.date_range(start, end, freq='MS' if freq == 'M' else 'D').values
+
+    paths = {name: dest / name for name in
+             ('covid_analysis_data.csv', 'covid_time_series.csv', 'covid_deaths_by_age.csv',
+              'covid_population.csv')}
+    totals = np.zeros(len(units))
+    first = True
+    for lo in range(0, len(units), chunk_units):
+        chunk = units.iloc[lo:lo + chunk_units]
+        deaths = _deaths(rng, chunk['scale'].to_numpy(), dates, freq)
+        totals[lo:lo + len(chunk)] = deaths.sum(axis=1)
+
+        # Like the shipped file, only non-zero observations are listed
+        rows, cols = np.nonzero(deaths)
+        pd.DataFrame({
+            'Country_code': chunk['Country_code'].to_numpy()[rows],
+            'date': pd.DatetimeIndex(dates[cols]).strftime('%Y-%m-%d'),
+            'Deaths': deaths[rows, cols],
+        }).to_csv(paths['covid_time_series.csv'], mode='w' if first else 'a', header=first, index=False)
+
+        shares = rng.dirichlet(AGE_SHARES * 200, len(chunk))
+        by_age = np.round(shares * totals[lo:lo + len(chunk), None])
+        rows, cols = np.nonzero(by_age)
+        pd.DataFrame({
+            'Country_code': chunk['Country_code'].to_numpy()[rows],
+            'Agegroup': np.array(AGE_GROUPS)[cols],
+            'Deaths': by_age[rows, cols],
+        }).to_csv(paths['covid_deaths_by_age.csv'], mode='w' if first else 'a', header=first, index=False)
+        first = False
+
+    edges = pd.to_datetime(list(ADOPTION_EDGES))
+    category = pd.cut(units['Vaccine_Intro_Date'], bins=edges, labels=ADOPTION_CATEGORY_LABELS)
+    pd.DataFrame({
+        'Country_code': units['Country_code'],
+        'Country': units['Country'],
+        'Who_region': units['Who_region'],
+        'Wb_income': units['Wb_income'],
+        'Total_Deaths': totals,
+        'Vaccine_Intro_Date': units['Vaccine_Intro_Date'].dt.strftime('%Y-%m-%d'),
+        'Adoption_Category': category,
+    }).to_csv(paths['covid_analysis_data.csv'], index=False)
+    units[['Country_code', 'Population']].astype({'Population': 'int64'}).to_csv(
+        paths['covid_population.csv'], index=False)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic dashboard data')
+    parser.add_argument('dest', help='output directory')
+    parser.add_argument('--countries', type=int, default=130)
+    parser.add_argument('--regions', type=int, default=1, help='sub-national units per country')
+    parser.add_argument('--freq', choices=['M', 'D'], default='M', help='monthly or daily dates')
+    parser.add_argument('--start', default='2020-01-01')
+    parser.add_argument('--end', default='2025-08-01')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    paths = generate(args.dest, args.countries, args.regions, args.freq, args.start, args.end, args.seed)
+    for path in paths.values():
+        with open(path) as f:
+            rows = sum(1 for _ in f) - 1
+        print(f'{path}: {rows:,} rows')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Shared colors and chart styling for the dashboard pages."""
+from dashboard.categories import ADOPTION_LABELS
+
+# Color palette for charts - Updated with accent colors for key countries
+COLORS = {
+    'primary': '#1e3a5f',
+    'secondary': '#c76b4a',
+    'early': '#2d6a4f',
+    'mid': '#b08968',
+    'late': '#9d4b4b',
+    'neutral': '#666666',
+    'light': '#e0e0e0',
+    'background': '#FAFAF8',
+    # Accent colors for highlighting
+    'mexico': '#c41e3a',      # Carmesí - destacar México
+    'usa': '#1e5aa8',         # Azul intenso - destacar USA
+    'success': '#1d7a5f',     # Verde azulado - países con buena correlación
+    'muted': '#d0d0d0',       # Gris claro para países no destacados
+}
+
+# Fixed accents for the default focus countries; any other focus country
+# takes the next free color from FOCUS_PALETTE, which has one for each of
+# the highlight.MAX_FOCUS countries a selection may hold
+FOCUS_COLORS = {
+    'MEX': COLORS['mexico'],
+    'USA': COLORS['usa'],
+}
+FOCUS_PALETTE = ['#7b3f98', '#d17a00', '#00838f', '#8d6e63', '#ad1457', '#558b2f', '#37474f', '#f9a825',
+                 '#4527a0', '#827717']
+
+
+def focus_colors(codes):
+    """``{code: color}`` for the focus ``codes``, stable for a given selection."""
+    free = iter(c for c in FOCUS_PALETTE if c not in FOCUS_COLORS.values())
+    colors = {}
+    for code in codes:
+        colors[code] = FOCUS_COLORS.get(code) or next(free, COLORS['primary'])
+    return colors
+
+
+
+def category_colors(labels=ADOPTION_LABELS):
+    """``{label: color}`` for adoption categories ordered early to late.
+
+    Three categories get ``COLORS['early']``, ``['mid']`` and ``['late']``;
+    any other number is spread evenly along the same scale.
+    """
+    stops = [tuple(int(COLORS[name][i:i + 2], 16) for i in (1, 3, 5)) for name in ('early', 'mid', 'late')]
+    colors = {}
+    for i, label in enumerate(labels):
+        position = 2 * i / (len(labels) - 1) if len(labels) > 1 else 0
+        low = min(int(position), 1)
+        t = position - low
+        rgb = (round(a + (b - a) * t) for a, b in zip(stops[low], stops[low + 1]))
+        colors[label] = '#' + ''.join(f'{c:02x}' for c in rgb)
+    return colors
+
+
+# Adoption categories, keyed on the Category labels
+CATEGORY_COLORS = category_colors()
+
+# WHO regions, for per-region curves
+REGION_COLORS = {
+    'AFR': '#b08968',
+    'AMR': '#1e5aa8',
+    'EMR': '#9d4b4b',
+    'EUR': '#1e3a5f',
+    'SEAR': '#2d6a4f',
+    'WPR': '#c76b4a',
+}
+
+# Plotly template
+CHART_TEMPLATE = {
+    'layout': {
+        'font': {'family': 'IBM Plex Sans, sans-serif', 'color': '#1a1a1a'},
+        'paper_bgcolor': '#fff',
+        'plot_bgcolor': '#FAFAF8',
+        'title': {'font': {'family': 'Source Serif 4, Georgia, serif', 'size': 16, 'color': '#1a1a1a'}},
+    }
+}
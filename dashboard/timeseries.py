@@ -0,0 +1,243 @@
+"""Array views of ``covid_time_series.csv``.
+
+``DeathMatrix`` holds deaths in a 2-D float array with one row per
+``Country_code`` and one column per period (month by default), so rolling
+sums, running totals and before/after splits are whole-array operations.
+When the source only gains rows after its last date (see
+:func:`appended_rows`), they are appended to a copy of the previous matrix
+in place of a rebuild; :mod:`dashboard.reload` does this for each new
+version of the data.
+
+``DeathPrefix`` keeps the raw rows sorted by country and day with a running
+total, so deaths per country over any date window cost two binary searches
+and a subtraction, at the rows' own (e.g. daily) resolution.
+"""
+import numpy as np
+import pandas as pd
+
+
+class DeathMatrix:
+    """Deaths per country (rows) and period (columns).
+
+    ``countries`` is an ``Index`` of country codes, ``dates`` a
+    ``DatetimeIndex`` of period starts and ``values`` the matching
+    ``(len(countries), len(dates))`` array. Missing periods hold zero.
+    """
+
+    def __init__(self, countries, dates, values, unit='M'):
+        self.countries = pd.Index(countries, name='Country_code')
+        self.dates = pd.DatetimeIndex(dates, name='date')
+        self.values = values
+        self.unit = unit
+        self._cumulative = None
+        self._row_of = {code: i for i, code in enumerate(self.countries)}
+
+    @classmethod
+    def from_frame(cls, time_series, unit='M'):
+        """Build from a frame with ``Country_code``, ``date`` and ``Deaths`` columns."""
+        codes = pd.Categorical(time_series['Country_code'])
+        periods = _periods(time_series['date'], unit)
+        start = periods.min() if len(periods) else 0
+        n_dates = int(periods.max() - start + 1) if len(periods) else 0
+        dates = np.arange(start, start + n_dates).astype(f'datetime64[{unit}]')
+
+        values = _scatter(codes.codes, periods - start, time_series['Deaths'],
+                          (len(codes.categories), n_dates))
+        return cls(codes.categories, dates.astype('datetime64[ns]'), values, unit)
+
+    def copy(self):
+        """An independent matrix with the same values, e.g. to :meth:`append` to a shared one."""
+        return DeathMatrix(self.countries, self.dates, self.values.copy(), self.unit)
+
+    def __len__(self):
+        return len(self.countries)
+
+    def __contains__(self, code):
+        return code in self._row_of
+
+    def row(self, code):
+        return self._row_of[code]
+
+    def totals(self):
+        return self.values.sum(axis=1)
+
+    def cumulative(self):
+        """Running total along the date axis (cached until the next append)."""
+        if self._cumulative is None:
+            self._cumulative = np.cumsum(self.values, axis=1)
+        return self._cumulative
+
+    def rolling_sum(self, window):
+        """Trailing ``window``-period sum; the first ``window - 1`` columns use what is available."""
+        if window < 1:
+            raise ValueError('window must be at least 1')
+        cumulative = self.cumulative()
+        out = cumulative.copy()
+        out[:, window:] -= cumulative[:, :-window]
+        return out
+
+    def split_at(self, intro_dates):
+        """Deaths before and on/after each country's introduction date.
+
+        ``intro_dates`` is a Series of dates indexed by ``Country_code``.
+        Periods starting before the date count as "before"; countries
+        without a date get NaN for both.
+        Returns a frame indexed by ``Country_code`` with ``Deaths_Before``
+        and ``Deaths_After``.
+        """
+        intro = pd.to_datetime(intro_dates.reindex(self.countries))
+        known = intro.notna().to_numpy()
+        boundary = np.searchsorted(self.dates.values, intro.to_numpy(dtype='datetime64[ns]'), side='left')
+
+        cumulative = self.cumulative()
+        # Prefix sums with a leading zero column: before = prefix[boundary]
+        prefix = np.concatenate([np.zeros((len(self), 1)), cumulative], axis=1)
+        before = np.take_along_axis(prefix, boundary[:, None], axis=1)[:, 0]
+        after = prefix[:, -1] - before
+        before[~known] = np.nan
+        after[~known] = np.nan
+        return pd.DataFrame({'Deaths_Before': before, 'Deaths_After': after}, index=self.countries)
+
+    def append(self, rows):
+        """Add new ``Country_code``/``date``/``Deaths`` rows in place.
+
+        Deaths for an existing country and period are added to it. Only the
+        running totals from the earliest touched period onward are
+        recomputed.
+        """
+        if len(rows) == 0:
+            return self
+        periods = _periods(rows['date'], self.unit)
+        width = self.values.shape[1]
+        start = _periods(self.dates[:1], self.unit)[0] if width else periods.min()
+
+        # Grow the country axis for unseen codes
+        new_codes = pd.Index(pd.unique(rows['Country_code'])).difference(self.countries)
+        if len(new_codes):
+            self.countries = self.countries.append(pd.Index(new_codes, name='Country_code'))
+            for code in new_codes:
+                self._row_of[code] = len(self._row_of)
+            self.values = np.vstack([self.values, np.zeros((len(new_codes), self.values.shape[1]))])
+            if self._cumulative is not None:
+                self._cumulative = np.vstack([self._cumulative,
+                                              np.zeros((len(new_codes), self._cumulative.shape[1]))])
+
+        # Grow the date axis on either side
+        lead = int(max(0, start - periods.min()))
+        trail = int(max(0, periods.max() - (start + width - 1)))
+        if lead or trail:
+            self.values = np.pad(self.values, ((0, 0), (lead, trail)))
+            start -= lead
+            first = np.datetime64(int(start), self.unit)
+            self.dates = pd.DatetimeIndex(
+                np.arange(first, first + self.values.shape[1]).astype('datetime64[ns]'), name='date')
+            if lead:
+                self._cumulative = None
+            elif self._cumulative is not None:
+                self._cumulative = np.pad(self._cumulative, ((0, 0), (0, trail)))
+
+        rows_idx = np.fromiter((self._row_of[c] for c in rows['Country_code']), dtype=np.intp, count=len(rows))
+        cols_idx = (periods - start).astype(np.intp)
+        np.add.at(self.values, (rows_idx, cols_idx), np.nan_to_num(np.asarray(rows['Deaths'], dtype='float64')))
+
+        if self._cumulative is not None:
+            first_col = int(cols_idx.min())
+            carry = self._cumulative[:, first_col - 1:first_col] if first_col else 0
+            self._cumulative[:, first_col:] = carry + np.cumsum(self.values[:, first_col:], axis=1)
+        return self
+
+
+class DeathPrefix:
+    """Per-country prefix sums over date-sorted time-series rows.
+
+    Rows are ordered by ``(country, day)`` and encoded as one sorted int64
+    key per row, ``country * span + day``; ``prefix[i]`` is the sum of the
+    first ``i`` sorted deaths. A window's total for every country is then
+    ``prefix[hi] - prefix[lo]`` with ``lo``/``hi`` from ``searchsorted``.
+    """
+
+    def __init__(self, countries, keys, prefix, first_day, span):
+        self.countries = pd.Index(countries, name='Country_code')
+        self.keys = keys
+        self.prefix = prefix
+        self.first_day = first_day
+        self.span = span
+
+    @classmethod
+    def from_frame(cls, time_series):
+        """Build from a frame with ``Country_code``, ``date`` and ``Deaths`` columns."""
+        codes = pd.Categorical(time_series['Country_code'])
+        days = _periods(time_series['date'], 'D')
+        deaths = np.nan_to_num(np.asarray(time_series['Deaths'], dtype='float64'))
+        known = codes.codes >= 0
+        rows, days, deaths = codes.codes[known].astype('int64'), days[known], deaths[known]
+
+        first_day = int(days.min()) if len(days) else 0
+        span = int(days.max()) - first_day + 1 if len(days) else 1
+        keys = rows * span + (days - first_day)
+        order = np.argsort(keys, kind='stable')
+        prefix = np.concatenate([[0.0], np.cumsum(deaths[order])])
+        return cls(codes.categories, keys[order], prefix, first_day, span)
+
+    @property
+    def dates(self):
+        """First and last day covered, as ``datetime64[D]``."""
+        first = np.datetime64(self.first_day, 'D')
+        return first, first + (self.span - 1)
+
+    def window_totals(self, start=None, end=None):
+        """Deaths per country with ``start <= date <= end`` (either bound may be None).
+
+        Returns a Series indexed by ``Country_code``.
+        """
+        lo_day = 0 if start is None else min(max(int(_periods([start], 'D')[0]) - self.first_day, 0), self.span)
+        hi_day = self.span - 1 if end is None else min(int(_periods([end], 'D')[0]) - self.first_day, self.span - 1)
+        base = np.arange(len(self.countries), dtype='int64') * self.span
+        lo = np.searchsorted(self.keys, base + lo_day, side='left')
+        hi = np.searchsorted(self.keys, base + hi_day, side='right')
+        totals = self.prefix[hi] - self.prefix[lo]
+        if hi_day < lo_day:
+            totals[:] = 0.0
+        return pd.Series(totals, index=self.countries, name='Deaths')
+
+
+def appended_rows(old, new):
+    """The rows time series ``new`` adds to ``old``; None unless those are all it changes.
+
+    ``new`` must hold ``old``'s ``Country_code``/``date``/``Deaths`` rows
+    unchanged and in order, followed by rows dated after ``old``'s last date
+    (an empty frame if there are none).
+    """
+    if len(new) < len(old):
+        return None
+    head, tail = new.iloc[:len(old)], new.iloc[len(old):]
+    if not all(_same(old[column], head[column]) for column in ('Country_code', 'date', 'Deaths')):
+        return None
+    if len(old) and len(tail) and not tail['date'].min() > old['date'].max():
+        return None
+    return tail
+
+
+def _same(a, b):
+    """Whether two columns hold the same values, comparing categoricals by code."""
+    if isinstance(a.dtype, pd.CategoricalDtype) and isinstance(b.dtype, pd.CategoricalDtype):
+        if not a.cat.categories.equals(b.cat.categories):
+            recoded = b.cat.set_categories(a.cat.categories)
+            # A value ``a`` never had becomes NaN when recoded
+            if recoded.isna().sum() != b.isna().sum():
+                return False
+            b = recoded
+        return np.array_equal(a.cat.codes.to_numpy(), b.cat.codes.to_numpy())
+    return np.array_equal(a.to_numpy(), b.to_numpy())
+
+
+def _periods(dates, unit):
+    """Integer period numbers (months or days since the epoch)."""
+    return np.asarray(dates, dtype='datetime64[ns]').astype(f'datetime64[{unit}]').astype('int64')
+
+
+def _scatter(rows, cols, deaths, shape):
+    """Sum ``deaths`` into a dense ``shape`` array at ``(rows, cols)``."""
+    flat = np.asarray(rows, dtype=np.intp) * shape[1] + np.asarray(cols, dtype=np.intp)
+    weights = np.nan_to_num(np.asarray(deaths, dtype='float64'))
+    return np.bincount(flat, weights=weights, minlength=shape[0] * shape[1]).reshape(shape)
@@ -0,0 +1,134 @@
+"""Per-rerun stage timing.
+
+Wrap a stage in ``with tracing.span('name'):``. Tracing is off unless
+``COVID_TRACE=1``; then ``span`` returns a shared no-op context and costs a
+single flag check. When on, each rerun collects its spans (per script
+thread, so concurrent sessions don't mix), shows them in a collapsible
+sidebar panel and appends them as OpenTelemetry-style JSON (one
+``resourceSpans`` document per line) to ``COVID_TRACE_FILE``.
+"""
+import contextlib
+import json
+import os
+import secrets
+import threading
+import time
+from pathlib import Path
+
+ENABLED = os.environ.get('COVID_TRACE', '').lower() in ('1', 'true', 'yes')
+TRACE_FILE = Path(os.environ.get('COVID_TRACE_FILE', Path(__file__).resolve().parent.parent / '.cache' / 'traces.jsonl'))
+
+_NULL = contextlib.nullcontext()
+_local = threading.local()
+_export_lock = threading.Lock()
+
+
+class _Span:
+    __slots__ = ('name', 'span_id', 'parent_id', 'attributes', 'start_ns', 'end_ns')
+
+    def __init__(self, name, parent_id, attributes):
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_ns = self.end_ns = 0
+
+    @property
+    def duration_ms(self):
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+class _Recorder:
+    def __init__(self, span):
+        self._span = span
+
+    def __enter__(self):
+        _local.stack.append(self._span.span_id)
+        self._span.start_ns = time.time_ns()
+        return self._span
+
+    def __exit__(self, *exc):
+        self._span.end_ns = time.time_ns()
+        _local.stack.pop()
+        _local.spans.append(self._span)
+        return False
+
+
+def start_rerun(name='rerun'):
+    """Begin a new trace for the current script run."""
+    if not ENABLED:
+        return
+    _local.trace_id = secrets.token_hex(16)
+    _local.spans = []
+    _local.stack = []
+    _local.root = _Span(name, None, {})
+    _local.root.start_ns = time.time_ns()
+    _local.stack.append(_local.root.span_id)
+
+
+def span(name, **attributes):
+    """Time the enclosed block as stage ``name``."""
+    if not ENABLED or not hasattr(_local, 'spans'):
+        return _NULL
+    return _Recorder(_Span(name, _local.stack[-1], attributes))
+
+
+def finish_rerun():
+    """Close the current trace, render the sidebar panel and export it."""
+    if not ENABLED or not hasattr(_local, 'spans'):
+        return
+    root = _local.root
+    root.end_ns = time.time_ns()
+    spans = [root] + sorted(_local.spans, key=lambda s: s.start_ns)
+    trace_id = _local.trace_id
+    del _local.spans
+
+    _render_panel(spans)
+    _export(trace_id, spans)
+
+
+def _render_panel(spans):
+    import streamlit as st
+
+    depth = {spans[0].span_id: 0}
+    rows = []
+    for s in spans:
+        depth[s.span_id] = depth.get(s.parent_id, -1) + 1
+        rows.append({'Stage': ' ' * depth[s.span_id] + s.name, 'ms': round(s.duration_ms, 1)})
+    with st.sidebar.expander('Stage timings', expanded=False):
+        st.dataframe(rows, hide_index=True, width='stretch')
+
+
+def _otel_value(value):
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _export(trace_id, spans):
+    document = {'resourceSpans': [{
+        'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': 'covid-dashboard'}}]},
+        'scopeSpans': [{
+            'scope': {'name': 'dashboard.tracing'},
+            'spans': [{
+                'traceId': trace_id,
+                'spanId': s.span_id,
+                **({'parentSpanId': s.parent_id} if s.parent_id else {}),
+                'name': s.name,
+                'kind': 1,
+                'startTimeUnixNano': str(s.start_ns),
+                'endTimeUnixNano': str(s.end_ns),
+                'attributes': [{'key': k, 'value': _otel_value(v)} for k, v in s.attributes.items()],
+            } for s in spans],
+        }],
+    }]}
+    try:
+        TRACE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with _export_lock, open(TRACE_FILE, 'a') as f:
+            f.write(json.dumps(document) + '\n')
+    except OSError:
+        pass
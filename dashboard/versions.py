@@ -0,0 +1,53 @@
+"""Per-version bookkeeping for the caches derived from a dataset.
+
+Every derived cache is keyed on ``Dataset.fingerprint``. :func:`derived`
+wraps an ``st.cache_resource`` function whose first argument is the
+fingerprint and records the hashed arguments of each call, so
+:func:`discard` can clear exactly the entries of one dataset version (and
+its figures in the in-process LRUs) once a newer version is serving,
+without touching the entries of the new one.
+"""
+import functools
+import inspect
+import sys
+import threading
+from collections import defaultdict
+
+from dashboard import figures
+
+_lock = threading.Lock()
+# fingerprint -> {(cached function, call arguments with unhashed ones blanked)}
+_calls = defaultdict(set)
+
+
+def derived(cached):
+    """Record the calls of ``cached`` (an ``st.cache_resource`` function) per fingerprint."""
+    # Underscore arguments are not part of Streamlit's cache key; blank them
+    # so the record does not keep an old version's frames alive
+    unhashed = [name.startswith('_') for name in inspect.signature(cached).parameters]
+
+    @functools.wraps(cached)
+    def wrapper(*args):
+        key = tuple(None if skip else arg for arg, skip in zip(args, unhashed))
+        with _lock:
+            _calls[args[0]].add((cached, key))
+        return cached(*args)
+
+    wrapper.clear = cached.clear
+    return wrapper
+
+
+def discard(fingerprint):
+    """Drop every cached value derived from dataset version ``fingerprint``; return how many went."""
+    with _lock:
+        calls = _calls.pop(fingerprint, set())
+    for cached, key in calls:
+        cached.clear(*key)
+    dropped = len(calls)
+    # Only look at the Plotly cache if a page has imported it (it pulls in plotly)
+    plotly_cache = sys.modules.get('dashboard.plotly_cache')
+    if plotly_cache is not None:
+        dropped += plotly_cache.FIGURE_JSON_CACHE.discard(lambda key: fingerprint in key)
+    # Matplotlib entries are keyed (figure key, format)
+    dropped += figures.FIGURE_CACHE.discard(lambda key: fingerprint in key[0])
+    return dropped
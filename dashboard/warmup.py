@@ -0,0 +1,216 @@
+"""Background warm-up of the process-wide caches.
+
+Loads the dataset, builds the shared indexes and aggregates for every death
+metric, then renders every page headlessly in a thread pool. Outside a
+script run Streamlit calls are no-ops and widgets return their defaults, so
+a warm-up render fills exactly the cache entries (aggregates, matches,
+cube, serialized Plotly and matplotlib figures) that a first visitor's
+default view would otherwise pay for.
+
+Readiness is exposed twice: :data:`READY` is set in-process, and
+:data:`READY_FILE` is written (with the server's PID and start time, the
+dataset fingerprint and timings) for health checks outside it. A file left
+by a process that has exited does not count. Start the server with its
+caches warming in the same process::
+
+    python -m dashboard.warmup serve [-- streamlit options]
+
+and poll readiness from a health check (exit status 0 once ready)::
+
+    python -m dashboard.warmup check
+
+When a health check holds traffic until ready, ``serve`` is the only
+supported way to start: ``streamlit run app.py`` starts the warm-up on the
+first session (unless ``COVID_WARMUP=0``), so a server no one visits never
+becomes ready. ``python -m dashboard.warmup run`` warms in the foreground
+and prints per-page timings.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from dashboard import aggregates, highlight, index, loader, normalize, pages, store, tracing
+
+ENABLED = os.environ.get('COVID_WARMUP', '1').lower() not in ('0', 'false', 'no')
+WORKERS = int(os.environ.get('COVID_WARMUP_WORKERS', min(8, os.cpu_count() or 1)))
+READY_FILE = Path(os.environ.get('COVID_READY_FILE', store.CACHE_DIR.parent / 'ready'))
+
+READY = threading.Event()
+
+THREAD_PREFIX = 'warmup'
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_thread = None
+
+
+class _QuietWarmup(logging.Filter):
+    """Drop Streamlit's "missing ScriptRunContext" warnings from warm-up threads."""
+
+    def filter(self, record):
+        return not record.threadName.startswith(THREAD_PREFIX)
+
+
+logging.getLogger('streamlit.runtime.scriptrunner_utils.script_run_context').addFilter(_QuietWarmup())
+
+
+def _process_start(pid):
+    """Start time of process ``pid`` in clock ticks since boot (None where /proc is unavailable)."""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            # Field 22; the command name (field 2) may contain spaces, so count from its ')'
+            return int(f.read().rsplit(')', 1)[1].split()[19])
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _alive(pid, started):
+    """Whether ``pid`` is still the process that started at ``started`` (see :func:`_process_start`)."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    # A recycled PID belongs to a process that started later
+    return started is None or _process_start(pid) == started
+
+
+def is_ready():
+    """Whether :data:`READY_FILE` was written by a server process that is still running."""
+    try:
+        status = json.loads(READY_FILE.read_text())
+        return _alive(status['pid'], status.get('started'))
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+
+
+def _render(title, ctx):
+    start = time.perf_counter()
+    pages.render(title, ctx)
+    return time.perf_counter() - start
+
+
+def warm(dataset=None, workers=WORKERS):
+    """Fill the caches for every page and metric, then mark the process ready.
+
+    ``dataset`` defaults to the current version; passing one warms it
+    before it is swapped in (see :mod:`dashboard.reload`), while the
+    current version keeps serving and the process stays ready. Warming
+    again never clears readiness; :data:`READY_FILE` is only replaced once
+    the new warm-up is done.
+
+    Returns ``{'pid', 'started', 'fingerprint', 'seconds', 'pages', 'errors'}``,
+    as written to :data:`READY_FILE`. A page that fails to render is logged
+    and listed in ``errors``; it fails the same way for visitors, so
+    readiness is not held back. Failing to load the data raises and leaves
+    the process not ready.
+    """
+    start = time.perf_counter()
+    with tracing.span('warmup.data'):
+        if dataset is None:
+            dataset = loader.load_data()
+        country_index = index.get_index(dataset)
+        aggregates.get_prefix(dataset)
+        aggregates.get_daily_matrix(dataset)
+        focus = highlight.focus_labels([code for code in highlight.FOCUS_CODES if code in country_index],
+                                       country_index)
+        contexts = [pages.PageContext(dataset=dataset, aggs=aggregates.get_aggregates(dataset, metric),
+                                      metric=metric, index=country_index, focus=focus)
+                    for metric in normalize.METRICS.values()]
+
+    timings, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=THREAD_PREFIX) as pool:
+        futures = {(title, ctx.metric.column): pool.submit(_render, title, ctx)
+                   for ctx in contexts for title in pages.PAGE_TITLES}
+        for (title, column), future in futures.items():
+            try:
+                timings[f'{title} ({column})'] = round(future.result(), 3)
+            except Exception as e:
+                logger.exception('warm-up of %r (%s) failed', title, column)
+                errors[f'{title} ({column})'] = repr(e)
+
+    status = {
+        'pid': os.getpid(),
+        'started': _process_start(os.getpid()),
+        'fingerprint': dataset.fingerprint,
+        'seconds': round(time.perf_counter() - start, 3),
+        'pages': timings,
+        'errors': errors,
+    }
+    try:
+        READY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = READY_FILE.with_suffix('.tmp')
+        tmp.write_text(json.dumps(status, indent=2))
+        os.replace(tmp, READY_FILE)
+    except OSError:
+        # Read-only deployments still get the in-process flag
+        logger.warning('could not write %s', READY_FILE)
+    READY.set()
+    return status
+
+
+def _run_in_background():
+    try:
+        status = warm()
+    except Exception:
+        logger.exception('warm-up failed')
+    else:
+        logger.info('caches warm after %.1f s', status['seconds'])
+
+
+def start():
+    """Start :func:`warm` in a daemon thread, once per process; returns the thread (None if disabled)."""
+    global _thread
+    if not ENABLED:
+        return None
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_run_in_background, name=f'{THREAD_PREFIX}-main', daemon=True)
+            _thread.start()
+    return _thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve = commands.add_parser('serve', help='start the warm-up and data watcher, then run the dashboard here')
+    serve.add_argument('streamlit_args', nargs=argparse.REMAINDER, help='options passed to `streamlit run`')
+    commands.add_parser('run', help='warm the caches in the foreground and print timings')
+    commands.add_parser('check', help=f'exit 0 if a running server has written {READY_FILE}')
+    args = parser.parse_args()
+
+    if args.command == 'check':
+        if not is_ready():
+            print('not ready')
+            raise SystemExit(1)
+        print(READY_FILE.read_text())
+    elif args.command == 'run':
+        print(json.dumps(warm(), indent=2))
+    else:
+        from streamlit.web import cli
+
+        from dashboard import reload
+
+        # Whatever an earlier server left behind does not describe this one
+        READY_FILE.unlink(missing_ok=True)
+        start()
+        reload.start()
+        streamlit_args = [a for a in args.streamlit_args if a != '--']
+        sys.argv = ['streamlit', 'run', str(Path(__file__).resolve().parent.parent / 'app.py'), *streamlit_args]
+        cli.main()
+
+
+if __name__ == '__main__':
+    # Run as dashboard.warmup, the module app.py imports, so the app's start() sees this
+    # process's warm-up thread and READY flag instead of a second, fresh copy of them
+    from dashboard import warmup
+
+    warmup.main()
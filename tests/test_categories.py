@@ -0,0 +1,29 @@
+import pandas as pd
+import pytest
+
+from dashboard import categories
+
+
+def test_classify_adoption_matches_cut():
+    dates = pd.to_datetime(['2019-12-31', '2020-06-01', '2021-02-01', '2021-02-02', '2021-05-01', '2021-12-31',
+                            '2022-01-02', None])
+    expected = pd.cut(dates, bins=pd.to_datetime(list(categories.ADOPTION_EDGES)),
+                      labels=list(categories.ADOPTION_LABELS))
+    result = categories.classify_adoption(dates)
+    assert list(result.categories) == list(categories.ADOPTION_LABELS)
+    pd.testing.assert_series_equal(pd.Series(result), pd.Series(expected).astype(result.dtype))
+
+
+def test_adoption_periods():
+    assert categories.adoption_periods() == {
+        'Early Adopters': 'Before February 2021',
+        'Mid Adopters': 'February – May 2021',
+        'Late Adopters': 'After May 2021',
+    }
+    assert categories.adoption_periods(short=True)['Mid Adopters'] == 'Feb-May 2021'
+
+    edges = ('2020-01-01', '2020-11-01', '2021-03-01', '2021-06-01', '2022-01-01')
+    assert list(categories.adoption_periods(edges, ('A', 'B', 'C', 'D')).values()) == [
+        'Before November 2020', 'November 2020 – March 2021', 'March – June 2021', 'After June 2021']
+    with pytest.raises(ValueError):
+        categories.adoption_periods(edges)
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import cube
+from dashboard.timeseries import DeathMatrix
+
+AGES = ['0_4', '5_14', '15_64', '65+']
+MONTHS = pd.date_range('2021-01-01', periods=6, freq='MS')
+
+
+@pytest.fixture(scope='module')
+def sources():
+    """Twelve analysed countries, plus two with deaths by age and month but outside ``merged_data``.
+
+    C09-C11 report no age breakdown, and C10-C11 have no time-series rows.
+    """
+    rng = np.random.default_rng(1)
+    codes = [f'C{i:02d}' for i in range(12)]
+    merged_data = pd.DataFrame({
+        'Country_code': pd.Categorical(codes),
+        'Who_region': pd.Categorical(rng.choice(['AFR', 'AMR', 'EUR'], len(codes))),
+        'Wb_income': pd.Categorical(rng.choice(['High income', 'Low income'], len(codes))),
+        'Category': pd.Categorical(rng.choice(['Early Adopters', 'Mid Adopters', 'Late Adopters'], len(codes))),
+        'Population': rng.integers(100_000, 5_000_000, len(codes)).astype('float64'),
+    })
+
+    series, by_age = [], []
+    for code in codes[:10] + ['X1', 'X2']:
+        months = MONTHS[rng.random(len(MONTHS)) < 0.8]
+        deaths = rng.integers(0, 1000, len(months))
+        series.append(pd.DataFrame({'Country_code': code, 'date': months, 'Deaths': deaths}))
+        if code not in ('C09',):
+            # Age breakdowns add up to the country's time-series total, as in the shipped data
+            split = rng.multinomial(deaths.sum(), rng.dirichlet(np.ones(len(AGES))))
+            by_age.append(pd.DataFrame({'Country_code': code, 'Agegroup': AGES, 'Deaths': split}))
+    time_series = pd.concat(series, ignore_index=True).astype({'Country_code': 'category', 'Deaths': 'int32'})
+    deaths_by_age = pd.concat(by_age, ignore_index=True).astype({'Country_code': 'category', 'Agegroup': 'category'})
+    return merged_data, deaths_by_age, time_series
+
+
+@pytest.fixture(scope='module')
+def data_cube(sources):
+    merged_data, deaths_by_age, time_series = sources
+    return cube.Cube.from_frames(merged_data, deaths_by_age, DeathMatrix.from_frame(time_series))
+
+
+@pytest.fixture(scope='module')
+def long_table(sources):
+    """Per-country deaths by age group and month, built with pandas: every country, age and month, zeros included."""
+    merged_data, deaths_by_age, time_series = sources
+    codes = merged_data['Country_code'].astype(str)
+    monthly = (time_series.assign(Country_code=time_series['Country_code'].astype(str))
+               .pivot_table(index='Country_code', columns='date', values='Deaths', aggfunc='sum')
+               .reindex(index=codes, columns=MONTHS).fillna(0.0))
+    shares = (deaths_by_age.assign(Country_code=deaths_by_age['Country_code'].astype(str),
+                                   Agegroup=deaths_by_age['Agegroup'].astype(str))
+              .pivot_table(index='Country_code', columns='Agegroup', values='Deaths', aggfunc='sum')
+              .reindex(index=codes, columns=AGES))
+    shares = shares.div(shares.sum(axis=1), axis=0)
+    shares[cube.NOT_REPORTED] = np.where(shares.isna().all(axis=1), 1.0, 0.0)
+    shares = shares.fillna(0.0)
+
+    rows = [(code, age, month, monthly.at[code, month] * shares.at[code, age])
+            for code in codes for age in shares.columns for month in MONTHS]
+    table = pd.DataFrame(rows, columns=['Country_code', 'Agegroup', 'month', 'Deaths'])
+    dimensions = merged_data.assign(Country_code=codes)[['Country_code', *cube.COUNTRY_DIMENSIONS]]
+    return table.merge(dimensions.astype({d: str for d in cube.COUNTRY_DIMENSIONS}), on='Country_code')
+
+
+@pytest.mark.parametrize('keep, where', [
+    (['Who_region'], None),
+    (['Category', 'Wb_income'], None),
+    (['Category', 'month'], None),
+    (['Wb_income', 'Agegroup'], None),
+    (['Agegroup', 'month'], None),
+    (['Who_region', 'Agegroup'], {'Category': ['Early Adopters', 'Mid Adopters']}),
+    (['month'], {'Who_region': ['AFR', 'EUR']}),
+    (['Agegroup', 'month'], {'Agegroup': ['15_64', '65+'], 'Wb_income': ['Low income']}),
+])
+def test_frame_matches_groupby(data_cube, long_table, keep, where):
+    table = long_table
+    for dimension, selected in (where or {}).items():
+        table = table[table[dimension].isin(selected)]
+    # Per-country values for the kept within-country dimensions, then statistics across countries
+    within = [d for d in cube.WITHIN_DIMENSIONS if d in keep]
+    per_country = table.groupby(['Country_code', *cube.COUNTRY_DIMENSIONS, *within])['Deaths'].sum().reset_index()
+    expected = per_country.groupby(keep)['Deaths'].agg(['sum', 'count', 'mean', 'std'])
+
+    result = data_cube.frame(keep, where)
+    result = result[result['Countries'] > 0]
+    if len(keep) > 1:
+        result.index = result.index.set_levels([level.astype(expected.index.levels[i].dtype)
+                                                for i, level in enumerate(result.index.levels)])
+    else:
+        result.index = result.index.astype(expected.index.dtype)
+    expected = expected.reindex(result.index)
+
+    assert len(result) == len(expected.dropna(subset=['count']))
+    np.testing.assert_allclose(result['Deaths'], expected['sum'])
+    np.testing.assert_array_equal(result['Countries'], expected['count'])
+    np.testing.assert_allclose(result['Mean'], expected['mean'])
+    np.testing.assert_allclose(result['Std'], expected['std'], equal_nan=True)
+
+
+def test_std_needs_filtered_within_dimensions_kept(data_cube):
+    assert data_cube.frame(['Who_region'], {'month': MONTHS[:2]})['Std'].isna().all()
+
+
+def test_age_margin_matches_source_for_analysed_countries(sources, data_cube):
+    merged_data, deaths_by_age, time_series = sources
+    analysed = deaths_by_age['Country_code'].isin(merged_data['Country_code'])
+    by_age = deaths_by_age[analysed].groupby('Agegroup', observed=True)['Deaths'].sum()
+    # Deaths of analysed countries without an age breakdown form their own group
+    unreported = ~merged_data['Country_code'].isin(deaths_by_age['Country_code'])
+    by_age[cube.NOT_REPORTED] = time_series.loc[
+        time_series['Country_code'].isin(merged_data.loc[unreported, 'Country_code']), 'Deaths'].sum()
+
+    margin = data_cube.frame(['Agegroup'])['Deaths']
+    np.testing.assert_allclose(margin, by_age.reindex(margin.index))
+
+    # Countries outside merged_data (X1, X2) are not in the cube, so the margin
+    # falls short of the whole age table, as The Crisis chart sums it
+    everything = deaths_by_age.groupby('Agegroup', observed=True)['Deaths'].sum()
+    assert (margin[AGES] < everything.reindex(AGES)).all()
+
+
+def test_month_margin_matches_source_for_analysed_countries(sources, data_cube):
+    merged_data, _, time_series = sources
+    analysed = time_series['Country_code'].isin(merged_data['Country_code'])
+    by_month = time_series[analysed].groupby('date')['Deaths'].sum()
+
+    margin = data_cube.frame(['month'])['Deaths']
+    np.testing.assert_allclose(margin, by_month.reindex(margin.index, fill_value=0))
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import inference
+
+LABELS = ['Early Adopters', 'Mid Adopters', 'Late Adopters']
+
+
+def frame(*groups):
+    """A merged_data-like frame with one category per group of ``Deaths`` values."""
+    return pd.DataFrame({
+        'Category': pd.Categorical(np.repeat(LABELS[:len(groups)], [len(g) for g in groups]),
+                                   categories=LABELS, ordered=True),
+        'Deaths': np.concatenate(groups).astype('float64'),
+    })
+
+
+def test_bootstrap_intervals_bracket_the_estimates():
+    values = np.random.default_rng(3).lognormal(3, 1, 40)
+    mean_low, mean_high, median_low, median_high = inference.bootstrap_intervals(
+        values, np.random.default_rng(0), resamples=2000)
+    assert mean_low < values.mean() < mean_high
+    assert median_low < np.median(values) < median_high
+    # Narrower than the sample's own range
+    assert values.min() < mean_low and mean_high < values.max()
+
+
+def test_bootstrap_intervals_are_seeded():
+    values = np.arange(30.0)
+    first = inference.bootstrap_intervals(values, np.random.default_rng(7), resamples=500)
+    assert inference.bootstrap_intervals(values, np.random.default_rng(7), resamples=500) == first
+
+
+def test_bootstrap_intervals_drop_missing_values():
+    assert np.isnan(inference.bootstrap_intervals([np.nan], np.random.default_rng(0), resamples=10)).all()
+    values = np.arange(20.0)
+    assert (inference.bootstrap_intervals(np.append(values, np.nan), np.random.default_rng(1), resamples=200)
+            == inference.bootstrap_intervals(values, np.random.default_rng(1), resamples=200))
+
+
+def test_identical_groups_give_p_of_one():
+    group = np.arange(1.0, 13.0)
+    result = inference.category_inference(frame(group, group, group), 'Deaths', resamples=1000)
+    assert result.overall_p == pytest.approx(1.0)
+    assert (result.pairs[['Mean_Difference', 'Median_Difference']] == 0).all().all()
+    np.testing.assert_allclose(result.pairs[['Mean_P', 'Median_P']], 1.0)
+
+
+def test_separated_groups_give_small_p():
+    rng = np.random.default_rng(5)
+    early, mid, late = rng.normal(100, 5, 15), rng.normal(50, 5, 15), rng.normal(0, 5, 15)
+    result = inference.category_inference(frame(early, mid, late), 'Deaths', resamples=2000)
+    # No shuffle of 45 well-separated values gets near the observed gaps
+    assert result.overall_p < 0.001
+    assert (result.pairs[['Mean_P', 'Median_P']] < 0.001).all().all()
+    assert list(result.pairs.index) == ['Early vs Mid', 'Early vs Late', 'Mid vs Late']
+    assert result.pairs.loc['Early vs Late', 'Mean_Difference'] == pytest.approx(early.mean() - late.mean())
+
+    intervals = result.intervals
+    for label, values in zip(LABELS, (early, mid, late)):
+        assert intervals.loc[label, 'Mean_Low'] < values.mean() < intervals.loc[label, 'Mean_High']
+        assert intervals.loc[label, 'Median_Low'] < np.median(values) < intervals.loc[label, 'Median_High']
+
+
+def test_blocked_resampling_matches_one_block(monkeypatch):
+    values = frame(np.arange(10.0), np.arange(5.0, 25.0), np.arange(8.0))
+    whole = inference.category_inference(values, 'Deaths', resamples=300, seed=2)
+    # Draw the same resamples a few rows at a time
+    monkeypatch.setattr(inference, 'MAX_CELLS', 100)
+    blocked = inference.category_inference(values, 'Deaths', resamples=300, seed=2)
+    pd.testing.assert_frame_equal(blocked.intervals, whole.intervals)
+    assert blocked.overall_p == whole.overall_p
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import matching
+from dashboard.timeseries import DeathMatrix
+
+
+@pytest.fixture(scope='module')
+def countries():
+    """Sixty countries in a few region/income blocks, two without an intro date or a population."""
+    rng = np.random.default_rng(4)
+    n = 60
+    codes = np.array([f'C{i:02d}' for i in range(n)])
+    frame = pd.DataFrame({
+        'Country_code': codes,
+        'Country': [f'Country {i}' for i in range(n)],
+        'Who_region': pd.Categorical(rng.choice(['AFR', 'AMR', 'EUR'], n)),
+        'Wb_income': pd.Categorical(rng.choice(['High income', 'Low income'], n)),
+        'Vaccine_Intro_Date': pd.to_datetime('2020-12-01') + pd.to_timedelta(rng.integers(0, 240, n), unit='D'),
+        'Population': rng.lognormal(15, 1, n),
+    })
+    frame.loc[3, 'Vaccine_Intro_Date'] = pd.NaT
+    frame.loc[7, 'Population'] = np.nan
+    dates = pd.date_range('2020-01-01', '2022-12-01', freq='MS')
+    values = rng.poisson(rng.lognormal(3, 1, (n, 1)) * rng.random((n, len(dates)))).astype('float64')
+    return frame, DeathMatrix(codes, dates, values)
+
+
+@pytest.fixture(scope='module')
+def pairs(countries):
+    frame, deaths_matrix = countries
+    return matching.match_countries(frame, deaths_matrix)
+
+
+def test_pairs_share_region_and_income(countries, pairs):
+    frame, _ = countries
+    by_code = frame.set_index('Country_code')
+    assert len(pairs)
+    for side in ('Early', 'Later'):
+        matched = by_code.loc[pairs[f'{side}_Country_code']]
+        for column in matching.BLOCK_COLUMNS:
+            np.testing.assert_array_equal(matched[column].to_numpy(), pairs[column].to_numpy())
+
+
+def test_pairs_are_far_enough_apart_and_ordered(countries, pairs):
+    frame, _ = countries
+    intro = frame.set_index('Country_code')['Vaccine_Intro_Date']
+    early = intro.loc[pairs['Early_Country_code']].to_numpy()
+    later = intro.loc[pairs['Later_Country_code']].to_numpy()
+    gap = (later - early).astype('timedelta64[D]').astype('int64')
+
+    assert (early <= later).all()
+    np.testing.assert_array_equal(pairs['Gap_Days'], gap)
+    assert (pairs['Gap_Days'] >= matching.MIN_GAP_DAYS).all()
+    # Each pair once, closest first
+    assert not pairs[['Early_Country_code', 'Later_Country_code']].duplicated().any()
+    assert pairs['Distance'].is_monotonic_increasing
+
+
+def test_unusable_countries_are_not_matched(countries, pairs):
+    frame, _ = countries
+    matched = set(pairs['Early_Country_code']) | set(pairs['Later_Country_code'])
+    assert not matched & {frame.at[3, 'Country_code'], frame.at[7, 'Country_code']}
+
+
+@pytest.mark.parametrize('max_cells', [matching.MAX_CELLS, 50])
+def test_nearest_eligible_matches_brute_force(monkeypatch, max_cells):
+    monkeypatch.setattr(matching, 'MAX_CELLS', max_cells)
+    rng = np.random.default_rng(9)
+    features = rng.normal(size=(40, 5))
+    days = rng.integers(0, 200, 40)
+    neighbour, distance = matching.nearest_eligible(features, days, min_gap=60)
+
+    for row in range(len(features)):
+        eligible = np.flatnonzero(np.abs(days - days[row]) >= 60)
+        if not len(eligible):
+            assert neighbour[row] == -1 and distance[row] == np.inf
+            continue
+        distances = np.linalg.norm(features[eligible] - features[row], axis=1)
+        assert neighbour[row] == eligible[distances.argmin()]
+        assert distance[row] == pytest.approx(distances.min())
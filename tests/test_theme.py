@@ -0,0 +1,33 @@
+import pytest
+
+from dashboard import highlight, theme
+
+OTHERS = ['BRA', 'IND', 'GBR', 'FRA', 'DEU', 'ITA', 'ESP', 'PER', 'COL', 'ARG', 'CHL']
+
+
+@pytest.mark.parametrize('codes', [
+    OTHERS[:highlight.MAX_FOCUS],
+    ['MEX', 'USA', *OTHERS[:highlight.MAX_FOCUS - 2]],
+    ['USA', *OTHERS[:highlight.MAX_FOCUS - 1]],
+])
+def test_focus_colors_are_distinct(codes):
+    colors = theme.focus_colors(codes)
+    assert list(colors) == codes
+    assert len(set(colors.values())) == len(codes)
+    # Never the color of the countries that are not in focus
+    assert theme.COLORS['primary'] not in colors.values()
+
+
+def test_default_focus_keeps_fixed_colors():
+    assert theme.focus_colors(['BRA', 'MEX', 'USA']) == {
+        'BRA': theme.FOCUS_PALETTE[0], 'MEX': theme.COLORS['mexico'], 'USA': theme.COLORS['usa']}
+
+
+def test_category_colors():
+    assert theme.CATEGORY_COLORS == {
+        'Early Adopters': theme.COLORS['early'], 'Mid Adopters': theme.COLORS['mid'],
+        'Late Adopters': theme.COLORS['late']}
+    colors = theme.category_colors(['A', 'B', 'C', 'D', 'E'])
+    assert colors['A'] == theme.COLORS['early'] and colors['C'] == theme.COLORS['mid']
+    assert colors['E'] == theme.COLORS['late']
+    assert len(set(colors.values())) == 5
@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.timeseries import DeathMatrix, DeathPrefix, appended_rows
+
+
+def time_series(codes, dates, deaths):
+    return pd.DataFrame({
+        'Country_code': pd.Categorical(codes),
+        'date': pd.to_datetime(dates).astype('datetime64[us]'),
+        'Deaths': np.asarray(deaths, dtype='int32'),
+    })
+
+
+@pytest.fixture
+def daily():
+    """Random daily rows for five countries, in file order (country, then day)."""
+    rng = np.random.default_rng(0)
+    days = pd.date_range('2020-03-01', '2021-06-30', freq='D')
+    rows = [(code, day) for code in ['ARG', 'BRA', 'CHL', 'MEX', 'USA'] for day in days if rng.random() < 0.6]
+    codes, dates = zip(*rows)
+    return time_series(codes, dates, rng.integers(0, 500, len(rows)))
+
+
+def aligned(matrix, countries):
+    return pd.DataFrame(matrix.values, index=matrix.countries.astype(str), columns=matrix.dates).reindex(countries)
+
+
+def assert_same_matrix(result, expected):
+    assert sorted(result.countries.astype(str)) == sorted(expected.countries.astype(str))
+    pd.testing.assert_index_equal(result.dates, expected.dates)
+    countries = expected.countries.astype(str)
+    pd.testing.assert_frame_equal(aligned(result, countries), aligned(expected, countries))
+    np.testing.assert_array_equal(
+        pd.DataFrame(result.cumulative(), index=result.countries.astype(str)).reindex(countries).to_numpy(),
+        expected.cumulative())
+
+
+@pytest.mark.parametrize('unit', ['M', 'D'])
+@pytest.mark.parametrize('warm_cumulative', [False, True])
+def test_append_matches_from_frame(daily, unit, warm_cumulative):
+    # Old rows up to mid-month, so the monthly matrix also adds into its last column
+    cutoff = pd.Timestamp('2021-03-15')
+    old = daily[daily['date'] <= cutoff]
+    tail = daily[daily['date'] > cutoff]
+    # A country first seen in the appended rows
+    tail = pd.concat([tail, time_series(['PER', 'PER'], ['2021-04-02', '2021-07-20'], [7, 9])], ignore_index=True)
+
+    matrix = DeathMatrix.from_frame(old, unit=unit)
+    if warm_cumulative:
+        # Running totals are then updated from the first touched period on
+        matrix.cumulative()
+    matrix.append(tail)
+
+    assert_same_matrix(matrix, DeathMatrix.from_frame(pd.concat([old, tail], ignore_index=True), unit=unit))
+
+
+def test_append_before_first_period(daily):
+    early = time_series(['ARG', 'ZAF'], ['2019-12-31', '2020-01-15'], [4, 6])
+    matrix = DeathMatrix.from_frame(daily)
+    matrix.cumulative()
+    matrix.append(early)
+
+    assert_same_matrix(matrix, DeathMatrix.from_frame(pd.concat([daily, early], ignore_index=True)))
+
+
+def test_append_nothing(daily):
+    matrix = DeathMatrix.from_frame(daily)
+    values = matrix.values.copy()
+    assert matrix.append(daily.iloc[:0]) is matrix
+    np.testing.assert_array_equal(matrix.values, values)
+
+
+def test_copy_leaves_original(daily):
+    cutoff = pd.Timestamp('2021-01-01')
+    matrix = DeathMatrix.from_frame(daily[daily['date'] < cutoff])
+    values = matrix.values.copy()
+    matrix.copy().append(daily[daily['date'] >= cutoff])
+    np.testing.assert_array_equal(matrix.values, values)
+
+
+def test_rolling_sum_matches_pandas(daily):
+    matrix = DeathMatrix.from_frame(daily)
+    for window in (1, 3, 12, 40):
+        expected = pd.DataFrame(matrix.values.T).rolling(window, min_periods=1).sum().T.to_numpy()
+        np.testing.assert_allclose(matrix.rolling_sum(window), expected)
+    with pytest.raises(ValueError):
+        matrix.rolling_sum(0)
+
+
+def test_appended_rows(daily):
+    cutoff = pd.Timestamp('2021-03-15')
+    old = daily[daily['date'] <= cutoff].reset_index(drop=True)
+    new_rows = time_series(['ARG', 'PER'], ['2021-07-01', '2021-07-01'], [1, 2])
+    new = pd.concat([old, new_rows], ignore_index=True)
+
+    tail = appended_rows(old, new)
+    pd.testing.assert_frame_equal(tail.reset_index(drop=True), new_rows.astype(new.dtypes))
+    assert len(appended_rows(old, old)) == 0
+
+    # An edited old row, a late row dated inside the old range, or lost rows mean a rebuild
+    edited = new.copy()
+    edited.loc[3, 'Deaths'] += 1
+    assert appended_rows(old, edited) is None
+    late = pd.concat([old, time_series(['ARG'], ['2021-03-01'], [5])], ignore_index=True)
+    assert appended_rows(old, late) is None
+    assert appended_rows(old, old.iloc[:-1]) is None
+
+
+@pytest.mark.parametrize('start, end', [
+    (None, None),
+    ('2020-03-01', '2021-06-30'),
+    ('2020-06-15', '2020-09-14'),
+    ('2021-01-01', None),
+    (None, '2020-12-31'),
+    ('2020-07-04', '2020-07-04'),
+    # Bounds outside the data
+    ('2019-01-01', '2020-04-01'),
+    ('2021-05-01', '2022-12-31'),
+    ('2019-01-01', '2023-01-01'),
+    # Windows holding no rows: before the first day, after the last, or reversed
+    ('2019-01-01', '2020-02-29'),
+    ('2021-07-01', '2021-12-31'),
+    ('2020-09-01', '2020-08-01'),
+])
+def test_window_totals_match_groupby(daily, start, end):
+    prefix = DeathPrefix.from_frame(daily)
+    mask = np.ones(len(daily), dtype=bool)
+    if start is not None:
+        mask &= daily['date'] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= daily['date'] <= pd.Timestamp(end)
+    expected = daily[mask].groupby('Country_code', observed=False)['Deaths'].sum().astype('float64')
+
+    result = prefix.window_totals(start, end)
+    pd.testing.assert_series_equal(result, expected.reindex(result.index, fill_value=0.0),
+                                   check_names=False, check_index_type=False, check_categorical=False)
+
+
+def test_window_totals_dates(daily):
+    prefix = DeathPrefix.from_frame(daily)
+    assert prefix.dates == (np.datetime64('2020-03-01'), np.datetime64(daily['date'].max(), 'D'))
+    assert (prefix.window_totals() == prefix.window_totals(*prefix.dates)).all()